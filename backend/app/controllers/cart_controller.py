@@ -3,67 +3,228 @@
 Cart Controller.
 
 Provides business logic for managing a user's cart.
+
+Money amounts are computed as exact decimals rounded to cents.
+
+Item updates and deletes are single UPDATE/DELETE ... RETURNING statements
+scoped with ``WHERE id = ? AND user_id = ?``, so a user can only change their
+own items (another user's item id answers 404, like an unknown one). The
+nested service in a response comes from the catalog cache.
 """
 
 import logging
-from sqlalchemy.orm import Session, joinedload
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List
+from sqlalchemy import select, update, delete, func, cast, Numeric
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from fastapi import HTTPException
+from app.database import dialect_insert
 from app.models.cart import Cart
+from app.models.service import Service
+from app.controllers.service_controller import SERVICE_FIELDS, SERVICE_COLUMNS, get_service_details
 from app.validators.cart_validator import CartCreateSchema, CartUpdateSchema
 
 logger = logging.getLogger("cart_controller")
 
-def add_item_to_cart(db: Session, user_id: int, cart_data: CartCreateSchema) -> Cart:
-    new_item = Cart(user_id=user_id, **cart_data.dict())
-    db.add(new_item)
-    db.commit()
-    db.refresh(new_item)
-    logger.info("Added new cart item with id %s for user %s", new_item.id, user_id)
-    return new_item
+# Columns of a cart item in responses (mirrors CartResponseSchema without "service").
+CART_ITEM_FIELDS = ("id", "service_id", "quantity", "custom_instructions", "created_at")
+CART_ITEM_COLUMNS = tuple(getattr(Cart, field) for field in CART_ITEM_FIELDS)
+
+CENTS = Decimal("0.01")
+
+def to_money(value) -> Decimal:
+    """Convert a numeric value to a Decimal rounded to cents."""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value or 0))
+    return value.quantize(CENTS, rounding=ROUND_HALF_UP)
+
+async def _get_cart_item(db: AsyncSession, item_id: int):
+    # Eagerly load the related service; lazy loads are not allowed on an AsyncSession.
+    result = await db.execute(
+        select(Cart).options(joinedload(Cart.service)).filter(Cart.id == item_id)
+    )
+    return result.scalars().first()
+
+def _merge_items(items: List[CartCreateSchema]) -> list:
+    # Collapse repeated service ids: ON CONFLICT cannot touch the same row twice in one statement.
+    merged = {}
+    for item in items:
+        row = merged.get(item.service_id)
+        if row is None:
+            merged[item.service_id] = item.model_dump()
+        else:
+            row["quantity"] += item.quantity
+            if item.custom_instructions is not None:
+                row["custom_instructions"] = item.custom_instructions
+    return list(merged.values())
+
+async def _upsert_items(db: AsyncSession, user_id: int, items: List[CartCreateSchema]) -> List[int]:
+    """
+    Insert cart rows, merging quantities into existing (user_id, service_id) rows.
+
+    Runs as one INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement.
+
+    Returns:
+        List[int]: Ids of the inserted or updated cart rows.
+    """
+    rows = [dict(row, user_id=user_id) for row in _merge_items(items)]
+    stmt = dialect_insert(db, Cart).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Cart.user_id, Cart.service_id],
+        set_={
+            "quantity": Cart.quantity + stmt.excluded.quantity,
+            "custom_instructions": func.coalesce(stmt.excluded.custom_instructions, Cart.custom_instructions),
+        },
+    ).returning(Cart.id)
+    try:
+        result = await db.execute(stmt)
+        ids = list(result.scalars().all())
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        logger.error("Cart upsert for user %s references an unknown service", user_id)
+        raise HTTPException(status_code=400, detail="Unknown service id")
+    return ids
+
+async def add_item_to_cart(db: AsyncSession, user_id: int, cart_data: CartCreateSchema) -> Cart:
+    ids = await _upsert_items(db, user_id, [cart_data])
+    item = await _get_cart_item(db, ids[0])
+    logger.info("Added cart item with id %s for user %s", item.id, user_id)
+    return item
 
-def get_cart_items(db: Session, user_id: int):
+async def add_items_to_cart(db: AsyncSession, user_id: int, items: List[CartCreateSchema]):
+    ids = await _upsert_items(db, user_id, items)
+    result = await db.execute(
+        select(Cart).options(joinedload(Cart.service)).filter(Cart.id.in_(ids)).order_by(Cart.id)
+    )
+    cart_items = result.scalars().all()
+    logger.info("Added %d cart items for user %s", len(cart_items), user_id)
+    return cart_items
+
+async def get_cart_items(db: AsyncSession, user_id: int):
     # Use joinedload to eagerly load the related service
-    items = db.query(Cart).options(joinedload(Cart.service)).filter(Cart.user_id == user_id).all()
+    result = await db.execute(
+        select(Cart).options(joinedload(Cart.service)).filter(Cart.user_id == user_id)
+    )
+    items = result.scalars().all()
     logger.info("Retrieved %d cart items for user %s", len(items), user_id)
     return items
 
-def update_cart_item(db: Session, item_id: int, cart_data: CartUpdateSchema) -> Cart:
-    item = db.query(Cart).filter(Cart.id == item_id).first()
-    if not item:
-        logger.error("Cart item not found with id %s", item_id)
+async def get_cart_rows(db: AsyncSession, user_id: int) -> list:
+    """
+    Retrieves the user's cart as plain dicts shaped like CartResponseSchema.
+
+    Reads column tuples from one cart LEFT JOIN services query, so no ORM
+    objects are created and no schema validation is needed to serialize them.
+
+    Args:
+        db (AsyncSession): The database session.
+        user_id (int): The cart owner.
+    Returns:
+        list: Cart item dicts, each with a nested "service" dict (or None).
+    """
+    result = await db.execute(
+        select(*CART_ITEM_COLUMNS, *SERVICE_COLUMNS)
+        .outerjoin(Service, Cart.service_id == Service.id)
+        .filter(Cart.user_id == user_id)
+    )
+    split = len(CART_ITEM_FIELDS)
+    items = []
+    for row in result:
+        item = dict(zip(CART_ITEM_FIELDS, row[:split]))
+        service = row[split:]
+        item["service"] = dict(zip(SERVICE_FIELDS, service)) if service[0] is not None else None
+        items.append(item)
+    logger.info("Retrieved %d cart rows for user %s", len(items), user_id)
+    return items
+
+async def update_cart_item(db: AsyncSession, user_id: int, item_id: int, cart_data: CartUpdateSchema) -> dict:
+    """
+    Updates one of the user's cart items.
+
+    Args:
+        db (AsyncSession): The database session.
+        user_id (int): The cart owner.
+        item_id (int): ID of the cart item.
+        cart_data (CartUpdateSchema): Fields to change.
+    Returns:
+        dict: The cart item shaped like CartResponseSchema.
+    Raises:
+        HTTPException: If the user has no cart item with this id.
+    """
+    owned = (Cart.id == item_id) & (Cart.user_id == user_id)
+    update_data = cart_data.model_dump(exclude_unset=True)
+    if update_data:
+        stmt = update(Cart).where(owned).values(**update_data).returning(*CART_ITEM_COLUMNS)
+    else:
+        stmt = select(*CART_ITEM_COLUMNS).where(owned)
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        logger.error("Cart item %s not found for user %s", item_id, user_id)
         raise HTTPException(status_code=404, detail="Cart item not found")
-    update_data = cart_data.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(item, key, value)
-    db.commit()
-    db.refresh(item)
+    await db.commit()
+    item = dict(zip(CART_ITEM_FIELDS, row))
+    item["service"] = await get_service_details(db, item["service_id"])
     logger.info("Updated cart item with id %s", item_id)
     return item
 
-def delete_cart_item(db: Session, item_id: int):
-    item = db.query(Cart).filter(Cart.id == item_id).first()
-    if not item:
-        logger.error("Cart item not found with id %s", item_id)
+async def delete_cart_item(db: AsyncSession, user_id: int, item_id: int):
+    """
+    Deletes one of the user's cart items.
+
+    Args:
+        db (AsyncSession): The database session.
+        user_id (int): The cart owner.
+        item_id (int): ID of the cart item.
+    Returns:
+        dict: A confirmation message.
+    Raises:
+        HTTPException: If the user has no cart item with this id.
+    """
+    result = await db.execute(
+        delete(Cart).where(Cart.id == item_id, Cart.user_id == user_id).returning(Cart.id)
+    )
+    if result.first() is None:
+        logger.error("Cart item %s not found for user %s", item_id, user_id)
         raise HTTPException(status_code=404, detail="Cart item not found")
-    db.delete(item)
-    db.commit()
+    await db.commit()
     logger.info("Deleted cart item with id %s", item_id)
     return {"detail": "Cart item deleted successfully"}
 
-def clear_cart(db: Session, user_id: int):
-    items = db.query(Cart).filter(Cart.user_id == user_id).all()
-    for item in items:
-        db.delete(item)
-    db.commit()
-    logger.info("Cleared all cart items for user %s", user_id)
+async def clear_cart(db: AsyncSession, user_id: int):
+    result = await db.execute(delete(Cart).where(Cart.user_id == user_id))
+    await db.commit()
+    logger.info("Cleared %d cart items for user %s", result.rowcount, user_id)
     return {"detail": "Cart cleared successfully"}
 
-def get_cart_total(db: Session, user_id: int) -> float:
-    items = db.query(Cart).options(joinedload(Cart.service)).filter(Cart.user_id == user_id).all()
-    total = 0.0
-    for item in items:
-        service = item.service
-        if service:
-            total += item.quantity * service.base_price
-    logger.info("Calculated cart total for user %s: %f", user_id, total)
+async def get_cart_total(db: AsyncSession, user_id: int) -> Decimal:
+    # Aggregate in the database: one SUM over cart JOIN services, no entities loaded.
+    line_total = Cart.quantity * cast(Service.base_price, Numeric(12, 2))
+    result = await db.execute(
+        select(func.coalesce(func.sum(line_total), 0))
+        .select_from(Cart)
+        .join(Service, Cart.service_id == Service.id)
+        .filter(Cart.user_id == user_id)
+    )
+    total = to_money(result.scalar_one())
+    logger.info("Calculated cart total for user %s: %s", user_id, total)
     return total
+
+async def get_cart_summary(db: AsyncSession, user_id: int) -> dict:
+    # The items are loaded anyway, so the totals are computed from them
+    # instead of issuing a second (aggregate) query.
+    items = await get_cart_items(db, user_id)
+    total = Decimal(0)
+    total_quantity = 0
+    for item in items:
+        total_quantity += item.quantity
+        if item.service:
+            total += item.quantity * Decimal(str(item.service.base_price))
+    return {
+        "items": items,
+        "item_count": len(items),
+        "total_quantity": total_quantity,
+        "total": to_money(total),
+    }
@@ -0,0 +1,198 @@
+# app/controllers/order_controller.py
+"""
+Order Controller.
+
+Provides business logic for turning a user's cart into an order.
+
+Checkout runs in one transaction: the cart rows are locked (SELECT ... FOR
+UPDATE on PostgreSQL), service prices are snapshotted into order_items, the
+pending payment and scheduled delivery are created and the checked-out cart
+rows are deleted, all with set-based statements. An optional idempotency key
+makes retries return the order created by the first attempt.
+
+Relationships are loaded with a fixed plan per view, so the number of queries
+does not grow with the number of orders or items: the history page costs two
+statements and a single order three.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Optional, Tuple
+from sqlalchemy import select, insert, delete, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload, selectinload
+from fastapi import HTTPException
+from app.models.cart import Cart
+from app.models.service import Service
+from app.models.order import Order, OrderItem
+from app.models.payment import Payment
+from app.models.delivery import Delivery
+from app.controllers.cart_controller import to_money
+from app.utils.helpers import encode_cursor, decode_cursor
+from app.validators.order_validator import CheckoutSchema, OrderListQuery
+
+logger = logging.getLogger("order_controller")
+
+# History and checkout responses: payment and delivery are one-to-one and ride
+# along in the main query; items come from one extra IN query per page.
+ORDER_LIST_OPTIONS = (
+    joinedload(Order.payment),
+    joinedload(Order.delivery),
+    selectinload(Order.order_items),
+)
+
+# Single order: items with their services, plus reviews.
+ORDER_DETAIL_OPTIONS = (
+    joinedload(Order.payment),
+    joinedload(Order.delivery),
+    selectinload(Order.order_items).joinedload(OrderItem.service),
+    selectinload(Order.reviews),
+)
+
+async def _load_order(db: AsyncSession, user_id: int, order_id: int, options) -> Order:
+    result = await db.execute(
+        select(Order).options(*options).filter(Order.id == order_id, Order.user_id == user_id)
+    )
+    order = result.scalars().first()
+    if not order:
+        logger.error("Order not found with id %s for user %s", order_id, user_id)
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
+
+async def get_order(db: AsyncSession, user_id: int, order_id: int) -> Order:
+    return await _load_order(db, user_id, order_id, ORDER_DETAIL_OPTIONS)
+
+async def list_orders(db: AsyncSession, user_id: int, query: OrderListQuery) -> dict:
+    """
+    Retrieves one page of the user's orders, newest first.
+
+    Pages are keyset-paginated on (created_at, id). The cursor only carries
+    the id of the last order; its created_at is read back from the table
+    inside the same statement, so timestamps never round-trip through clients.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (int): The owner of the orders.
+        query (OrderListQuery): Page size and cursor.
+    Returns:
+        dict: {"items": List[Order], "next_cursor": str or None}
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    stmt = (
+        select(Order)
+        .options(*ORDER_LIST_OPTIONS)
+        .filter(Order.user_id == user_id)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(query.limit + 1)
+    )
+    if query.cursor:
+        try:
+            last_id = int(decode_cursor(query.cursor)["id"])
+        except (ValueError, KeyError, TypeError):
+            logger.error("Invalid order cursor: %s", query.cursor)
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        last = aliased(Order)
+        last_created_at = select(last.created_at).filter(last.id == last_id).scalar_subquery()
+        stmt = stmt.filter(tuple_(Order.created_at, Order.id) < tuple_(last_created_at, last_id))
+
+    orders = list((await db.execute(stmt)).unique().scalars().all())
+    next_cursor = None
+    if len(orders) > query.limit:
+        orders = orders[:query.limit]
+        next_cursor = encode_cursor({"id": orders[-1].id})
+    logger.info("Retrieved %d orders for user %s", len(orders), user_id)
+    return {"items": orders, "next_cursor": next_cursor}
+
+async def _find_by_idempotency_key(db: AsyncSession, user_id: int, key: Optional[str]) -> Optional[Order]:
+    if not key:
+        return None
+    result = await db.execute(
+        select(Order).options(*ORDER_LIST_OPTIONS).filter(Order.user_id == user_id, Order.idempotency_key == key)
+    )
+    return result.scalars().first()
+
+async def checkout(
+    db: AsyncSession, user_id: int, checkout_data: CheckoutSchema, idempotency_key: Optional[str] = None
+) -> Tuple[Order, bool]:
+    """
+    Convert the user's cart into an order with its items, payment and delivery.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (int): The ordering user.
+        checkout_data (CheckoutSchema): Payment method and requested times.
+        idempotency_key (str, optional): Client key identifying this checkout attempt.
+    Returns:
+        Tuple[Order, bool]: The order and whether it was created by this call
+        (False when an earlier attempt with the same key is replayed).
+    Raises:
+        HTTPException: 400 if the cart is empty.
+    """
+    existing = await _find_by_idempotency_key(db, user_id, idempotency_key)
+    if existing:
+        logger.info("Replaying checkout %s for user %s (order %s)", idempotency_key, user_id, existing.id)
+        return existing, False
+
+    # Lock the cart rows so concurrent checkouts of the same cart serialize.
+    result = await db.execute(
+        select(Cart.id, Cart.service_id, Cart.quantity, Cart.custom_instructions, Service.base_price)
+        .join(Service, Cart.service_id == Service.id)
+        .filter(Cart.user_id == user_id)
+        .order_by(Cart.id)
+        .with_for_update(of=Cart)
+    )
+    lines = result.all()
+    if not lines:
+        await db.rollback()
+        # A concurrent attempt with the same key may have just checked the cart out.
+        existing = await _find_by_idempotency_key(db, user_id, idempotency_key)
+        if existing:
+            return existing, False
+        logger.error("Checkout attempted with an empty cart for user %s", user_id)
+        raise HTTPException(status_code=400, detail="Cart is empty")
+
+    total = to_money(sum(line.quantity * Decimal(str(line.base_price)) for line in lines))
+    try:
+        order_id = (await db.execute(
+            insert(Order).values(
+                user_id=user_id,
+                status="Placed",
+                total_price=float(total),
+                pickup_time=checkout_data.pickup_time,
+                delivery_time=checkout_data.delivery_time,
+                idempotency_key=idempotency_key,
+            ).returning(Order.id)
+        )).scalar_one()
+        await db.execute(insert(OrderItem), [
+            {
+                "order_id": order_id,
+                "service_id": line.service_id,
+                "quantity": line.quantity,
+                "price": line.base_price,
+                "custom_instructions": line.custom_instructions,
+            }
+            for line in lines
+        ])
+        await db.execute(insert(Payment).values(
+            order_id=order_id, user_id=user_id, amount=float(total), method=checkout_data.payment_method, status="Pending"
+        ))
+        await db.execute(insert(Delivery).values(
+            order_id=order_id,
+            pickup_time=checkout_data.pickup_time,
+            delivery_time=checkout_data.delivery_time,
+            status="Scheduled",
+        ))
+        await db.execute(delete(Cart).where(Cart.id.in_([line.id for line in lines])))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        # Lost a race with a concurrent attempt using the same idempotency key.
+        existing = await _find_by_idempotency_key(db, user_id, idempotency_key)
+        if existing:
+            return existing, False
+        raise
+
+    logger.info("Checked out %d cart items into order %s for user %s (total %s)", len(lines), order_id, user_id, total)
+    return await _load_order(db, user_id, order_id, ORDER_LIST_OPTIONS), True
@@ -4,48 +4,114 @@ Service Controller.
 
 Contains business logic for creating, reading, updating, and deleting laundry services.
 Uses SQLAlchemy sessions and logs operations. Follows best practices for error handling.
+
+Catalog reads go through ``catalog_cache`` (a read-through VersionedCache holding
+plain dicts and pre-encoded JSON payloads); create/update/delete invalidate it
+after committing.
+
+Writes are single statements: INSERT ... ON CONFLICT (name) DO NOTHING,
+UPDATE ... RETURNING and DELETE ... RETURNING report a duplicate name or a
+missing service through the rows they return, without a prior SELECT and
+without reloading the row after the commit. They also apply the change to the
+worker's autocomplete index.
+
+Search ranks services against free text: on PostgreSQL with the weighted
+full-text document and trigram similarity of the name (both indexed, see
+app.models.service); elsewhere with LIKE conditions, which scan the table.
 """
 
+import json
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, tuple_, and_, or_, case, func, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
-from app.models.service import Service
-from app.validators.service_validator import ServiceCreateSchema, ServiceUpdateSchema
+from app.database import dialect_insert
+from app.models.service import Service, search_document
+from app.models.order import OrderItem
+from app.validators.service_validator import ServiceCreateSchema, ServiceUpdateSchema, ServiceListQuery, ServiceSearchQuery
+from app.utils.cache import VersionedCache
+from app.utils.search_index import autocomplete_index, tokenize
+from app.utils.helpers import make_etag, encode_cursor, decode_cursor
+from app.utils.fast_json import dumps
+from app.config import CATALOG_CACHE_TTL_SECONDS, SERVICES_DEFAULT_PAGE_SIZE, SEARCH_DEFAULT_LIMIT
 
 logger = logging.getLogger("service_controller")
 
-def create_service(db: Session, service_data: ServiceCreateSchema) -> Service:
+# Read-through cache for the service catalog.
+catalog_cache = VersionedCache("catalog", ttl=CATALOG_CACHE_TTL_SECONDS)
+
+# Columns exposed in catalog responses (mirrors ServiceResponseSchema).
+SERVICE_FIELDS = ("id", "name", "description", "base_price", "category", "image_url")
+SERVICE_COLUMNS = tuple(getattr(Service, field) for field in SERVICE_FIELDS)
+
+# Sortable columns for paginated listings; ties are broken by id.
+SORT_COLUMNS = {"id": Service.id, "name": Service.name, "base_price": Service.base_price}
+
+def service_to_dict(service: Service) -> dict:
+    """
+    Convert a Service row into a plain dict suitable for caching.
+
+    Args:
+        service (Service): The service object.
+
+    Returns:
+        dict: The service's catalog fields.
+    """
+    return {field: getattr(service, field) for field in SERVICE_FIELDS}
+
+def encode_catalog_payload(data) -> dict:
+    """
+    Encode catalog data to JSON once, together with its strong ETag.
+
+    The ETag is a digest of the encoded body, so every worker agrees on it
+    even though each keeps its own cache version counter.
+
+    Args:
+        data: A service dict or a list of them.
+
+    Returns:
+        dict: {"body": bytes, "etag": str}
+    """
+    body = dumps(data)
+    return {"body": body, "etag": make_etag(body)}
+
+async def create_service(db: AsyncSession, service_data: ServiceCreateSchema) -> dict:
     """
     Creates a new service in the database.
     
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         service_data (ServiceCreateSchema): Data for the new service.
     
     Returns:
-        Service: The created service object.
+        dict: The created service's catalog fields.
     
     Raises:
         HTTPException: If a service with the same name already exists.
     """
-    existing_service = db.query(Service).filter(Service.name == service_data.name).first()
-    if existing_service:
+    stmt = (
+        dialect_insert(db, Service)
+        .values(**service_data.model_dump())
+        .on_conflict_do_nothing(index_elements=[Service.name])
+        .returning(*SERVICE_COLUMNS)
+    )
+    row = (await db.execute(stmt)).first()
+    if row is None:
         logger.error("Service already exists with name: %s", service_data.name)
         raise HTTPException(status_code=400, detail="Service already exists")
-    
-    new_service = Service(**service_data.dict())
-    db.add(new_service)
-    db.commit()
-    db.refresh(new_service)
-    logger.info("Created service with id: %s", new_service.id)
-    return new_service
+    await db.commit()
+    await catalog_cache.invalidate()
+    autocomplete_index.add(row.id, row.name)
+    logger.info("Created service with id: %s", row.id)
+    return dict(zip(SERVICE_FIELDS, row))
 
-def get_service_by_id(db: Session, service_id: int) -> Service:
+async def get_service_by_id(db: AsyncSession, service_id: int) -> Service:
     """
     Retrieves a service by its ID.
     
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         service_id (int): ID of the service.
     
     Returns:
@@ -54,56 +120,279 @@ def get_service_by_id(db: Session, service_id: int) -> Service:
     Raises:
         HTTPException: If the service is not found.
     """
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         logger.error("Service not found with id: %s", service_id)
         raise HTTPException(status_code=404, detail="Service not found")
     return service
 
-def get_all_services(db: Session):
+async def get_service_details(db: AsyncSession, service_id: int) -> dict:
+    """
+    Retrieves a service by its ID through the catalog cache.
+    
+    Args:
+        db (AsyncSession): The database session.
+        service_id (int): ID of the service.
+    
+    Returns:
+        dict: The service's catalog fields.
+    
+    Raises:
+        HTTPException: If the service is not found.
+    """
+    async def load():
+        return service_to_dict(await get_service_by_id(db, service_id))
+
+    return await catalog_cache.get_or_load(f"service:{service_id}", load)
+
+async def get_all_services(db: AsyncSession):
+    """
+    Retrieves all services through the catalog cache.
+    
+    Args:
+        db (AsyncSession): The database session.
+    
+    Returns:
+        List[dict]: The catalog fields of every service.
+    """
+    async def load():
+        # Read plain column tuples; no ORM objects are needed for a read-only listing.
+        result = await db.execute(select(*SERVICE_COLUMNS))
+        services = [dict(zip(SERVICE_FIELDS, row)) for row in result]
+        logger.info("Retrieved %d services", len(services))
+        return services
+
+    return await catalog_cache.get_or_load("all", load)
+
+async def get_service_payload(db: AsyncSession, service_id: int) -> dict:
     """
-    Retrieves all services from the database.
+    Retrieves the pre-encoded JSON payload of a single service.
     
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
+        service_id (int): ID of the service.
     
     Returns:
-        List[Service]: A list of all services.
+        dict: {"body": bytes, "etag": str}
+    
+    Raises:
+        HTTPException: If the service is not found.
     """
-    services = db.query(Service).all()
-    logger.info("Retrieved %d services", len(services))
+    async def load():
+        return encode_catalog_payload(await get_service_details(db, service_id))
+
+    return await catalog_cache.get_or_load(f"service:{service_id}:payload", load)
+
+async def get_all_services_payload(db: AsyncSession) -> dict:
+    """
+    Retrieves the pre-encoded JSON payload of the full service list.
+    
+    Args:
+        db (AsyncSession): The database session.
+    
+    Returns:
+        dict: {"body": bytes, "etag": str}
+    """
+    async def load():
+        return encode_catalog_payload(await get_all_services(db))
+
+    return await catalog_cache.get_or_load("all:payload", load)
+
+async def query_services_page(db: AsyncSession, query: ServiceListQuery) -> dict:
+    """
+    Retrieves one page of services using keyset (cursor) pagination.
+
+    The cursor carries the last row's sort value and id, so each page is a
+    range scan on an index ending in id and costs the same at any depth.
+
+    Args:
+        db (AsyncSession): The database session.
+        query (ServiceListQuery): Filters, sort and pagination parameters.
+
+    Returns:
+        dict: {"items": List[dict], "next_cursor": str or None}
+
+    Raises:
+        HTTPException: If the cursor is malformed or was issued for a different sort.
+    """
+    sort = query.sort or "id"
+    order = query.order or "asc"
+    limit = query.limit or SERVICES_DEFAULT_PAGE_SIZE
+    column = SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    stmt = select(*SERVICE_COLUMNS)
+    if query.category is not None:
+        stmt = stmt.where(Service.category == query.category)
+    if query.min_price is not None:
+        stmt = stmt.where(Service.base_price >= query.min_price)
+    if query.max_price is not None:
+        stmt = stmt.where(Service.base_price <= query.max_price)
+
+    if query.cursor:
+        try:
+            position = decode_cursor(query.cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if position.get("sort") != sort or position.get("order") != order or "id" not in position:
+            raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+        if sort == "id":
+            key, last = Service.id, position["id"]
+        else:
+            key, last = tuple_(column, Service.id), (position.get("value"), position["id"])
+        stmt = stmt.where(key < last if descending else key > last)
+
+    ordering = [column] if sort == "id" else [column, Service.id]
+    stmt = stmt.order_by(*(col.desc() if descending else col.asc() for col in ordering)).limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = [dict(zip(SERVICE_FIELDS, row)) for row in result]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        next_cursor = encode_cursor({"sort": sort, "order": order, "value": last_row[sort], "id": last_row["id"]})
+    logger.info("Retrieved page of %d services (sort=%s %s)", len(rows), sort, order)
+    return {"items": rows, "next_cursor": next_cursor}
+
+async def get_services_page_payload(db: AsyncSession, query: ServiceListQuery) -> dict:
+    """
+    Retrieves the pre-encoded JSON payload of one page of services.
+
+    Args:
+        db (AsyncSession): The database session.
+        query (ServiceListQuery): Filters, sort and pagination parameters.
+
+    Returns:
+        dict: {"body": bytes, "etag": str, "next_cursor": str or None}
+    """
+    async def load():
+        page = await query_services_page(db, query)
+        payload = encode_catalog_payload(page["items"])
+        payload["next_cursor"] = page["next_cursor"]
+        return payload
+
+    key = "page:" + json.dumps(query.model_dump(exclude_none=True), sort_keys=True)
+    return await catalog_cache.get_or_load(key, load)
+
+def _search_statement(dialect: str, words: list, limit: int):
+    """Build the ranked search query for the given words (see search_services)."""
+    phrase = " ".join(words)
+    if dialect == "postgresql":
+        # Every word must occur, the last also as a prefix; or the name is
+        # similar to the whole text, which tolerates typos.
+        ts_query = func.to_tsquery(text("'english'"), " & ".join(words[:-1] + [words[-1] + ":*"]))
+        document = search_document()
+        matches = or_(document.op("@@")(ts_query), Service.name.op("%")(phrase))
+        score = func.ts_rank_cd(document, ts_query) + func.similarity(Service.name, phrase)
+        ordering = [score.desc(), Service.id]
+    else:
+        # Every word must occur in the name, category or description.
+        def contains(column, word):
+            return column.ilike(f"%{word}%")
+
+        matches = and_(*(
+            or_(contains(Service.name, word), contains(Service.category, word), contains(Service.description, word))
+            for word in words
+        ))
+        score = case(
+            (Service.name.ilike(f"{phrase}%"), 4),
+            (and_(*(contains(Service.name, word) for word in words)), 3),
+            (and_(*(contains(Service.category, word) for word in words)), 2),
+            else_=1,
+        )
+        ordering = [score.desc(), func.length(Service.name), Service.id]
+    return select(*SERVICE_COLUMNS).where(matches).order_by(*ordering).limit(limit)
+
+async def search_services(db: AsyncSession, query: ServiceSearchQuery) -> list:
+    """
+    Searches services by name, category and description.
+
+    Args:
+        db (AsyncSession): The database session.
+        query (ServiceSearchQuery): The search text and result limit.
+
+    Returns:
+        List[dict]: The catalog fields of the best-matching services, best first.
+    """
+    words = tokenize(query.q)
+    if not words:
+        return []
+    stmt = _search_statement(db.bind.dialect.name, words, query.limit or SEARCH_DEFAULT_LIMIT)
+    result = await db.execute(stmt)
+    services = [dict(zip(SERVICE_FIELDS, row)) for row in result]
+    logger.info("Search for %r matched %d services", query.q, len(services))
     return services
 
-def update_service(db: Session, service_id: int, service_data: ServiceUpdateSchema) -> Service:
+async def search_services_payload(db: AsyncSession, query: ServiceSearchQuery) -> dict:
+    """
+    Retrieves the pre-encoded JSON payload of a service search.
+
+    Args:
+        db (AsyncSession): The database session.
+        query (ServiceSearchQuery): The search text and result limit.
+
+    Returns:
+        dict: {"body": bytes, "etag": str}
+    """
+    async def load():
+        return encode_catalog_payload(await search_services(db, query))
+
+    # Texts with the same words share an entry.
+    key = "search:" + json.dumps([tokenize(query.q), query.limit or SEARCH_DEFAULT_LIMIT])
+    return await catalog_cache.get_or_load(key, load)
+
+def _is_duplicate_name(error: IntegrityError) -> bool:
+    # SQLite reports "UNIQUE constraint failed: services.name", PostgreSQL
+    # names the violated index; any other integrity error is not a duplicate.
+    message = str(error.orig)
+    return "services.name" in message or "uq_services_name" in message
+
+async def update_service(db: AsyncSession, service_id: int, service_data: ServiceUpdateSchema) -> dict:
     """
     Updates an existing service.
     
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         service_id (int): ID of the service to update.
         service_data (ServiceUpdateSchema): Data for updating the service.
     
     Returns:
-        Service: The updated service object.
+        dict: The updated service's catalog fields.
     
     Raises:
-        HTTPException: If the service is not found.
+        HTTPException: If the service is not found, or the new name is taken.
     """
-    service = get_service_by_id(db, service_id)
-    update_data = service_data.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(service, key, value)
-    db.commit()
-    db.refresh(service)
+    update_data = service_data.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_service_details(db, service_id)
+    stmt = update(Service).where(Service.id == service_id).values(**update_data).returning(*SERVICE_COLUMNS)
+    try:
+        row = (await db.execute(stmt)).first()
+    except IntegrityError as e:
+        await db.rollback()
+        if not _is_duplicate_name(e):
+            raise
+        logger.error("Service already exists with name: %s", update_data.get("name"))
+        raise HTTPException(status_code=400, detail="Service already exists")
+    if row is None:
+        logger.error("Service not found with id: %s", service_id)
+        raise HTTPException(status_code=404, detail="Service not found")
+    await db.commit()
+    await catalog_cache.invalidate()
+    autocomplete_index.add(row.id, row.name)
     logger.info("Updated service with id: %s", service_id)
-    return service
+    return dict(zip(SERVICE_FIELDS, row))
 
-def delete_service(db: Session, service_id: int):
+async def delete_service(db: AsyncSession, service_id: int):
     """
     Deletes a service from the database.
+
+    Its order items are deleted with it, as the ORM cascade on
+    Service.order_items did, in one set-based statement.
     
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         service_id (int): ID of the service to delete.
     
     Returns:
@@ -112,8 +401,14 @@ def delete_service(db: Session, service_id: int):
     Raises:
         HTTPException: If the service is not found.
     """
-    service = get_service_by_id(db, service_id)
-    db.delete(service)
-    db.commit()
+    await db.execute(delete(OrderItem).where(OrderItem.service_id == service_id))
+    result = await db.execute(delete(Service).where(Service.id == service_id).returning(Service.id))
+    if result.first() is None:
+        await db.rollback()
+        logger.error("Service not found with id: %s", service_id)
+        raise HTTPException(status_code=404, detail="Service not found")
+    await db.commit()
+    await catalog_cache.invalidate()
+    autocomplete_index.remove(service_id)
     logger.info("Deleted service with id: %s", service_id)
     return {"detail": "Service deleted successfully"}
@@ -1,73 +1,289 @@
 # app/controllers/user_controller.py
 import logging
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from jose import JWTError
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
+from app.database import dialect_insert
 from app.models.user import User
-from app.validators.user_validator import UserCreateSchema, UserLoginSchema
-from app.utils.hashing import hash_password, verify_password
-from app.utils.jwt_utils import create_access_token
+from app.models.auth_session import AuthSession
+from app.models.revoked_token import RevokedToken
+from app.services.user_service import get_user_by_email, create_user
+from app.validators.user_validator import UserCreateSchema, UserLoginSchema, UserUpdateSchema
+from app.utils.hashing import HashingBusyError, hash_password_async, verify_and_update_password_async
+from app.utils.jwt_utils import (
+    ACCESS_TOKEN_LIFETIME,
+    REFRESH_TOKEN_LIFETIME,
+    create_access_token,
+    create_refresh_token,
+    decode_refresh_token,
+    new_token_id,
+)
+from app.utils.revocation import revocation_list
+from app.utils.cache import VersionedCache, LocalCacheBackend
+from app.config import USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS
 
 """
 User controller module.
 
-Contains business logic for creating a new user and authenticating an existing user.
+Contains business logic for creating a new user, authenticating an existing user,
+reading and updating profiles, and managing login sessions: refresh token
+rotation and logout.
+Password hashing runs in the bounded hashing pool (see app.utils.hashing).
+
+A login opens an AuthSession and returns an access token plus a refresh token
+bound to it. Refreshing swaps the session's refresh token for a new one without
+touching bcrypt; presenting an already-rotated refresh token revokes the whole
+session. Logout revokes the session, which also invalidates its outstanding
+access tokens through the revocation list. Access tokens carry the user's
+role, so authorization checks read it from the token (app.utils.current_user).
+
+Profiles are read through ``user_cache`` and evicted when updated.
 """
 
-logging.debug("User controller module loaded")
+# Seconds clients are asked to wait when the hashing pool is saturated.
+HASHING_RETRY_AFTER_SECONDS = 1
+
+# Read-through cache of profile dicts, keyed by user id.
+user_cache = VersionedCache("users", LocalCacheBackend(max_entries=USER_CACHE_SIZE), ttl=USER_CACHE_TTL_SECONDS)
+
+# Columns exposed as the user profile.
+PROFILE_FIELDS = ("id", "name", "email", "phone", "address", "role")
+PROFILE_COLUMNS = tuple(getattr(User, field) for field in PROFILE_FIELDS)
 
-def create_user_controller(user_data: UserCreateSchema, db: Session) -> User:
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Server busy, please retry",
+        headers={"Retry-After": str(HASHING_RETRY_AFTER_SECONDS)},
+    )
+
+async def create_user_controller(user_data: UserCreateSchema, db: AsyncSession) -> User:
     """
-    Create a new user in the database after checking for email uniqueness.
+    Create a new user in the database.
+
+    Email uniqueness is enforced by the insert itself (ON CONFLICT on the
+    unique users.email), which also holds under concurrent sign-ups.
 
     Args:
         user_data (UserCreateSchema): Validated user registration data.
-        db (Session): Database session.
+        db (AsyncSession): Database session.
     Returns:
         User: The newly created user object.
     Raises:
-        HTTPException: If the email is already registered.
+        HTTPException: If the email is already registered, or 503 if the hashing pool is saturated.
     """
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        logging.error("Email already registered: %s", user_data.email)
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    hashed_pwd = hash_password(user_data.password)
-    new_user = User(
+    try:
+        hashed_pwd = await hash_password_async(user_data.password)
+    except HashingBusyError:
+        raise _hashing_busy()
+    new_user = await create_user(
+        db,
         name=user_data.name,
         email=user_data.email,
         password_hash=hashed_pwd,
         phone=user_data.phone,
         address=user_data.address,
-        role="customer"
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    if new_user is None:
+        logging.error("Email already registered: %s", user_data.email)
+        raise HTTPException(status_code=400, detail="Email already registered")
+    await db.commit()
     logging.debug("Created new user with id: %s", new_user.id)
     return new_user
 
-def authenticate_user_controller(user_data: UserLoginSchema, db: Session) -> dict:
+async def authenticate_user_controller(user_data: UserLoginSchema, db: AsyncSession) -> dict:
     """
     Authenticate a user with email and password. If successful, return a JWT token.
 
+    If the stored hash was made with outdated settings (e.g. a different
+    BCRYPT_ROUNDS), it is replaced with a fresh hash of the same password.
+
     Args:
         user_data (UserLoginSchema): Validated user login data.
-        db (Session): Database session.
+        db (AsyncSession): Database session.
     Returns:
         dict: A dictionary with JWT token and user details.
     Raises:
-        HTTPException: If authentication fails.
+        HTTPException: If authentication fails, or 503 if the hashing pool is saturated.
     """
-    user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.password_hash):
+    user = await get_user_by_email(db, user_data.email)
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_and_update_password_async(user_data.password, user.password_hash)
+        except HashingBusyError:
+            raise _hashing_busy()
+    if not valid:
         logging.error("Authentication failed for email: %s", user_data.email)
         raise HTTPException(status_code=400, detail="Invalid email or password")
-    
-    access_token = create_access_token(data={"sub": str(user.id)})
-    logging.debug("User authenticated; token generated for user id: %s", user.id)
+
+    if new_hash:
+        user.password_hash = new_hash
+        logging.debug("Re-hashed password with current settings for user id: %s", user.id)
+
+    # Open the session in the same commit as any re-hash.
+    sid, refresh_jti = new_token_id(), new_token_id()
+    db.add(AuthSession(
+        id=sid,
+        user_id=user.id,
+        refresh_jti=refresh_jti,
+        expires_at=datetime.now(timezone.utc) + REFRESH_TOKEN_LIFETIME,
+    ))
+    await db.commit()
+    logging.debug("User authenticated; session %s opened for user id: %s", sid, user.id)
     return {
-        "access_token": access_token,
-        "token_type": "bearer",
+        **_token_pair(user.id, user.role, sid, refresh_jti),
         "user": {"id": user.id, "name": user.name, "email": user.email}
     }
+
+def _token_pair(user_id: int, role: str, sid: str, refresh_jti: str) -> dict:
+    claims = {"sub": str(user_id), "sid": sid}
+    access_claims = {**claims, "role": role}
+    return {
+        "access_token": create_access_token(access_claims),
+        "refresh_token": create_refresh_token({**claims, "jti": refresh_jti}),
+        "token_type": "bearer",
+    }
+
+async def _revoke(db: AsyncSession, token_id: str, expires_at: datetime):
+    """Record a revoked jti/sid, commit, and add it to this process's revocation list."""
+    stmt = dialect_insert(db, RevokedToken).values(jti=token_id, expires_at=expires_at)
+    await db.execute(stmt.on_conflict_do_nothing(index_elements=["jti"]))
+    await db.commit()
+    revocation_list.add(token_id, expires_at)
+
+async def _revoke_session(db: AsyncSession, sid: str, expires_at: datetime):
+    """End a session: its refresh token stops working, and its access tokens are revoked until expires_at."""
+    await db.execute(
+        update(AuthSession)
+        .where(AuthSession.id == sid, AuthSession.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    await _revoke(db, sid, expires_at)
+
+async def refresh_tokens_controller(refresh_token: str, db: AsyncSession) -> dict:
+    """
+    Rotate a refresh token: issue a new access/refresh token pair and invalidate the presented one.
+
+    The session row is swapped to the new refresh jti with a single conditional
+    UPDATE, so of two concurrent uses of one token only the first succeeds. A
+    token that no longer matches its live session was either already used
+    (a replay, so it may have leaked) or belongs to a closed session; either
+    way the session is revoked.
+
+    Args:
+        refresh_token (str): The refresh token returned by login or a previous refresh.
+        db (AsyncSession): Database session.
+    Returns:
+        dict: New "access_token" and "refresh_token", and "token_type".
+    Raises:
+        HTTPException: 401 if the refresh token is invalid, expired, already used, or its session was revoked.
+    """
+    try:
+        payload = decode_refresh_token(refresh_token)
+    except JWTError as e:
+        logging.error("Refresh token rejected: %s", e)
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    now = datetime.now(timezone.utc)
+    new_jti = new_token_id()
+    result = await db.execute(
+        update(AuthSession)
+        .where(
+            AuthSession.id == payload["sid"],
+            AuthSession.refresh_jti == payload["jti"],
+            AuthSession.revoked_at.is_(None),
+            AuthSession.expires_at > now,
+        )
+        .values(refresh_jti=new_jti, expires_at=now + REFRESH_TOKEN_LIFETIME)
+        .returning(AuthSession.user_id)
+    )
+    user_id = result.scalar_one_or_none()
+    if user_id is None:
+        logging.warning("Stale or reused refresh token for session %s; revoking it", payload["sid"])
+        await _revoke_session(db, payload["sid"], now + ACCESS_TOKEN_LIFETIME)
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    await db.commit()
+    logging.debug("Rotated refresh token for session %s", payload["sid"])
+    # The role is re-read here (through the cache), so role changes reach tokens at refresh.
+    profile = await get_user_profile(db, user_id)
+    return _token_pair(user_id, profile["role"], payload["sid"], new_jti)
+
+async def logout_controller(payload: dict, db: AsyncSession) -> None:
+    """
+    Log out the session of the given access token.
+
+    The session's refresh token stops working immediately, and the session id
+    is revoked for as long as any of its access tokens can still be valid.
+    Tokens issued before sessions existed are revoked by their own jti.
+
+    Args:
+        payload (dict): The verified access token payload (request.state.token).
+        db (AsyncSession): Database session.
+    """
+    expires_at = max(
+        datetime.now(timezone.utc) + ACCESS_TOKEN_LIFETIME,
+        datetime.fromtimestamp(payload.get("exp", 0), timezone.utc),
+    )
+    if "sid" in payload:
+        await _revoke_session(db, payload["sid"], expires_at)
+        logging.debug("Logged out session %s", payload["sid"])
+    elif "jti" in payload:
+        await _revoke(db, payload["jti"], expires_at)
+        logging.debug("Revoked sessionless token %s", payload["jti"])
+    else:
+        logging.warning("Logout with a token that has no jti; it stays valid until it expires")
+
+async def get_user_profile(db: AsyncSession, user_id: int) -> dict:
+    """
+    Return a user's profile, served from ``user_cache`` when possible.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (int): The user id.
+    Returns:
+        dict: The profile (PROFILE_FIELDS). Shared with the cache; do not mutate.
+    Raises:
+        HTTPException: 404 if the user does not exist.
+    """
+    async def load():
+        result = await db.execute(select(*PROFILE_COLUMNS).where(User.id == user_id))
+        row = result.first()
+        return dict(zip(PROFILE_FIELDS, row)) if row else None
+
+    profile = await user_cache.get_or_load(str(user_id), load)
+    if profile is None:
+        logging.error("User not found with id: %s", user_id)
+        raise HTTPException(status_code=404, detail="User not found")
+    return profile
+
+async def update_user_profile(db: AsyncSession, user_id: int, user_data: UserUpdateSchema) -> dict:
+    """
+    Update a user's profile fields and evict the cached profile.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (int): The user id.
+        user_data (UserUpdateSchema): Fields to change; unset fields are left as they are.
+    Returns:
+        dict: The updated profile.
+    Raises:
+        HTTPException: 404 if the user does not exist.
+    """
+    values = user_data.model_dump(exclude_unset=True)
+    if not values:
+        return await get_user_profile(db, user_id)
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(**values).returning(*PROFILE_COLUMNS)
+    )
+    row = result.first()
+    if row is None:
+        logging.error("User not found with id: %s", user_id)
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.commit()
+    await user_cache.delete(str(user_id))
+    logging.debug("Updated profile fields %s for user id: %s", sorted(values), user_id)
+    return dict(zip(PROFILE_FIELDS, row))
@@ -1,24 +1,329 @@
 # app/database.py
 import os
+import time
 import logging
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.config import DATABASE_URL
+import threading
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from app.utils.metrics import registry, instrument_engine
+from app.utils.query_budget import install_query_log
+from app.utils.replicas import replica_router
+from app.config import (
+    DATABASE_URL,
+    DATABASE_REPLICA_URLS,
+    DB_ECHO,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_STATEMENT_TIMEOUT_MS,
+)
 """
 Database configuration module.
 
-Creates a SQLAlchemy engine and session factory using DATABASE_URL.
-Provides a dependency for obtaining a database session.
+Creates SQLAlchemy engines and session factories for DATABASE_URL, lazily on
+first use (``get_engine``/``get_async_engine``), and provides dependencies for
+obtaining a database session. ``dispose_engines`` closes them on shutdown.
+
+Alongside the synchronous engine (used by scripts such as create_db_tables.py)
+an AsyncEngine is created for the API. Route handlers are ``async def``, so they
+must use ``get_async_db`` to avoid blocking the event loop on database I/O.
+
+Pool sizing, pre-ping, recycling, statement timeout and SQL echo all come from
+app.config (and therefore from the environment). ``get_pool_stats`` reports
+checked-out/overflow/wait counts for every engine.
+
+With DATABASE_REPLICA_URLS set, API sessions are ``RoutingSession``s: the
+session of a GET request reads from a replica picked by
+app.utils.replicas.replica_router, unless the user wrote within the last
+REPLICA_STICKY_SECONDS or no replica is usable. Flushes and INSERT/UPDATE/
+DELETE statements always go to the primary and make their user sticky.
 """
 
-# Configure logging for debugging database operations.
-logging.basicConfig(level=logging.DEBUG)
+# Async drivers used for each supported backend.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """
+    Convert a synchronous database URL into its async-driver equivalent.
+
+    Args:
+        url (str): A SQLAlchemy database URL (e.g. "postgresql://...").
+    Returns:
+        str: The same URL using the async driver (e.g. "postgresql+asyncpg://...").
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for database URL: {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+class PoolWaitStats:
+    """
+    Counters for connection checkouts that had to wait for a free connection.
+
+    Attributes:
+        waits (int): Checkouts that found the pool (including overflow) exhausted.
+        wait_time (float): Total seconds spent in those checkouts.
+        timeouts (int): Checkouts that gave up after DB_POOL_TIMEOUT.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def record(self, elapsed: float, timed_out: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_time += elapsed
+            if timed_out:
+                self.timeouts += 1
+
+class _WaitTrackingMixin:
+    """Pool mixin that records checkouts made while the pool is saturated."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _saturated(self) -> bool:
+        return self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow
+
+    def _do_get(self):
+        if not self._saturated():
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # Keep the counters when the engine replaces its pool (e.g. on dispose()).
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+class TrackedQueuePool(_WaitTrackingMixin, QueuePool):
+    """QueuePool with wait counters, used by the sync engine."""
+
+class TrackedAsyncQueuePool(_WaitTrackingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with wait counters, used by the async engine."""
 
-# Create the SQLAlchemy engine with SQL statement echo enabled for debugging.
-engine = create_engine(DATABASE_URL, echo=True)
+def _uses_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    Build create_engine/create_async_engine keyword arguments from app.config.
+
+    Args:
+        url (str): The database URL the engine will connect to.
+        is_async (bool): Whether the options are for the async engine.
+    Returns:
+        dict: Engine keyword arguments (echo, pool settings, connect_args).
+    """
+    parsed = make_url(url)
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    if _uses_memory_sqlite(parsed):
+        # In-memory SQLite uses a single shared connection; pool sizing does not apply.
+        return options
+
+    options.update(
+        poolclass=TrackedAsyncQueuePool if is_async else TrackedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    if DB_STATEMENT_TIMEOUT_MS > 0 and parsed.get_backend_name() == "postgresql":
+        if is_async:
+            # asyncpg takes server settings directly.
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            # libpq (psycopg2) takes them through the "options" startup parameter.
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+# Engines and session factories are created on first use rather than at import,
+# so importing this module (from tooling, scripts or a worker before it forks)
+# neither loads a database driver nor needs a reachable database.
+_lock = threading.Lock()
+_engine = None
+_session_factory = None
+_async_engine = None
+_async_session_factory = None
+_replica_engines = None
+
+def get_engine():
+    """
+    Return the synchronous engine, creating it on first use.
+
+    Returns:
+        Engine: The engine for DATABASE_URL, instrumented for metrics and query budgets.
+    """
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+                # Record SQL statement counts and timings for the metrics endpoint,
+                # and per-request statements for query budgets and N+1 detection.
+                instrument_engine(engine)
+                install_query_log(engine)
+                _engine = engine
+                logging.debug("Created sync database engine")
+    return _engine
+
+def get_sessionmaker() -> sessionmaker:
+    """Return the synchronous session factory, creating it on first use."""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _session_factory
+
+def get_async_engine():
+    """
+    Return the async engine used by the API routes, creating it on first use.
+
+    Returns:
+        AsyncEngine: The engine for the async-driver form of DATABASE_URL.
+    """
+    global _async_engine
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                url = to_async_url(DATABASE_URL)
+                engine = create_async_engine(url, **engine_options(url, is_async=True))
+                instrument_engine(engine.sync_engine)
+                install_query_log(engine.sync_engine)
+                _async_engine = engine
+                logging.debug("Created async database engine")
+    return _async_engine
+
+def get_replica_engines() -> dict:
+    """
+    Return the async engines of DATABASE_REPLICA_URLS, creating them on first use.
+
+    A lost connection to a replica marks it down in the replica router, so the
+    following reads go elsewhere until its next successful health check.
+
+    Returns:
+        dict: {"replica0": AsyncEngine, ...}; empty when no replicas are configured.
+    """
+    global _replica_engines
+    if _replica_engines is None:
+        with _lock:
+            if _replica_engines is None:
+                engines = {}
+                for index, url in enumerate(DATABASE_REPLICA_URLS):
+                    name = f"replica{index}"
+                    url = to_async_url(url)
+                    engine = create_async_engine(url, **engine_options(url, is_async=True))
+                    instrument_engine(engine.sync_engine)
+                    install_query_log(engine.sync_engine)
+                    event.listen(engine.sync_engine, "handle_error", _replica_error_handler(name))
+                    engines[name] = engine
+                _replica_engines = engines
+                logging.debug("Created %d replica database engines", len(engines))
+    return _replica_engines
 
-# Create a configured session factory.
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _replica_error_handler(name: str):
+    def handle_error(context):
+        if context.is_disconnect:
+            replica_router.mark_down(name)
+    return handle_error
+
+class RoutingSession(Session):
+    """
+    Session that reads from the replica in ``info["replica"]`` when set, and otherwise from the primary.
+
+    Writes (flushes and DML statements) always use the primary, and so do the
+    session's later reads; they also mark ``info["sticky_key"]`` (the user id)
+    as a recent writer. If the replica cannot be connected to, it is marked
+    down and the session reads from the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if self._flushing or getattr(clause, "is_dml", False):
+            replica_router.stick(self.info.get("sticky_key"))
+            replica = self.info["replica"] = None
+        if replica is not None:
+            bind = replica.engine.sync_engine
+            try:
+                # Connects on the session's first read only; later calls reuse the connection.
+                self.connection(bind_arguments={"bind": bind})
+                return bind
+            except (DBAPIError, OSError) as e:
+                logging.error("Replica %s unavailable, reading from the primary: %s", replica.name, e)
+                replica_router.mark_down(replica.name)
+                self.info["replica"] = None
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """
+    Return the async session factory, creating it on first use.
+
+    Objects are not expired on commit, because reloading expired attributes
+    would require implicit I/O, which AsyncSession forbids.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+async def dispose_engines():
+    """
+    Close the pooled connections of every engine created so far and forget them.
+
+    The next use creates fresh engines, e.g. in a new event loop or after a fork.
+    """
+    global _engine, _session_factory, _async_engine, _async_session_factory, _replica_engines
+    with _lock:
+        engine, async_engine, replica_engines = _engine, _async_engine, _replica_engines
+        _engine = _session_factory = _async_engine = _async_session_factory = _replica_engines = None
+    for replica_engine in (replica_engines or {}).values():
+        await replica_engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
+
+# Lazy module attributes for scripts and benchmarks written against the former
+# module-level objects (``from app.database import engine``).
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "SessionLocal": get_sessionmaker,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_sessionmaker,
+}
+
+def __getattr__(name: str):
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
 
 def get_db():
     """
@@ -27,7 +332,7 @@ def get_db():
     Yields:
         db (Session): A SQLAlchemy session.
     """
-    db = SessionLocal()
+    db = get_sessionmaker()()
     logging.debug("Created a new database session")
     try:
         yield db
@@ -35,3 +340,105 @@ def get_db():
         db.close()
         logging.debug("Closed the database session")
 
+# Requests whose session may read from a replica.
+REPLICA_METHODS = frozenset(("GET", "HEAD"))
+
+async def get_async_db(request: Request):
+    """
+    Dependency function that provides an async database session.
+
+    The session's writes are attributed to the authenticated user (for
+    read-your-writes), and for GET requests its reads are routed to a replica
+    when one is usable and the user has not written recently.
+
+    Args:
+        request (Request): The incoming request (token payload set by JWTMiddleware).
+    Yields:
+        db (AsyncSession): A SQLAlchemy async session.
+    """
+    async with get_async_sessionmaker()() as db:
+        payload = getattr(request.state, "token", None)
+        user_key = payload.get("sub") if payload else None
+        db.info["sticky_key"] = user_key
+        if request.method in REPLICA_METHODS and replica_router.replicas and not replica_router.is_sticky(user_key):
+            db.info["replica"] = replica_router.choose()
+        logging.debug("Created a new async database session")
+        yield db
+    logging.debug("Closed the async database session")
+
+def dialect_insert(db, table):
+    """
+    Build an INSERT for the session's dialect, supporting ``on_conflict_do_update``.
+
+    PostgreSQL and SQLite both accept ``INSERT ... ON CONFLICT``, but each
+    dialect exposes it through its own ``insert`` construct.
+
+    Args:
+        db (Session | AsyncSession): The session the statement will run on.
+        table: The mapped class or Table to insert into.
+    Returns:
+        Insert: A dialect-specific insert statement.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+def pool_stats(pool) -> dict:
+    """
+    Summarize the state of a connection pool.
+
+    Args:
+        pool: A SQLAlchemy pool instance.
+    Returns:
+        dict: Pool size, checked-in/checked-out/overflow counts and wait counters.
+    """
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout(),
+        )
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update(
+            waits=wait_stats.waits,
+            wait_time_seconds=round(wait_stats.wait_time, 6),
+            timeouts=wait_stats.timeouts,
+        )
+    return stats
+
+def get_pool_stats() -> dict:
+    """
+    Report connection pool statistics for the sync, async and replica engines.
+
+    Engines that have not been created yet are left out (and not created).
+
+    Returns:
+        dict: ``{"sync": {...}, "async": {...}, "replica0": {...}}`` as produced by ``pool_stats``.
+    """
+    stats = {}
+    if _engine is not None:
+        stats["sync"] = pool_stats(_engine.pool)
+    if _async_engine is not None:
+        stats["async"] = pool_stats(_async_engine.sync_engine.pool)
+    for name, replica_engine in (_replica_engines or {}).items():
+        stats[name] = pool_stats(replica_engine.sync_engine.pool)
+    return stats
+
+POOL_CHECKED_OUT = registry.gauge("db_pool_checked_out", "Connections currently checked out.", ("engine",))
+POOL_OVERFLOW = registry.gauge("db_pool_overflow", "Overflow connections currently open.", ("engine",))
+POOL_WAITS = registry.gauge("db_pool_waits_total", "Checkouts that waited on a saturated pool.", ("engine",))
+
+def _collect_pool_metrics():
+    for name, stats in get_pool_stats().items():
+        POOL_CHECKED_OUT.set(stats.get("checked_out", 0), engine=name)
+        POOL_OVERFLOW.set(stats.get("overflow", 0), engine=name)
+        POOL_WAITS.set(stats.get("waits", 0), engine=name)
+
+registry.add_collector(_collect_pool_metrics)
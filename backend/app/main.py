@@ -1,56 +1,146 @@
 # app/main.py
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.openapi.utils import get_openapi
-from app.routes.user_routes import router as user_router
-from app.routes.service_routes import router as service_router
-from app.routes.cart_routes import router as cart_router
-from app.middleware.jwt_middleware import JWTMiddleware
+from app.config import (
+    REVOCATION_SYNC_SECONDS, REVOCATION_PURGE_SECONDS, REPLICA_CHECK_SECONDS, AUTOCOMPLETE_REFRESH_SECONDS,
+    WARMUP_ENABLED, WARMUP_DB_CONNECTIONS,
+    WEB_CONCURRENCY, SERVER_BIND, GRACEFUL_TIMEOUT_SECONDS, KEEPALIVE_SECONDS,
+)
+from app.utils.logger import configure_logging, shutdown_logging
 
 """
 Main application entry point.
 
-Initializes the FastAPI app, sets up middleware (CORS and JWT), and includes
-user authentication routes. Also customizes the OpenAPI schema to include a
-JWT security scheme so that you can manually add the token via Swagger's
-'Authorize' button.
+``create_app`` builds the FastAPI app: it sets up middleware (CORS, JWT, query
+budgets, rate limits and metrics), includes the routers, and customizes the
+OpenAPI schema to include a JWT security scheme so that you can manually add
+the token via Swagger's 'Authorize' button.
+
+Importing this module does no work. Routers, controllers and their
+dependencies are imported by the factory; logging, the database engines, the
+revocation list sync and the read replica health checks are started by the
+lifespan hook in each worker and released when it shuts down. The hook also
+warms the worker up (database connections, service catalog, OpenAPI schema)
+before it accepts requests.
+
+In development, run ``uvicorn app.main:create_app --factory --reload``. In
+production, run ``gunicorn -c gunicorn.conf.py`` (one preloaded app, one
+UvicornWorker per CPU) or ``python -m app.main`` (uvicorn's own supervisor).
+``app.main:app`` still resolves, building the app on first access.
 """
 
-logging.basicConfig(level=logging.DEBUG)
-logging.debug("Starting FastAPI application with JWT security")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start logging, the token revocation sync, replica checks and autocomplete refresh and warm up; release the worker's resources on shutdown."""
+    from app.database import get_async_sessionmaker, get_replica_engines, dispose_engines
+    from app.utils.hashing import shutdown_hashing_executor
+    from app.utils.revocation import revocation_list
+    from app.utils.replicas import replica_router
+    from app.utils.search_index import autocomplete_index
+    from app.utils.warmup import warm_up
 
-app = FastAPI(
-    title="Laundry Service API",
-    description="API for managing laundry services with JWT Authentication",
-    version="1.0.0"
-)
+    configure_logging()
+    await revocation_list.start(get_async_sessionmaker(), REVOCATION_SYNC_SECONDS, REVOCATION_PURGE_SECONDS)
+    await replica_router.start(get_replica_engines(), REPLICA_CHECK_SECONDS)
+    await autocomplete_index.start(get_async_sessionmaker(), AUTOCOMPLETE_REFRESH_SECONDS)
+    if WARMUP_ENABLED:
+        await warm_up(app, connections=WARMUP_DB_CONNECTIONS)
+    try:
+        yield
+    finally:
+        await revocation_list.stop()
+        await replica_router.stop()
+        await autocomplete_index.stop()
+        await asyncio.to_thread(shutdown_hashing_executor)  # Waits for queued bcrypt jobs without blocking the loop.
+        await dispose_engines()
+        logging.info("Application shut down")
+        shutdown_logging()
 
-# Configure CORS middleware; adjust allowed origins in production.
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, set to specific origins.
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Returns:
+        FastAPI: A new application instance; engines and background tasks start with its lifespan.
+    """
+    from fastapi.middleware.cors import CORSMiddleware
+    from app.routes.user_routes import router as user_router, RATE_LIMITS as AUTH_RATE_LIMITS
+    from app.routes.service_routes import router as service_router
+    from app.routes.cart_routes import router as cart_router
+    from app.routes.order_routes import router as order_router
+    from app.routes.system_routes import router as system_router
+    from app.routes.metrics_routes import router as metrics_router
+    from app.middleware.jwt_middleware import JWTMiddleware
+    from app.middleware.metrics_middleware import MetricsMiddleware
+    from app.middleware.query_budget_middleware import QueryBudgetMiddleware
+    from app.middleware.rate_limit_middleware import RateLimitMiddleware
+    from app.utils.rate_limiter import RateLimiter, LocalRateLimitBackend
+    from app.utils.fast_json import default_response_class
+    from app.config import QUERY_BUDGET_MODE, RATE_LIMIT_ENABLED, RATE_LIMIT_MAX_KEYS
+
+    logging.debug("Creating FastAPI application with JWT security")
 
-# Add the JWT middleware to enforce token validation on incoming requests.
-app.add_middleware(JWTMiddleware)
+    app = FastAPI(
+        title="Laundry Service API",
+        description="API for managing laundry services with JWT Authentication",
+        version="1.0.0",
+        default_response_class=default_response_class(),  # ORJSONResponse when FAST_JSON_RESPONSES is enabled.
+        lifespan=lifespan,
+    )
+
+    # Add the JWT middleware to enforce token validation on incoming requests.
+    app.add_middleware(JWTMiddleware)
+
+    # In development/test, check each request against its route's query budget.
+    if QUERY_BUDGET_MODE != "off":
+        app.add_middleware(QueryBudgetMiddleware)
 
+    # Throttle the bcrypt-backed auth endpoints per client IP and per email.
+    if RATE_LIMIT_ENABLED:
+        app.add_middleware(
+            RateLimitMiddleware,
+            routes=AUTH_RATE_LIMITS,
+            limiter=RateLimiter(LocalRateLimitBackend(max_keys=RATE_LIMIT_MAX_KEYS)),
+        )
 
-app.include_router(user_router) # Include user authentication and profile endpoints.
-app.include_router(service_router) # Include services endpoints.
-app.include_router(cart_router) # Include kart endpoints.
+    # Add the metrics middleware after the others so it also times rejected requests.
+    app.add_middleware(MetricsMiddleware)
+
+    # Configure CORS middleware last so it is outermost: the 401s and 429s the
+    # middlewares above send also carry CORS headers, so the browser lets the
+    # web_app read them (and refresh the token or honour Retry-After).
+    # Adjust allowed origins in production.
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, set to specific origins.
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor", "Idempotent-Replayed", "Retry-After"],  # Let the web_app read catalog ETags, page cursors, checkout replays and rate-limit waits.
+    )
 
+    app.include_router(user_router) # Include user authentication and profile endpoints.
+    app.include_router(service_router) # Include services endpoints.
+    app.include_router(cart_router) # Include kart endpoints.
+    app.include_router(order_router) # Include order (checkout) endpoints.
+    app.include_router(system_router) # Include operational endpoints (pool stats).
+    app.include_router(metrics_router) # Include the Prometheus /metrics endpoint.
 
-def custom_openapi():
+    # Override the default OpenAPI schema with our custom version.
+    app.openapi = lambda: custom_openapi(app)
+    return app
+
+def custom_openapi(app: FastAPI) -> dict:
     """
     Generate a custom OpenAPI schema that includes a security scheme for JWT.
-    
+
     This will add a 'bearerAuth' scheme to the OpenAPI components and
     apply it to all routes, which makes Swagger display an "Authorize" button.
     """
+    from fastapi.openapi.utils import get_openapi
+
     if app.openapi_schema:
         return app.openapi_schema
     openapi_schema = get_openapi(
@@ -77,10 +167,23 @@ def custom_openapi():
     logging.debug("Custom OpenAPI schema generated with JWT security")
     return app.openapi_schema
 
-# Override the default OpenAPI schema with our custom version.
-app.openapi = custom_openapi
+def __getattr__(name: str):
+    # ``app.main:app`` (uvicorn, benchmarks) builds the application on first access.
+    if name == "app":
+        globals()["app"] = app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     import uvicorn
-    logging.debug("Running application via Uvicorn")
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    host, _, port = SERVER_BIND.rpartition(":")
+    logging.debug("Running application via Uvicorn with %s workers", WEB_CONCURRENCY)
+    uvicorn.run(
+        "app.main:create_app",
+        factory=True,
+        host=host,
+        port=int(port),
+        workers=WEB_CONCURRENCY,
+        timeout_keep_alive=KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT_SECONDS,  # Drain in-flight requests on SIGTERM.
+    )
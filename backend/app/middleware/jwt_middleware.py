@@ -1,62 +1,107 @@
 # app/middleware/jwt_middleware.py
 
 from app.utils.logger import logger, log_time_taken
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request, HTTPException
-from jose import jwt, JWTError
-from app.config import JWT_SECRET_KEY, ALGORITHM
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from jose import JWTError
+from app.utils.jwt_utils import decode_access_token
+from app.utils.revocation import revocation_list
+from app.utils.path_matcher import PathMatcher
 
 """
 JWT middleware module.
 
 Intercepts incoming requests to validate the JWT token found in the Authorization header.
 Exempts specified endpoints from validation and attaches the user id (from the token's "sub" claim)
-to request.state.user.
+to request.state.user and the full payload to request.state.token. Refresh tokens and revoked
+tokens (see app.utils.revocation; checked in memory, without I/O) are rejected.
+
+Implemented as a plain ASGI middleware rather than Starlette's BaseHTTPMiddleware,
+so no extra task or response-stream wrapping is added per request. Rejected
+requests are answered directly with a prebuilt 401 response.
 """
 
-class JWTMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Define endpoints that do not require JWT authentication.
-        excluded_paths = [
-            "/docs",
-            "/auth/login",
-            "/auth/signup",
-            "/openapi.json",
-            "/generate/process-llm-response"
-        ]
+# Endpoints that do not require JWT authentication.
+EXCLUDED_EXACT_PATHS = (
+    "/auth/login",
+    "/auth/signup",
+    "/auth/refresh",
+    "/openapi.json",
+    "/metrics",
+)
+EXCLUDED_PATH_PREFIXES = (
+    "/docs",
+    "/generate/process-llm-response",
+)
+
+excluded_paths = PathMatcher(exact=EXCLUDED_EXACT_PATHS, prefixes=EXCLUDED_PATH_PREFIXES)
+
+def _unauthorized(detail: str) -> JSONResponse:
+    return JSONResponse({"detail": detail}, status_code=401, headers={"WWW-Authenticate": "Bearer"})
+
+# Prebuilt 401 responses; their bodies are encoded once and reused for every rejection.
+MISSING_TOKEN_RESPONSE = _unauthorized("Token missing or invalid format")
+INVALID_TOKEN_RESPONSE = _unauthorized("Invalid token")
+INVALID_PAYLOAD_RESPONSE = _unauthorized("Invalid token payload")
+REVOKED_TOKEN_RESPONSE = _unauthorized("Token has been revoked")
+
+BEARER_PREFIX = b"Bearer "
+
+def _authorization_header(scope: Scope):
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return value
+    return None
+
+class JWTMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        method = scope["method"]
 
         # Skip JWT validation for OPTIONS requests or excluded paths.
-        if request.method == "OPTIONS" or any(request.url.path.startswith(path) for path in excluded_paths):
-            logger.info("Skipping JWT validation for path: %s, method: %s", request.url.path, request.method)
-            return await call_next(request)
+        if method == "OPTIONS" or excluded_paths.matches(path):
+            logger.debug("Skipping JWT validation for path: %s, method: %s", path, method)
+            await self.app(scope, receive, send)
+            return
 
         # Retrieve the Authorization header.
-        token = request.headers.get("Authorization")
-        logger.debug("Received Authorization header: %s", token)
-        if token is None or not token.startswith("Bearer "):
-            logger.error("Missing or improperly formatted token: %s", token)
-            raise HTTPException(status_code=401, detail="Token missing or invalid format")
-
-        # Remove the "Bearer " prefix.
-        token = token[len("Bearer "):]
+        token = _authorization_header(scope)
+        if token is None or not token.startswith(BEARER_PREFIX):
+            logger.error("Missing or improperly formatted token for path: %s", path)
+            await MISSING_TOKEN_RESPONSE(scope, receive, send)
+            return
 
         try:
-            # Decode the token using the configured secret key and algorithm.
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
-            logger.info("JWT decoded successfully: %s", payload)
-            
-            # Check if the 'sub' claim is present.
-            if "sub" not in payload:
-                logger.error("Token payload missing 'sub' claim: %s", payload)
-                raise HTTPException(status_code=401, detail="Invalid token payload")
-            
-            # Attach the user id to the request state.
-            request.state.user = payload["sub"]
-            logger.debug("Set request.state.user to: %s", request.state.user)
+            # Verify the token (served from the token cache when recently seen).
+            payload = decode_access_token(token[len(BEARER_PREFIX):].decode("latin-1"))
         except JWTError as e:
             logger.error("JWT decoding error: %s", e)
-            raise HTTPException(status_code=401, detail="Invalid token")
+            await INVALID_TOKEN_RESPONSE(scope, receive, send)
+            return
+
+        # Check if the 'sub' claim is present; refresh tokens are not bearer tokens.
+        if "sub" not in payload or payload.get("type") == "refresh":
+            logger.error("Token payload missing 'sub' claim or not an access token")
+            await INVALID_PAYLOAD_RESPONSE(scope, receive, send)
+            return
+
+        if revocation_list.is_revoked(payload):
+            logger.info("Revoked token used for path: %s", path)
+            await REVOKED_TOKEN_RESPONSE(scope, receive, send)
+            return
+
+        # Attach the user id and the payload to the request state (request.state.user / .token).
+        state = scope.setdefault("state", {})
+        state["user"] = payload["sub"]
+        state["token"] = payload
+        logger.debug("Set request.state.user to: %s", payload["sub"])
 
         # Continue processing the request.
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
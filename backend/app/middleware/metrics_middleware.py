@@ -0,0 +1,55 @@
+# app/middleware/metrics_middleware.py
+
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.metrics import (
+    REQUEST_DURATION,
+    REQUESTS_IN_FLIGHT,
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    RequestStats,
+    current_request_stats,
+)
+
+"""
+Metrics middleware module.
+
+Records per-route latency histograms, in-flight request gauges and per-request
+database query counts/time. Routes are labelled by their path template
+(e.g. "/services/{service_id}") so label cardinality stays bounded.
+"""
+
+UNMATCHED_ROUTE = "unmatched"
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            current_request_stats.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            REQUEST_DURATION.observe(elapsed, method=method, route=route_path, status=status[0])
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, method=method, route=route_path)
+            DB_TIME_PER_REQUEST.observe(stats.query_time, method=method, route=route_path)
@@ -0,0 +1,46 @@
+# app/middleware/query_budget_middleware.py
+
+import logging
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import QUERY_BUDGET_MODE, QUERY_REPEAT_THRESHOLD
+from app.utils.query_budget import QueryBudgetExceeded, QueryLog, current_query_log, get_query_budget
+
+"""
+Query budget middleware module.
+
+Development/test aid: records the SQL statements of each request and checks
+them against the budget declared on the matched route with @query_budget, and
+for identical statements repeated QUERY_REPEAT_THRESHOLD times or more
+(probable N+1). Findings are logged in "warn" mode and raised as
+QueryBudgetExceeded in "raise" mode. Only installed when QUERY_BUDGET_MODE is
+not "off".
+"""
+
+logger = logging.getLogger("query_budget")
+
+class QueryBudgetMiddleware:
+    def __init__(self, app: ASGIApp, mode: str = QUERY_BUDGET_MODE, repeat_threshold: int = QUERY_REPEAT_THRESHOLD):
+        self.app = app
+        self.mode = mode
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog(parent=current_query_log.get())  # Still counted by an enclosing track_queries.
+        token = current_query_log.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_log.reset(token)
+
+        route = scope.get("route")
+        problems = log.problems(get_query_budget(getattr(route, "endpoint", None)), self.repeat_threshold)
+        if not problems:
+            return
+        message = "%s %s: %s" % (scope["method"], getattr(route, "path", scope["path"]), "; ".join(problems))
+        if self.mode == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,113 @@
+# app/middleware/rate_limit_middleware.py
+
+import json
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.rate_limiter import RateLimiter, RateLimitRule
+
+"""
+Rate limit middleware module.
+
+Applies sliding-window rate limits to the routes it is configured with, before
+the request reaches the endpoint (and its bcrypt work). Rules are keyed by
+client IP or by the "email" field of the JSON body; the body is read once
+(bounded by MAX_BODY_BYTES) and replayed to the application. Rejected requests
+get 429 Too Many Requests with a Retry-After header.
+
+Behind a reverse proxy, run uvicorn with --proxy-headers (and
+--forwarded-allow-ips) so the client IP is taken from X-Forwarded-For.
+"""
+
+logger = logging.getLogger("rate_limit")
+
+# Larger bodies are not inspected for an email (the endpoint rejects them anyway).
+MAX_BODY_BYTES = 16 * 1024
+
+class RateLimitMiddleware:
+    """
+    Args:
+        app (ASGIApp): The wrapped application.
+        routes (dict): ``{(method, path): [RateLimitRule, ...]}``.
+        limiter (RateLimiter, optional): Shared limiter; defaults to an in-process one.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Dict[Tuple[str, str], Iterable[RateLimitRule]],
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.app = app
+        self.routes = {key: tuple(rules) for key, rules in routes.items()}
+        self.limiter = limiter or RateLimiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rules = self.routes.get((scope["method"], scope["path"]))
+        if not rules:
+            await self.app(scope, receive, send)
+            return
+
+        if any(rule.key == "email" for rule in rules):
+            body, receive = await _buffer_body(receive)
+            email = _email_from_body(body)
+        else:
+            email = None
+        client = scope.get("client")
+        identities = {"ip": client[0] if client else "unknown", "email": email}
+
+        for rule in rules:
+            identity = identities.get(rule.key)
+            if identity is None:
+                continue
+            allowed, retry_after = await self.limiter.hit(rule, identity)
+            if not allowed:
+                logger.warning("Rate limit %s exceeded by %s on %s", rule.name, identity, scope["path"])
+                response = JSONResponse(
+                    {"detail": "Too many requests, please try again later"},
+                    status_code=429,
+                    headers={"Retry-After": str(retry_after)},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+async def _buffer_body(receive: Receive):
+    """Read the request body and return it with a receive callable that replays it."""
+    chunks = []
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Client went away; hand the disconnect to the application as-is.
+            return b"", _replay([message], receive)
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        size += len(chunk)
+        more_body = message.get("more_body", False)
+    body = b"".join(chunks)
+    replay = [{"type": "http.request", "body": body, "more_body": False}]
+    return (body if size <= MAX_BODY_BYTES else b""), _replay(replay, receive)
+
+def _replay(messages: list, receive: Receive) -> Receive:
+    async def replay_receive() -> Message:
+        if messages:
+            return messages.pop(0)
+        return await receive()
+    return replay_receive
+
+def _email_from_body(body: bytes) -> Optional[str]:
+    if not body:
+        return None
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
@@ -7,4 +7,6 @@ from .payment import Payment
 from .review import Review
 from .inventory import Inventory
 from .delivery import Delivery
-from .cart import Cart  
+from .cart import Cart
+from .auth_session import AuthSession
+from .revoked_token import RevokedToken
@@ -0,0 +1,18 @@
+# app/models/auth_session.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from .base import Base
+
+class AuthSession(Base):
+    """
+    One login session. Only the jti of the session's current refresh token is
+    valid; refreshing swaps it for a new one, so a replayed refresh token is
+    detected (and the session revoked) by a jti mismatch.
+    """
+    __tablename__ = "auth_sessions"
+
+    id = Column(String(32), primary_key=True)  # The "sid" claim of the session's tokens.
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    refresh_jti = Column(String(32), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
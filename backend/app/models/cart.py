@@ -7,15 +7,19 @@ Represents an item in a user's shopping cart. Each record associates a user with
 the selected quantity, and any custom instructions.
 """
 
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
 class Cart(Base):
     __tablename__ = "cart"  # Consistently use "cart" instead of "kart"
+    __table_args__ = (
+        # One row per (user, service); adding the same service again merges quantities.
+        Index("uq_cart_user_service", "user_id", "service_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     service_id = Column(Integer, ForeignKey("services.id"), nullable=False)
     quantity = Column(Integer, nullable=False, default=1)
     custom_instructions = Column(Text, nullable=True)
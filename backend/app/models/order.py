@@ -1,10 +1,16 @@
 # app/models/order.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, func, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, func, Text
 from sqlalchemy.orm import relationship
 from .base import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # A client-supplied key identifies one checkout attempt per user, so retries are safe.
+        Index("uq_orders_user_idempotency_key", "user_id", "idempotency_key", unique=True),
+        # Serves the order history: WHERE user_id = ? ORDER BY created_at DESC, id DESC.
+        Index("ix_orders_user_id_created_at", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -12,6 +18,7 @@ class Order(Base):
     total_price = Column(Float, nullable=False, default=0.0)
     pickup_time = Column(DateTime)
     delivery_time = Column(DateTime)
+    idempotency_key = Column(String(64), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
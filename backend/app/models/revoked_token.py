@@ -0,0 +1,15 @@
+# app/models/revoked_token.py
+from sqlalchemy import Column, Integer, String, DateTime, func
+from .base import Base
+
+class RevokedToken(Base):
+    """
+    A revoked token or session id ("jti" or "sid" claim). Rows are only needed
+    until expires_at, after which every token they could match has expired.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True)
+    jti = Column(String(32), unique=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -5,14 +5,29 @@ Service Model.
 Defines the Service model representing a laundry service offering.
 Each service has a name, description, base price, category, and an optional image URL.
 Also includes a relationship to order items.
+
+Composite indexes ending in ``id`` back the keyset-paginated catalog listing
+(sorted by id, name or base_price, optionally filtered by category). Names are
+unique, which lets creation use INSERT ... ON CONFLICT (name).
+
+On PostgreSQL, GET /services/search is served by two GIN indexes: one on the
+weighted full-text document (``search_document``: name, then category, then
+description) and a trigram index on the name for misspelled queries. Both
+need the pg_trgm extension, which is created with the table.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text
+from sqlalchemy import Column, Integer, String, Float, Text, Index, DDL, event, func, text
 from sqlalchemy.orm import relationship
 from .base import Base
 
 class Service(Base):
     __tablename__ = "services"
+    __table_args__ = (
+        Index("uq_services_name", "name", unique=True),
+        Index("ix_services_category_id", "category", "id"),
+        Index("ix_services_name_id", "name", "id"),
+        Index("ix_services_base_price_id", "base_price", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -26,3 +41,28 @@ class Service(Base):
 
     def __repr__(self):
         return f"<Service(id={self.id}, name='{self.name}')>"
+
+def search_document(table=Service.__table__):
+    """
+    The weighted full-text document of a service, as a SQL expression.
+
+    Queries must use this exact expression for PostgreSQL to match it to the
+    ``ix_services_search_document`` index. Literals are inlined rather than
+    bound for the same reason.
+    """
+    def weighted(column, weight):
+        vector = func.to_tsvector(text("'english'"), func.coalesce(column, text("''")))
+        return func.setweight(vector, text(f"'{weight}'"))
+
+    return weighted(table.c.name, "A").op("||")(weighted(table.c.category, "B")).op("||")(weighted(table.c.description, "C"))
+
+# PostgreSQL-only search indexes; SQLite falls back to LIKE scans.
+Index("ix_services_search_document", search_document(), postgresql_using="gin").ddl_if(dialect="postgresql")
+Index(
+    "ix_services_name_trgm", Service.__table__.c.name,
+    postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+event.listen(
+    Service.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
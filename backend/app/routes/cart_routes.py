@@ -5,58 +5,75 @@ Cart Routes.
 Defines API endpoints for managing cart items.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict
-from app.database import get_db
-from app.validators.cart_validator import CartCreateSchema, CartUpdateSchema, CartResponseSchema
+from decimal import Decimal
+from app.database import get_async_db
+from app.validators.cart_validator import CartCreateSchema, CartBatchSchema, CartUpdateSchema, CartResponseSchema, CartSummarySchema, CartItemListAdapter
 from app.controllers.cart_controller import (
     add_item_to_cart,
+    add_items_to_cart,
     get_cart_items,
+    get_cart_rows,
     update_cart_item,
     delete_cart_item,
     clear_cart,
-    get_cart_total
+    get_cart_total,
+    get_cart_summary
 )
+from app.utils.query_budget import query_budget
+from app.utils.current_user import CurrentUser, get_current_user
+from app.utils.fast_json import FAST_JSON, json_response, adapter_response
 
 router = APIRouter(prefix="/cart", tags=["Cart"])
 
 @router.post("/", response_model=CartResponseSchema)
-async def add_item(cart_data: CartCreateSchema, request: Request, db: Session = Depends(get_db)):
-    user_id = request.state.user
-    if not user_id:
-        raise HTTPException(status_code=401, detail="User not authenticated")
-    item = add_item_to_cart(db, int(user_id), cart_data)
+@query_budget(2)
+async def add_item(cart_data: CartCreateSchema, current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    item = await add_item_to_cart(db, current_user.id, cart_data)
     return item
 
+@router.post("/batch", response_model=List[CartResponseSchema])
+@query_budget(2)
+async def add_items(batch: CartBatchSchema, current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    return await add_items_to_cart(db, current_user.id, batch.items)
+
 @router.get("/", response_model=List[CartResponseSchema])
-async def read_cart(request: Request, db: Session = Depends(get_db)):
-    user_id = request.state.user
-    if not user_id:
-        raise HTTPException(status_code=401, detail="User not authenticated")
-    items = get_cart_items(db, int(user_id))
-    return items
+@query_budget(1)
+async def read_cart(current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    if FAST_JSON:
+        # Column tuples straight to orjson, skipping ORM hydration and schema validation.
+        return json_response(await get_cart_rows(db, current_user.id))
+    items = await get_cart_items(db, current_user.id)
+    return adapter_response(CartItemListAdapter, items)
+
+# Static paths are declared before /{item_id} so they are not captured by it.
+@router.delete("/clear", response_model=Dict[str, str])
+@query_budget(1)
+async def clear_all_items(current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    return await clear_cart(db, current_user.id)
 
+# Item writes are scoped to the current user's cart; the nested service of an
+# updated item comes from the catalog cache (one extra query on a miss).
 @router.put("/{item_id}", response_model=CartResponseSchema)
-async def update_item(item_id: int, cart_data: CartUpdateSchema, db: Session = Depends(get_db)):
-    updated_item = update_cart_item(db, item_id, cart_data)
+@query_budget(2)
+async def update_item(item_id: int, cart_data: CartUpdateSchema, current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    updated_item = await update_cart_item(db, current_user.id, item_id, cart_data)
     return updated_item
 
 @router.delete("/{item_id}", response_model=Dict[str, str])
-async def delete_item(item_id: int, db: Session = Depends(get_db)):
-    return delete_cart_item(db, item_id)
+@query_budget(1)
+async def delete_item(item_id: int, current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    return await delete_cart_item(db, current_user.id, item_id)
 
-@router.delete("/clear", response_model=Dict[str, str])
-async def clear_all_items(request: Request, db: Session = Depends(get_db)):
-    user_id = request.state.user
-    if not user_id:
-        raise HTTPException(status_code=401, detail="User not authenticated")
-    return clear_cart(db, int(user_id))
-
-@router.get("/total", response_model=float)
-async def cart_total(request: Request, db: Session = Depends(get_db)):
-    user_id = request.state.user
-    if not user_id:
-        raise HTTPException(status_code=401, detail="User not authenticated")
-    total = get_cart_total(db, int(user_id))
+@router.get("/total", response_model=Decimal)
+@query_budget(1)
+async def cart_total(current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    total = await get_cart_total(db, current_user.id)
     return total
+
+@router.get("/summary", response_model=CartSummarySchema)
+@query_budget(1)
+async def cart_summary(current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    return await get_cart_summary(db, current_user.id)
@@ -0,0 +1,28 @@
+# app/routes/metrics_routes.py
+"""
+Metrics Routes.
+
+Exposes the in-process metrics registry at /metrics in the Prometheus text
+exposition format. The endpoint is excluded from JWT validation so scrapers
+don't need a token; restrict access at the network level in production.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import registry
+from app.utils.query_budget import query_budget
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+@query_budget(0)
+async def read_metrics():
+    """
+    Render all collected metrics.
+
+    Returns:
+      - PlainTextResponse: Metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
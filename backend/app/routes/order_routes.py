@@ -0,0 +1,48 @@
+# app/routes/order_routes.py
+"""
+Order Routes.
+
+Defines API endpoints for placing orders and reading the order history.
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.validators.order_validator import CheckoutSchema, OrderListQuery, OrderResponseSchema, OrderDetailSchema, OrderListAdapter
+from app.controllers.order_controller import checkout, list_orders, get_order
+from app.utils.query_budget import query_budget
+from app.utils.current_user import CurrentUser, get_current_user
+from app.utils.fast_json import adapter_response
+
+router = APIRouter(prefix="/orders", tags=["Orders"])
+
+@router.post("/checkout", response_model=OrderResponseSchema)
+@query_budget(9)
+async def checkout_cart(
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
+    checkout_data: Optional[CheckoutSchema] = None,
+    idempotency_key: Optional[str] = Header(None, max_length=64),
+    db: AsyncSession = Depends(get_async_db),
+):
+    order, created = await checkout(db, current_user.id, checkout_data or CheckoutSchema(), idempotency_key)
+    if not created:
+        response.headers["Idempotent-Replayed"] = "true"
+    return order
+
+@router.get("/", response_model=List[OrderResponseSchema])
+@query_budget(2)
+async def read_orders(
+    current_user: CurrentUser = Depends(get_current_user),
+    query: OrderListQuery = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    page = await list_orders(db, current_user.id, query)
+    headers = {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else None
+    return adapter_response(OrderListAdapter, page["items"], headers=headers)
+
+@router.get("/{order_id}", response_model=OrderDetailSchema)
+@query_budget(3)
+async def read_order(order_id: int, current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    return await get_order(db, current_user.id, order_id)
@@ -4,93 +4,191 @@ Service Routes.
 
 Defines the API endpoints for CRUD operations on laundry services.
 Uses the ServiceResponseSchema to serialize Service objects.
+
+Read endpoints serve cached, pre-encoded JSON with a strong ETag and
+Cache-Control header; a matching If-None-Match returns 304 Not Modified.
+GET /services/ supports filters, sorting and keyset pagination; the cursor for
+the next page is returned in the X-Next-Cursor header. GET /services/search
+ranks services against free text; GET /services/autocomplete completes
+service names from the worker's in-memory index without querying the
+database (except to build the index on first use).
+
+Write endpoints (create, update, delete) are restricted to admins; the role is
+read from the access token, without a database lookup.
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.validators.service_validator import ServiceCreateSchema, ServiceUpdateSchema, ServiceResponseSchema
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.validators.service_validator import (
+    ServiceCreateSchema,
+    ServiceUpdateSchema,
+    ServiceResponseSchema,
+    ServiceListQuery,
+    ServiceSearchQuery,
+    ServiceAutocompleteQuery,
+    ServiceSuggestionSchema,
+)
 from app.controllers.service_controller import (
     create_service,
-    get_service_by_id,
-    get_all_services,
+    get_service_payload,
+    get_all_services_payload,
+    get_services_page_payload,
+    search_services_payload,
     update_service,
     delete_service
 )
+from app.config import CATALOG_CACHE_CONTROL
+from app.utils.helpers import etag_matches
 from typing import List
+from app.utils.query_budget import query_budget
+from app.utils.current_user import require_role
+from app.utils.search_index import autocomplete_index
+from app.utils.fast_json import json_response
 
 router = APIRouter(prefix="/services", tags=["Services"])
 
-@router.post("/", response_model=ServiceResponseSchema)
-async def add_service(service: ServiceCreateSchema, db: Session = Depends(get_db)):
+# Dependency guarding catalog writes.
+admin_only = Depends(require_role("admin"))
+
+def catalog_response(request: Request, payload: dict) -> Response:
+    """
+    Build a response for a cached catalog payload, honouring If-None-Match.
+
+    Args:
+      - request (Request): The incoming request.
+      - payload (dict): {"body": bytes, "etag": str, "next_cursor": optional str}
+        from the service controller.
+
+    Returns:
+      - Response: 304 if the client's copy is current, else the encoded JSON body.
+    """
+    headers = {"ETag": payload["etag"], "Cache-Control": CATALOG_CACHE_CONTROL}
+    if payload.get("next_cursor"):
+        headers["X-Next-Cursor"] = payload["next_cursor"]
+    if etag_matches(request.headers.get("if-none-match"), payload["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload["body"], media_type="application/json", headers=headers)
+
+@router.post("/", response_model=ServiceResponseSchema, dependencies=[admin_only])
+@query_budget(1)
+async def add_service(service: ServiceCreateSchema, db: AsyncSession = Depends(get_async_db)):
     """
     Add a new service.
     
     Args:
       - service (ServiceCreateSchema): Data for the new service.
-      - db (Session): Database session dependency.
+      - db (AsyncSession): Database session dependency.
     
     Returns:
       - ServiceResponseSchema: The created service data.
     """
-    new_service = create_service(db, service)
+    new_service = await create_service(db, service)
     return new_service
 
+# Static paths are declared before /{service_id} so they are not captured by it.
+@router.get("/search", response_model=List[ServiceResponseSchema])
+@query_budget(1)
+async def search(request: Request, query: ServiceSearchQuery = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    Search services by name, category and description.
+    
+    Args:
+      - request (Request): The incoming request (for If-None-Match).
+      - query (ServiceSearchQuery): Search text and optional limit.
+      - db (AsyncSession): Database session dependency.
+    
+    Returns:
+      - List[ServiceResponseSchema]: The matching services, best first (or 304 Not Modified).
+    """
+    payload = await search_services_payload(db, query)
+    return catalog_response(request, payload)
+
+@router.get("/autocomplete", response_model=List[ServiceSuggestionSchema])
+@query_budget(1)
+async def autocomplete(query: ServiceAutocompleteQuery = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    Suggest service names for the text typed so far.
+    
+    Args:
+      - query (ServiceAutocompleteQuery): Typed text and optional limit.
+      - db (AsyncSession): Database session dependency (used only to build the index).
+    
+    Returns:
+      - List[ServiceSuggestionSchema]: Matching service ids and names, shortest names first.
+    """
+    await autocomplete_index.ensure_loaded(db)
+    return json_response(autocomplete_index.suggest(query.q, query.limit))
+
 @router.get("/{service_id}", response_model=ServiceResponseSchema)
-async def read_service(service_id: int, db: Session = Depends(get_db)):
+@query_budget(1)
+async def read_service(service_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve a service by its ID.
     
     Args:
       - service_id (int): The service ID.
-      - db (Session): Database session dependency.
+      - request (Request): The incoming request (for If-None-Match).
+      - db (AsyncSession): Database session dependency.
     
     Returns:
-      - ServiceResponseSchema: The service data.
+      - ServiceResponseSchema: The service data (or 304 Not Modified).
     """
-    service = get_service_by_id(db, service_id)
-    return service
+    payload = await get_service_payload(db, service_id)
+    return catalog_response(request, payload)
 
 @router.get("/", response_model=List[ServiceResponseSchema])
-async def read_all_services(db: Session = Depends(get_db)):
+@query_budget(1)
+async def read_all_services(
+    request: Request,
+    query: ServiceListQuery = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Retrieve all services.
+    Retrieve all services, or one filtered/sorted page of them.
     
     Args:
-      - db (Session): Database session dependency.
+      - request (Request): The incoming request (for If-None-Match).
+      - query (ServiceListQuery): Optional limit, cursor, category, price range and sort.
+      - db (AsyncSession): Database session dependency.
     
     Returns:
-      - List[ServiceResponseSchema]: A list of all services.
+      - List[ServiceResponseSchema]: The services (or 304 Not Modified).
     """
-    services = get_all_services(db)
-    return services
+    if query.is_paginated():
+        payload = await get_services_page_payload(db, query)
+    else:
+        payload = await get_all_services_payload(db)
+    return catalog_response(request, payload)
 
-@router.put("/{service_id}", response_model=ServiceResponseSchema)
-async def modify_service(service_id: int, service: ServiceUpdateSchema, db: Session = Depends(get_db)):
+@router.put("/{service_id}", response_model=ServiceResponseSchema, dependencies=[admin_only])
+@query_budget(1)
+async def modify_service(service_id: int, service: ServiceUpdateSchema, db: AsyncSession = Depends(get_async_db)):
     """
     Update an existing service.
     
     Args:
       - service_id (int): The service ID.
       - service (ServiceUpdateSchema): Data to update the service.
-      - db (Session): Database session dependency.
+      - db (AsyncSession): Database session dependency.
     
     Returns:
       - ServiceResponseSchema: The updated service data.
     """
-    updated_service = update_service(db, service_id, service)
+    updated_service = await update_service(db, service_id, service)
     return updated_service
 
-@router.delete("/{service_id}", response_model=dict)
-async def remove_service(service_id: int, db: Session = Depends(get_db)):
+@router.delete("/{service_id}", response_model=dict, dependencies=[admin_only])
+@query_budget(2)
+async def remove_service(service_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a service.
     
     Args:
       - service_id (int): The service ID.
-      - db (Session): Database session dependency.
+      - db (AsyncSession): Database session dependency.
     
     Returns:
       - dict: A confirmation message.
     """
-    return delete_service(db, service_id)
+    return await delete_service(db, service_id)
@@ -0,0 +1,39 @@
+# app/routes/system_routes.py
+"""
+System Routes.
+
+Defines operational endpoints used to size and monitor the deployment,
+such as database connection pool and cache statistics.
+"""
+
+from fastapi import APIRouter
+from app.database import get_pool_stats
+from app.controllers.service_controller import catalog_cache
+from app.utils.query_budget import query_budget
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+@router.get("/pool-stats", response_model=dict)
+@query_budget(0)
+async def read_pool_stats():
+    """
+    Report connection pool usage for the sync and async engines.
+
+    Use the checked_out/overflow/waits counters to size DB_POOL_SIZE and
+    DB_MAX_OVERFLOW against the number of uvicorn workers.
+
+    Returns:
+      - dict: Pool statistics keyed by engine ("sync", "async").
+    """
+    return get_pool_stats()
+
+@router.get("/cache-stats", response_model=dict)
+@query_budget(0)
+async def read_cache_stats():
+    """
+    Report hit/miss counters for the in-process caches.
+
+    Returns:
+      - dict: Cache statistics keyed by cache name.
+    """
+    return {"catalog": catalog_cache.stats()}
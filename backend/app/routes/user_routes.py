@@ -1,33 +1,61 @@
 # app/routes/user_routes.py
 from app.utils.logger import logger, log_time_taken
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
-from app.controllers.user_controller import create_user_controller, authenticate_user_controller
-from app.validators.user_validator import UserCreateSchema, UserLoginSchema
-from app.database import get_db
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.controllers.user_controller import (
+    create_user_controller,
+    authenticate_user_controller,
+    refresh_tokens_controller,
+    logout_controller,
+    get_user_profile,
+    update_user_profile,
+)
+from app.validators.user_validator import UserCreateSchema, UserLoginSchema, UserUpdateSchema, RefreshTokenSchema
+from app.utils.current_user import CurrentUser, get_current_user
+from app.database import get_async_db
+from app.utils.query_budget import query_budget
+from app.utils.rate_limiter import RateLimitRule
+from app.config import (
+    LOGIN_RATE_LIMIT_PER_IP,
+    LOGIN_RATE_LIMIT_PER_EMAIL,
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    SIGNUP_RATE_LIMIT_PER_IP,
+    SIGNUP_RATE_LIMIT_WINDOW_SECONDS,
+)
 
 """
 User routes module.
 
-Defines FastAPI endpoints for user registration, login, and profile retrieval.
+Defines FastAPI endpoints for user registration, login, token refresh, logout,
+and profile retrieval and update.
 """
 
-logger.debug("User routes module loaded")
-
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+# Per-route rate limits, applied by RateLimitMiddleware before bcrypt runs.
+RATE_LIMITS = {
+    ("POST", "/auth/login"): (
+        RateLimitRule("login:ip", LOGIN_RATE_LIMIT_PER_IP, LOGIN_RATE_LIMIT_WINDOW_SECONDS, key="ip"),
+        RateLimitRule("login:email", LOGIN_RATE_LIMIT_PER_EMAIL, LOGIN_RATE_LIMIT_WINDOW_SECONDS, key="email"),
+    ),
+    ("POST", "/auth/signup"): (
+        RateLimitRule("signup:ip", SIGNUP_RATE_LIMIT_PER_IP, SIGNUP_RATE_LIMIT_WINDOW_SECONDS, key="ip"),
+    ),
+}
+
 @router.post("/signup", response_model=dict)
-async def signup(user: UserCreateSchema, db: Session = Depends(get_db)):
+@query_budget(1)
+async def signup(user: UserCreateSchema, db: AsyncSession = Depends(get_async_db)):
     """
     Endpoint for user registration (sign-up).
 
     Args:
         user (UserCreateSchema): User registration data.
-        db (Session): Database session provided by dependency.
+        db (AsyncSession): Database session provided by dependency.
     Returns:
         dict: Message and user details upon successful registration.
     """
-    new_user = create_user_controller(user, db)
+    new_user = await create_user_controller(user, db)
     logger.debug("Signup successful for user: %s", new_user.email)
     return {
         "message": "User created successfully",
@@ -35,40 +63,95 @@ async def signup(user: UserCreateSchema, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=dict)
-async def login(user: UserLoginSchema, db: Session = Depends(get_db)):
+@query_budget(3)
+async def login(user: UserLoginSchema, db: AsyncSession = Depends(get_async_db)):
     """
     Endpoint for user login.
 
     Args:
         user (UserLoginSchema): User login credentials.
-        db (Session): Database session provided by dependency.
+        db (AsyncSession): Database session provided by dependency.
     Returns:
-        dict: JWT token and user details if login is successful.
+        dict: Access and refresh tokens and user details if login is successful.
     """
-    auth_result = authenticate_user_controller(user, db)
+    auth_result = await authenticate_user_controller(user, db)
     logger.debug("Login successful for user: %s", user.email)
     return auth_result
 
+@router.post("/refresh", response_model=dict)
+@query_budget(3)
+async def refresh(body: RefreshTokenSchema, db: AsyncSession = Depends(get_async_db)):
+    """
+    Endpoint exchanging a refresh token for a new access/refresh token pair.
+
+    Exempt from the JWT middleware; each refresh token can be used once.
+
+    Args:
+        body (RefreshTokenSchema): The current refresh token.
+        db (AsyncSession): Database session provided by dependency.
+    Returns:
+        dict: New access and refresh tokens.
+    Raises:
+        HTTPException: 401 if the refresh token is invalid, reused, or its session was revoked.
+    """
+    return await refresh_tokens_controller(body.refresh_token, db)
+
+@router.post("/logout", response_model=dict)
+@query_budget(2)
+async def logout(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Endpoint ending the current session.
+
+    The session's refresh token and all of its access tokens, including the one
+    used for this request, are rejected from then on.
+
+    Args:
+        request (Request): The incoming HTTP request (token payload in request.state.token).
+        db (AsyncSession): Database session provided by dependency.
+    Returns:
+        dict: Confirmation message.
+    """
+    await logout_controller(request.state.token, db)
+    logger.debug("Logout successful for user id: %s", request.state.user)
+    return {"message": "Logged out"}
+
 @router.get("/profile", response_model=dict)
-async def get_profile(request: Request, db: Session = Depends(get_db)):
+@query_budget(1)
+async def get_profile(current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     """
     Protected endpoint to retrieve the current user's profile.
-    
-    Assumes that the JWT middleware attaches the user id to request.state.user.
+
+    Served from the user cache; the database is only read on a cache miss.
 
     Args:
-        request (Request): The incoming HTTP request.
-        db (Session): Database session provided by dependency.
+        current_user (CurrentUser): The authenticated user.
+        db (AsyncSession): Database session provided by dependency.
     Returns:
         dict: The authenticated user's profile.
     Raises:
         HTTPException: If the user is not found.
     """
-    user_id = request.state.user
-    from app.models.user import User  # Local import to avoid circular dependencies.
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        logger.error("User not found with id: %s", user_id)
-        raise HTTPException(status_code=404, detail="User not found")
-    logger.debug("Profile retrieved for user id: %s", user_id)
-    return {"id": user.id, "name": user.name, "email": user.email}
+    profile = await get_user_profile(db, current_user.id)
+    logger.debug("Profile retrieved for user id: %s", current_user.id)
+    return profile
+
+@router.put("/profile", response_model=dict)
+@query_budget(1)
+async def update_profile(
+    user_data: UserUpdateSchema,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Protected endpoint to update the current user's name, phone or address.
+
+    Args:
+        user_data (UserUpdateSchema): Fields to change.
+        current_user (CurrentUser): The authenticated user.
+        db (AsyncSession): Database session provided by dependency.
+    Returns:
+        dict: The updated profile.
+    Raises:
+        HTTPException: If the user is not found.
+    """
+    return await update_user_profile(db, current_user.id, user_data)
@@ -1,16 +1,77 @@
-# In your Python shell
-from app.database import SessionLocal
-from app.models import User  # Adjust the import based on your project structure
-
-# Create a new session
-db = SessionLocal()
-
-# Now you can perform CRUD operations:
-new_user = User(name="Alice", email="alice@example.com", password_hash="hashed_password")
-db.add(new_user)
-db.commit()
-db.refresh(new_user)
-print("New user ID:", new_user.id)
-
-# Don’t forget to close the session when done
-db.close()
+# app/services/user_service.py
+"""
+User service module.
+
+Data-access functions for users, shared by the controllers and by scripts.
+They only stage and flush changes; committing is left to the caller so that
+several operations can share one transaction.
+
+Usage:
+    from app.services.user_service import create_user, get_user_by_email
+
+    async with get_async_sessionmaker()() as db:
+        user = await create_user(db, name="Alice", email="alice@example.com", password_hash=hashed)
+        if user is None:
+            ...  # The email is already registered.
+        await db.commit()
+"""
+
+import logging
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import dialect_insert
+from app.models.user import User
+
+logger = logging.getLogger("user_service")
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """
+    Return the user with the given email, or None.
+
+    Args:
+        db (AsyncSession): Database session.
+        email (str): The email address (users.email is unique).
+    Returns:
+        Optional[User]: The user, if any.
+    """
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def create_user(
+    db: AsyncSession,
+    name: str,
+    email: str,
+    password_hash: str,
+    phone: Optional[str] = None,
+    address: Optional[str] = None,
+    role: str = "customer",
+) -> Optional[User]:
+    """
+    Insert a user unless the email is already registered.
+
+    Runs as one INSERT ... ON CONFLICT (email) DO NOTHING RETURNING statement,
+    so concurrent sign-ups with the same email cannot both succeed and no
+    separate existence check is needed.
+
+    Args:
+        db (AsyncSession): Database session.
+        name (str): Full name.
+        email (str): Email address; must be unused.
+        password_hash (str): An already hashed password (see app.utils.hashing).
+        phone (str, optional): Phone number.
+        address (str, optional): Address.
+        role (str): "customer", "staff" or "admin".
+    Returns:
+        Optional[User]: The new, uncommitted user, or None if the email is taken.
+    """
+    stmt = (
+        dialect_insert(db, User)
+        .values(name=name, email=email, password_hash=password_hash, phone=phone, address=address, role=role)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
+    )
+    user = (await db.execute(stmt)).scalars().first()
+    if user is not None:
+        logger.debug("Created user id %s", user.id)
+    return user
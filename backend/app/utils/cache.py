@@ -0,0 +1,173 @@
+# app/utils/cache.py
+"""
+Cache utility module.
+
+Provides a read-through cache with TTL expiry and version-based invalidation.
+Every namespace keeps a version number in the backend; cache keys embed that
+version, so invalidating a namespace is a single increment and stale entries
+simply stop being read (and age out through the TTL).
+
+Backends implement the small async ``CacheBackend`` interface. Only an
+in-process backend ships today; a shared store (e.g. Redis) can be plugged in
+later by implementing the same four methods.
+
+Usage:
+    from app.utils.cache import VersionedCache
+
+    catalog_cache = VersionedCache("catalog", ttl=60)
+    services = await catalog_cache.get_or_load("all", load_services)
+    await catalog_cache.invalidate()
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from app.utils.metrics import registry
+
+CACHE_HITS = registry.counter("cache_hits_total", "Cache lookups served from the cache.", ("cache",))
+CACHE_MISSES = registry.counter("cache_misses_total", "Cache lookups that had to load the value.", ("cache",))
+CACHE_INVALIDATIONS = registry.counter("cache_invalidations_total", "Cache namespace invalidations.", ("cache",))
+
+class CacheBackend:
+    """Interface for cache storage backends."""
+
+    async def get(self, key: str) -> Any:
+        """Return the stored value, or None if absent or expired."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value, expiring after ttl seconds (never if None)."""
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        """Remove a value if present."""
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        """Atomically increment an integer counter (starting from 0) and return it."""
+        raise NotImplementedError
+
+class LocalCacheBackend(CacheBackend):
+    """
+    In-process backend: a bounded LRU dictionary with per-entry expiry.
+
+    Counters created by ``incr`` (namespace versions) are kept apart from the
+    LRU so they are never evicted. Each worker process has its own copy, so an
+    invalidation is only seen by the worker that performed the write; other
+    workers rely on the TTL.
+
+    Args:
+        max_entries (int): Maximum number of stored keys.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Any:
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._counters.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+class VersionedCache:
+    """
+    Read-through cache for one namespace with TTL and version invalidation.
+
+    Args:
+        namespace (str): Prefix for all keys (also the metrics label).
+        backend (CacheBackend, optional): Storage backend; defaults to a LocalCacheBackend.
+        ttl (float): Seconds an entry stays valid.
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend = None, ttl: float = 60.0):
+        self.namespace = namespace
+        self.backend = backend or LocalCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    async def version(self) -> int:
+        """Return the current version of the namespace."""
+        return await self.backend.get(self._version_key) or 0
+
+    async def _key(self, key: str) -> str:
+        return f"{self.namespace}:v{await self.version()}:{key}"
+
+    async def get(self, key: str) -> Any:
+        """Return the cached value for key, or None on a miss."""
+        return await self.backend.get(await self._key(key))
+
+    async def set(self, key: str, value: Any):
+        """Store a value under the current version."""
+        await self.backend.set(await self._key(key), value, self.ttl)
+
+    async def delete(self, key: str):
+        """Drop one entry of the current version (e.g. after the row behind it changed)."""
+        await self.backend.delete(await self._key(key))
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, calling loader() to fill it on a miss.
+
+        Args:
+            key (str): Cache key within the namespace.
+            loader (callable): Coroutine function producing the value. None results are not cached.
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        full_key = await self._key(key)
+        value = await self.backend.get(full_key)
+        if value is not None:
+            self.hits += 1
+            CACHE_HITS.inc(cache=self.namespace)
+            return value
+        self.misses += 1
+        CACHE_MISSES.inc(cache=self.namespace)
+        value = await loader()
+        if value is not None:
+            await self.backend.set(full_key, value, self.ttl)
+        return value
+
+    async def invalidate(self) -> int:
+        """Invalidate every entry in the namespace by bumping its version; returns the new version."""
+        CACHE_INVALIDATIONS.inc(cache=self.namespace)
+        return await self.backend.incr(self._version_key)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for this cache."""
+        return {"namespace": self.namespace, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,87 @@
+# app/utils/current_user.py
+"""
+Current user utility module.
+
+Provides the ``CurrentUser`` principal and the FastAPI dependencies that build
+it. Identity and role come from the claims of the access token JWTMiddleware
+already verified (request.state.token), so authorization needs no database
+lookup. A role change reaches the user's tokens at their next refresh.
+
+Usage:
+    from app.utils.current_user import CurrentUser, get_current_user, require_role
+
+    @router.get("/me")
+    async def me(current_user: CurrentUser = Depends(get_current_user)):
+        ...
+
+    @router.post("/", dependencies=[Depends(require_role("admin"))])
+    async def create(...):
+        ...
+"""
+
+import logging
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+
+logger = logging.getLogger("current_user")
+
+class CurrentUser:
+    """
+    The authenticated user of a request.
+
+    Args:
+        id (int): User id (the token's "sub" claim).
+        role (str, optional): Role claim, e.g. "customer", "staff" or "admin";
+            None for tokens issued before roles were added to them.
+        sid (str, optional): Login session id.
+    """
+
+    __slots__ = ("id", "role", "sid")
+
+    def __init__(self, id: int, role: Optional[str] = None, sid: Optional[str] = None):
+        self.id = id
+        self.role = role
+        self.sid = sid
+
+    def has_role(self, *roles: str) -> bool:
+        """Return True if the user has one of the given roles."""
+        return self.role in roles
+
+    def __repr__(self):
+        return f"<CurrentUser(id={self.id}, role={self.role})>"
+
+async def get_current_user(request: Request) -> CurrentUser:
+    """
+    Dependency returning the authenticated user from the verified token payload.
+
+    Args:
+        request (Request): The incoming request (payload set by JWTMiddleware).
+    Returns:
+        CurrentUser: The principal of the request.
+    Raises:
+        HTTPException: 401 if the request carries no valid access token.
+    """
+    payload = getattr(request.state, "token", None)
+    if not payload:
+        raise HTTPException(status_code=401, detail="User not authenticated")
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    return CurrentUser(user_id, payload.get("role"), payload.get("sid"))
+
+def require_role(*roles: str):
+    """
+    Build a dependency that only lets users with one of the given roles through.
+
+    Args:
+        roles (str): Accepted roles.
+    Returns:
+        callable: A dependency returning the CurrentUser, or raising 403.
+    """
+    async def check_role(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+        if not current_user.has_role(*roles):
+            logger.warning("User %s with role %s denied; requires one of %s", current_user.id, current_user.role, roles)
+            raise HTTPException(status_code=403, detail="Insufficient permissions")
+        return current_user
+    return check_role
@@ -0,0 +1,101 @@
+# app/utils/fast_json.py
+"""
+Fast JSON utility module.
+
+Opt-in high-performance JSON output. When FAST_JSON_RESPONSES is enabled and
+orjson is installed, the app uses FastAPI's ORJSONResponse as its default
+response class, pre-encoded payloads are produced by orjson, and hot list
+endpoints may build their bodies from column tuples with ``json_response``
+instead of validating ORM objects through their response_model.
+
+Without the flag (or without orjson) everything falls back to the stdlib
+encoder and the regular FastAPI response path.
+
+Independently of the flag, ``adapter_response`` serializes lists of ORM
+objects through a Pydantic ``TypeAdapter`` straight to JSON bytes in the
+Rust core, instead of FastAPI's validate, jsonable-encode, json.dumps chain.
+
+Usage:
+    from app.utils.fast_json import FAST_JSON, json_response
+
+    if FAST_JSON:
+        return json_response(rows)
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+from app.config import FAST_JSON_RESPONSES
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+logger = logging.getLogger("fast_json")
+
+if FAST_JSON_RESPONSES and orjson is None:
+    logger.warning("FAST_JSON_RESPONSES is set but orjson is not installed; using the stdlib encoder")
+
+# True when the fast path is both requested and available.
+FAST_JSON = FAST_JSON_RESPONSES and orjson is not None
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(data) -> bytes:
+    """
+    Encode data as compact UTF-8 JSON.
+
+    datetimes are written in ISO 8601 (UTC as "Z" with orjson) and Decimals
+    as strings, matching how the response schemas serialize them.
+
+    Args:
+        data: JSON-compatible data (dicts, lists, scalars, datetimes, Decimals).
+    Returns:
+        bytes: The encoded body.
+    """
+    if FAST_JSON:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(data, separators=(",", ":"), default=_default).encode("utf-8")
+
+def json_response(data, status_code: int = 200, headers: dict = None) -> Response:
+    """
+    Return already-serializable data as a JSON response, skipping response_model validation.
+
+    Args:
+        data: Data in the exact shape of the route's response schema.
+        status_code (int): HTTP status code.
+        headers (dict, optional): Extra response headers.
+    Returns:
+        Response: The encoded JSON response.
+    """
+    return Response(content=dumps(data), status_code=status_code, headers=headers, media_type="application/json")
+
+def adapter_response(adapter: TypeAdapter, data, headers: dict = None) -> Response:
+    """
+    Validate data with a TypeAdapter (reading ORM attributes) and return it as JSON.
+
+    Args:
+        adapter (TypeAdapter): Adapter for the route's response type, e.g. List[CartResponseSchema].
+        data: ORM objects or dicts in the shape of that type.
+        headers (dict, optional): Extra response headers.
+    Returns:
+        Response: The encoded JSON response.
+    """
+    body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return Response(content=body, headers=headers, media_type="application/json")
+
+def default_response_class():
+    """Return the response class the app should use by default."""
+    if FAST_JSON:
+        from fastapi.responses import ORJSONResponse
+        return ORJSONResponse
+    return JSONResponse
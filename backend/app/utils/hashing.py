@@ -1,15 +1,69 @@
 # app/utils/hashing.py
+import asyncio
 import logging
-from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from app.config import BCRYPT_ROUNDS, HASHING_WORKERS, HASHING_MAX_PENDING
 
 """
 Hashing utility module.
 
 Provides functions to hash passwords and verify plaintext passwords against their hashes.
+
+bcrypt takes 100-300 ms per call, so async callers must use the ``*_async``
+variants, which run the work in a dedicated, size-limited thread pool (bcrypt
+releases the GIL while hashing). When more than HASHING_MAX_PENDING jobs are
+running or queued, the async variants raise HashingBusyError instead of
+letting the backlog grow without bound.
 """
 
-logging.debug("Initializing password hashing context")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_pwd_context = None
+
+def get_pwd_context():
+    """Return the passlib CryptContext, importing passlib and creating it on first use."""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        logging.debug("Initializing password hashing context")
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+    return _pwd_context
+
+class HashingBusyError(Exception):
+    """Raised when the hashing pool already has HASHING_MAX_PENDING jobs in flight."""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending = 0
+
+def get_hashing_executor() -> ThreadPoolExecutor:
+    """Return the bcrypt thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=HASHING_WORKERS, thread_name_prefix="bcrypt")
+        logging.debug("Created hashing pool with %d workers", HASHING_WORKERS)
+    return _executor
+
+def shutdown_hashing_executor():
+    """Stop the bcrypt thread pool, if it was started, after its queued jobs finish."""
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+def pending_hashing_jobs() -> int:
+    """Return the number of hashing jobs currently running or queued."""
+    return _pending
+
+async def _run_in_hashing_pool(func, *args):
+    global _pending
+    if _pending >= HASHING_MAX_PENDING:
+        logging.warning("Hashing pool saturated (%d jobs pending)", _pending)
+        raise HashingBusyError("Password hashing pool is saturated")
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hashing_executor(), func, *args)
+    finally:
+        _pending -= 1
 
 def hash_password(password: str) -> str:
     """
@@ -20,7 +74,7 @@ def hash_password(password: str) -> str:
     Returns:
         str: The hashed password.
     """
-    hashed = pwd_context.hash(password)
+    hashed = get_pwd_context().hash(password)
     logging.debug("Password hashed successfully")
     return hashed
 
@@ -34,6 +88,48 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if the password matches, else False.
     """
-    valid = pwd_context.verify(plain_password, hashed_password)
+    valid = get_pwd_context().verify(plain_password, hashed_password)
     logging.debug("Password verification result: %s", valid)
     return valid
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and re-hash it if its hash uses outdated settings.
+
+    Args:
+        plain_password (str): The plaintext password.
+        hashed_password (str): The stored hash.
+    Returns:
+        tuple: (valid, new_hash). new_hash is None unless the password is valid
+        and the stored hash should be replaced (e.g. BCRYPT_ROUNDS changed).
+    """
+    valid, new_hash = get_pwd_context().verify_and_update(plain_password, hashed_password)
+    logging.debug("Password verification result: %s (rehash: %s)", valid, new_hash is not None)
+    return valid, new_hash
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the hashing pool without blocking the event loop.
+
+    Raises:
+        HashingBusyError: If the hashing pool is saturated.
+    """
+    return await _run_in_hashing_pool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the hashing pool without blocking the event loop.
+
+    Raises:
+        HashingBusyError: If the hashing pool is saturated.
+    """
+    return await _run_in_hashing_pool(verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Run verify_and_update_password in the hashing pool without blocking the event loop.
+
+    Raises:
+        HashingBusyError: If the hashing pool is saturated.
+    """
+    return await _run_in_hashing_pool(verify_and_update_password, plain_password, hashed_password)
@@ -0,0 +1,78 @@
+# app/utils/helpers.py
+"""
+Helper utilities module.
+
+Small, dependency-free helpers shared by routes and controllers.
+"""
+
+import json
+import base64
+import hashlib
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a strong ETag from a response body.
+
+    Args:
+        body (bytes): The encoded response body.
+    Returns:
+        str: A quoted entity tag derived from the body's SHA-256 digest.
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag.
+
+    Uses the weak comparison required for If-None-Match, so ``W/"x"`` matches
+    ``"x"``; ``*`` matches any tag.
+
+    Args:
+        if_none_match (str): The raw If-None-Match header value (may be None).
+        etag (str): The current entity tag.
+    Returns:
+        bool: True if the client's cached representation is current.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def encode_cursor(values: dict) -> str:
+    """
+    Encode keyset pagination state as an opaque, URL-safe cursor.
+
+    Args:
+        values (dict): JSON-serializable position (e.g. last sort value and id).
+    Returns:
+        str: The cursor string.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The cursor string.
+    Returns:
+        dict: The decoded position.
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(values, dict):
+        raise ValueError("Malformed cursor")
+    return values
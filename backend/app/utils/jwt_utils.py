@@ -1,16 +1,47 @@
 # app/utils/jwt_utils.py
+import uuid
 import logging
 from datetime import datetime, timedelta
-from jose import jwt
-from app.config import JWT_SECRET_KEY, ALGORITHM
+from jose import jwt, JWTError
+from app.config import (
+    JWT_SECRET_KEY,
+    ALGORITHM,
+    JWT_CACHE_SIZE,
+    JWT_CACHE_TTL_SECONDS,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS,
+)
+from app.utils.token_cache import TokenCache
 
 """
 JWT utility module.
 
-Provides functions for creating JWT access tokens.
+Provides functions for creating JWT access and refresh tokens and for
+verifying access tokens through a bounded cache of already-verified tokens.
+
+Every token carries a unique "jti" claim and a "type" claim ("access" or
+"refresh"); tokens issued for a login session also carry its "sid", so the
+whole session can be revoked at once (see app.utils.revocation).
 """
 
-logging.debug("JWT utilities module loaded")
+# Cache of verified token payloads shared by every request in this process.
+token_cache = TokenCache(max_size=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL_SECONDS)
+
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_TOKEN_LIFETIME = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
+def new_token_id() -> str:
+    """Return a random identifier for a "jti" or "sid" claim."""
+    return uuid.uuid4().hex
+
+def _create_token(data: dict, token_type: str, expires_delta: timedelta) -> str:
+    to_encode = data.copy()
+    expire = datetime.utcnow() + expires_delta
+    to_encode.setdefault("jti", new_token_id())
+    to_encode.update({"exp": expire, "type": token_type})
+    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
+    logging.debug("%s token created; expires at %s", token_type.capitalize(), expire)
+    return encoded_jwt
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """
@@ -18,13 +49,57 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
 
     Args:
         data (dict): Data to include in the token payload.
-        expires_delta (timedelta, optional): Token expiration duration. Defaults to 15 minutes.
+        expires_delta (timedelta, optional): Token expiration duration. Defaults to ACCESS_TOKEN_EXPIRE_MINUTES.
     Returns:
         str: The encoded JWT token.
     """
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=15))
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
-    logging.debug("Access token created; expires at %s", expire)
-    return encoded_jwt
+    return _create_token(data, "access", expires_delta or ACCESS_TOKEN_LIFETIME)
+
+def create_refresh_token(data: dict, expires_delta: timedelta = None) -> str:
+    """
+    Create a JWT refresh token. It is only accepted by POST /auth/refresh, never as a bearer token.
+
+    Args:
+        data (dict): Data to include in the token payload ("sub", "sid" and "jti").
+        expires_delta (timedelta, optional): Token expiration duration. Defaults to REFRESH_TOKEN_EXPIRE_DAYS.
+    Returns:
+        str: The encoded JWT token.
+    """
+    return _create_token(data, "refresh", expires_delta or REFRESH_TOKEN_LIFETIME)
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a JWT access token and return its payload.
+
+    Tokens that were verified recently are served from ``token_cache`` without
+    re-checking the signature; entries never outlive the token's ``exp`` claim.
+
+    Args:
+        token (str): The encoded JWT token (without the "Bearer " prefix).
+    Returns:
+        dict: The decoded payload. It is shared with the cache and must not be mutated.
+    Raises:
+        JWTError: If the token is invalid or expired.
+    """
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.put(token, payload)
+    return payload
+
+def decode_refresh_token(token: str) -> dict:
+    """
+    Verify a JWT refresh token and return its payload. Refresh tokens are used
+    once each, so they bypass the token cache.
+
+    Args:
+        token (str): The encoded refresh token.
+    Returns:
+        dict: The decoded payload.
+    Raises:
+        JWTError: If the token is invalid, expired, or not a refresh token.
+    """
+    payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+    if payload.get("type") != "refresh" or not {"sub", "sid", "jti"} <= payload.keys():
+        raise JWTError("Not a refresh token")
+    return payload
@@ -1,20 +1,48 @@
 # app/utils/logger.py
 
+import asyncio
+import atexit
+import copy
+import functools
 import logging
+import logging.handlers
 import os
-import datetime
+import queue
 import time
+from app.config import (
+    LOG_PRESET,
+    LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_DIR,
+    LOG_FILE_NAME,
+    LOG_ROTATION,
+    LOG_MAX_BYTES,
+    LOG_ROTATE_WHEN,
+    LOG_BACKUP_COUNT,
+)
 
 """
 Centralized Logger Configuration Module.
 
-This module creates a logs folder (if it doesn't exist) and sets up a log file
-named with the current timestamp. It configures a logger that writes debug,
-info, and error messages to that file. Additionally, it provides a decorator
-function to log the time taken by functions.
+This module configures a non-blocking logging pipeline for the whole
+application: every logger propagates to a QueueHandler on the root logger, and
+a QueueListener thread does the formatting and the (rotating) file and console
+writes, so request handlers never wait on disk I/O. Additionally, it provides
+a decorator function to log the time taken by functions.
+
+Nothing is configured at import: ``configure_logging`` installs the pipeline
+(creating LOG_DIR and the log file) and is called by the app's lifespan on
+startup, or by a script that wants the same output.
+
+Behaviour is controlled by app.config (LOG_PRESET, LOG_LEVEL, LOG_LEVELS,
+LOG_DIR, LOG_ROTATION, ...). The "production" preset logs at INFO with a
+compact format, disables DEBUG calls globally and skips collecting
+caller/thread/process details for each record.
 
 Usage:
-    from app.utils.logger import logger, log_time_taken
+    from app.utils.logger import configure_logging, logger, log_time_taken
+
+    configure_logging()
 
     @log_time_taken
     def some_function():
@@ -22,55 +50,152 @@ Usage:
         pass
 """
 
-# Define the folder where log files will be stored.
-LOG_FOLDER = "logs"
-if not os.path.exists(LOG_FOLDER):
-    os.makedirs(LOG_FOLDER)
-    # Log folder creation; using print here because logger isn't initialized yet.
-    print(f"Created log folder: {LOG_FOLDER}")
+DEVELOPMENT_FORMAT = "%(module)s:%(funcName)s:%(levelname)s:%(asctime)s:%(lineno)d:%(message)s"
+PRODUCTION_FORMAT = "%(asctime)s:%(levelname)s:%(name)s:%(message)s"
 
-# Create a log file name with the current timestamp.
-log_filename = datetime.datetime.now().isoformat("_", timespec="seconds").replace(":", "-") + ".log"
-LOG_FILE_PATH = os.path.join(LOG_FOLDER, log_filename)
+PRESETS = {
+    "development": {"level": "DEBUG", "format": DEVELOPMENT_FORMAT, "console": True, "fast_records": False},
+    "production": {"level": "INFO", "format": PRODUCTION_FORMAT, "console": False, "fast_records": True},
+}
 
-# Ensure the log file exists (creates an empty file if it does not).
-if not os.path.isfile(LOG_FILE_PATH):
-    with open(LOG_FILE_PATH, "a", encoding="utf-8") as f:
-        pass
+class DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
 
-# Create and configure the logger.
-logger = logging.getLogger("my_logger")
-logger.setLevel(logging.DEBUG)  # Set the logger to capture all levels (DEBUG and above).
+    The stock QueueHandler runs the full formatter on the calling thread so the
+    record can be pickled; our listener lives in the same process, so only the
+    message arguments are merged (they may be mutated after the call returns).
+    """
 
-# Create a file handler that writes log messages to the log file.
-file_handler = logging.FileHandler(LOG_FILE_PATH, mode="a", encoding="utf-8")
-file_handler.setLevel(logging.DEBUG)  # Ensure the file handler captures DEBUG messages.
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def parse_levels(spec: str) -> dict:
+    """
+    Parse a per-logger level specification.
 
-# Create a formatter and set it for the file handler.
-formatter = logging.Formatter("%(module)s:%(funcName)s:%(levelname)s:%(asctime)s:%(lineno)d:%(message)s")
-file_handler.setFormatter(formatter)
+    Args:
+        spec (str): Comma-separated "logger=LEVEL" pairs.
+    Returns:
+        dict: Logger name to level name.
+    """
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def _file_handler(path: str) -> logging.Handler:
+    if LOG_ROTATION == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+
+_listener = None
+_atexit_registered = False
+
+def configure_logging(preset: str = None) -> logging.handlers.QueueListener:
+    """
+    Install the queue-based logging pipeline on the root logger.
 
-# Add the file handler to the logger.
-logger.addHandler(file_handler)
+    Safe to call more than once; the previous listener is stopped and replaced.
 
-# Log that the logger has been successfully initialized.
-logger.info("Logger initialized and application has started.")
+    Args:
+        preset (str, optional): "development" or "production". Defaults to LOG_PRESET.
+    Returns:
+        QueueListener: The running background writer.
+    """
+    global _listener, _atexit_registered
+    settings = PRESETS.get(preset or LOG_PRESET, PRESETS["development"])
+    level = (LOG_LEVEL or settings["level"]).upper()
+
+    if _listener is not None:
+        _listener.stop()
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    formatter = logging.Formatter(settings["format"])
+    handlers = [_file_handler(os.path.join(LOG_DIR, LOG_FILE_NAME))]
+    if settings["console"]:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredFormatQueueHandler(log_queue))
+    root.setLevel(level)
+
+    for name, logger_level in parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    if settings["fast_records"]:
+        # Skip DEBUG calls at the manager level and stop collecting caller,
+        # thread and process details that the compact format does not use.
+        logging.disable(logging.DEBUG)
+        logging._srcfile = None
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+    logger.info("Logger initialized")
+    return _listener
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+# Application logger; records propagate to the root queue handler.
+logger = logging.getLogger("my_logger")
 
 def log_time_taken(func):
     """
     Decorator that logs the time taken by a function to execute.
 
+    Works for both regular functions and ``async def`` coroutines (such as route
+    handlers). For aggregated timings, see ``app.utils.metrics.timed``.
+
     Args:
         func (callable): The function whose execution time is to be logged.
 
     Returns:
         callable: The wrapped function with time logging.
     """
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start_time = time.perf_counter()  # Record the start time.
+            try:
+                return await func(*args, **kwargs)  # Await the original coroutine.
+            finally:
+                time_taken = time.perf_counter() - start_time  # Calculate the elapsed time.
+                logger.info("Function '%s' took %.4f seconds to complete", func.__name__, time_taken)
+        return async_wrapper
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()  # Record the start time.
-        result = func(*args, **kwargs)  # Execute the original function.
-        end_time = time.time()  # Record the end time.
-        time_taken = end_time - start_time  # Calculate the elapsed time.
-        logger.info(f"Function '{func.__name__}' took {time_taken:.4f} seconds to complete")
-        return result  # Return the result of the function.
+        start_time = time.perf_counter()  # Record the start time.
+        try:
+            return func(*args, **kwargs)  # Execute the original function.
+        finally:
+            time_taken = time.perf_counter() - start_time  # Calculate the elapsed time.
+            logger.info("Function '%s' took %.4f seconds to complete", func.__name__, time_taken)
     return wrapper
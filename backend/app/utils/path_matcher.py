@@ -0,0 +1,62 @@
+# app/utils/path_matcher.py
+"""
+Path matcher utility module.
+
+Provides a precompiled matcher for request paths: exact paths are held in a
+set (O(1) lookup) and prefixes in a character trie, so a lookup costs at most
+one walk over the request path regardless of how many prefixes are registered.
+
+Usage:
+    from app.utils.path_matcher import PathMatcher
+
+    matcher = PathMatcher(exact=["/auth/login"], prefixes=["/docs"])
+    matcher.matches("/docs/oauth2-redirect")  # True
+"""
+
+from typing import Iterable
+
+_TERMINAL = object()
+
+class PathMatcher:
+    """
+    Matches request paths against exact paths and path prefixes.
+
+    Args:
+        exact (Iterable[str]): Paths that match only when equal to the request path.
+        prefixes (Iterable[str]): Paths that match any request path starting with them.
+    """
+
+    def __init__(self, exact: Iterable[str] = (), prefixes: Iterable[str] = ()):
+        self.exact = frozenset(exact)
+        self.prefixes = tuple(prefixes)
+        self._trie = {}
+        for prefix in self.prefixes:
+            node = self._trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[_TERMINAL] = True
+
+    def matches(self, path: str) -> bool:
+        """
+        Check whether a request path is matched.
+
+        Args:
+            path (str): The request path (without query string).
+        Returns:
+            bool: True if the path equals an exact path or starts with a prefix.
+        """
+        if path in self.exact:
+            return True
+        node = self._trie
+        if _TERMINAL in node:
+            return True
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return False
+            if _TERMINAL in node:
+                return True
+        return False
+
+    def __repr__(self):
+        return f"<PathMatcher(exact={sorted(self.exact)}, prefixes={list(self.prefixes)})>"
@@ -0,0 +1,127 @@
+# app/utils/query_budget.py
+"""
+Query budget utility module.
+
+Records every SQL statement executed while serving a request (through engine
+event hooks) so that routes can declare how many statements they are allowed
+to issue and so that repeated identical statements (the signature of an N+1
+lazy-loading pattern) are reported.
+
+Routes declare their budget with the ``query_budget`` decorator, placed under
+the router decorator. ``QueryBudgetMiddleware`` checks every request against
+it when QUERY_BUDGET_MODE is "warn" (log a warning) or "raise" (raise
+QueryBudgetExceeded, which fails the request and therefore the test).
+
+Usage:
+    from app.utils.query_budget import query_budget, track_queries
+
+    @router.get("/")
+    @query_budget(1)
+    async def read_cart(...):
+        ...
+
+    with track_queries() as log:
+        await get_cart_items(db, user_id)
+    assert log.queries == 1
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+from sqlalchemy import event
+
+BUDGET_ATTRIBUTE = "__query_budget__"
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in "raise" mode when a request breaks its query budget or repeats a statement."""
+
+class QueryLog:
+    """
+    Statements executed within one request (or ``track_queries`` block).
+
+    Args:
+        parent (QueryLog, optional): An enclosing log that also records the
+            statements, e.g. a test's ``track_queries`` around a request.
+    """
+
+    __slots__ = ("statements", "parent")
+
+    def __init__(self, parent: Optional["QueryLog"] = None):
+        self.statements = Counter()
+        self.parent = parent
+
+    @property
+    def queries(self) -> int:
+        """Total number of statements executed."""
+        return sum(self.statements.values())
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """Return (statement, count) pairs executed at least threshold times."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def problems(self, budget: Optional[int], repeat_threshold: int) -> List[str]:
+        """
+        Describe every budget violation and probable N+1 pattern.
+
+        Args:
+            budget (int, optional): Maximum statements allowed (None means unlimited).
+            repeat_threshold (int): Executions of one identical statement that count as N+1.
+        Returns:
+            List[str]: Human-readable findings; empty if the log is within limits.
+        """
+        found = []
+        if budget is not None and self.queries > budget:
+            found.append(f"executed {self.queries} queries, budget is {budget}")
+        for statement, count in self.repeated(repeat_threshold):
+            found.append(f"probable N+1: {count}x {' '.join(statement.split())[:200]}")
+        return found
+
+current_query_log: ContextVar[Optional[QueryLog]] = ContextVar("current_query_log", default=None)
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    log = current_query_log.get()
+    while log is not None:
+        log.statements[statement] += 1
+        log = log.parent
+
+def install_query_log(sync_engine):
+    """
+    Attach the statement recorder to an engine.
+
+    Args:
+        sync_engine (Engine): A sync Engine (use ``async_engine.sync_engine`` for async engines).
+    """
+    if not event.contains(sync_engine, "after_cursor_execute", _record_statement):
+        event.listen(sync_engine, "after_cursor_execute", _record_statement)
+
+@contextmanager
+def track_queries():
+    """
+    Record the statements executed inside the block.
+
+    Yields:
+        QueryLog: The log, filled in as statements run.
+    """
+    log = QueryLog(parent=current_query_log.get())
+    token = current_query_log.set(log)
+    try:
+        yield log
+    finally:
+        current_query_log.reset(token)
+
+def query_budget(max_queries: int):
+    """
+    Decorator declaring the maximum number of SQL statements a route may issue.
+
+    Args:
+        max_queries (int): The budget, including statements run by dependencies.
+    """
+    def decorator(func):
+        setattr(func, BUDGET_ATTRIBUTE, max_queries)
+        return func
+    return decorator
+
+def get_query_budget(endpoint) -> Optional[int]:
+    """Return the budget declared on an endpoint function, or None."""
+    return getattr(endpoint, BUDGET_ATTRIBUTE, None)
@@ -0,0 +1,144 @@
+# app/utils/rate_limiter.py
+"""
+Rate limiter utility module.
+
+Implements sliding-window rate limits with the "sliding window counter"
+approximation: each key keeps only the start of its current fixed window and
+the hit counts of the current and previous windows, and the previous count is
+weighted by how much of it still overlaps the sliding window. That is O(1)
+memory per key (three numbers) instead of one timestamp per request, at the
+cost of assuming hits were evenly spread over the previous window.
+
+Backends implement the small async ``RateLimitBackend`` interface. Only an
+in-process backend ships today (a bounded LRU, so idle keys are evicted); a
+shared store (e.g. Redis) can be plugged in later by implementing ``hit``.
+
+Usage:
+    from app.utils.rate_limiter import RateLimiter, RateLimitRule
+
+    limiter = RateLimiter()
+    rule = RateLimitRule("login:ip", limit=20, window=60, key="ip")
+    allowed, retry_after = await limiter.hit(rule, "203.0.113.7")
+"""
+
+import math
+import time
+import threading
+from collections import OrderedDict
+from typing import Tuple
+from app.utils.metrics import registry
+
+RATE_LIMITED = registry.counter("rate_limited_total", "Requests rejected by a rate limit rule.", ("rule",))
+
+class RateLimitRule:
+    """
+    A limit of ``limit`` requests per ``window`` seconds for one identity.
+
+    Args:
+        name (str): Rule name, used as key prefix and metrics label.
+        limit (int): Requests allowed per window.
+        window (float): Window length in seconds.
+        key (str): What identifies a client: "ip" or "email".
+    """
+
+    __slots__ = ("name", "limit", "window", "key")
+
+    def __init__(self, name: str, limit: int, window: float, key: str = "ip"):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.key = key
+
+    def __repr__(self):
+        return f"<RateLimitRule({self.name}: {self.limit}/{self.window}s by {self.key})>"
+
+class RateLimitBackend:
+    """Interface for rate limit storage backends."""
+
+    async def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        """
+        Record one request for key if it is within the limit.
+
+        Returns:
+            Tuple[bool, float]: Whether the request is allowed and, if not,
+            the seconds until it would be.
+        """
+        raise NotImplementedError
+
+class LocalRateLimitBackend(RateLimitBackend):
+    """
+    In-process backend: a bounded LRU dictionary of sliding window counters.
+
+    Each worker process keeps its own counters, so with N workers a client can
+    make up to N times the limit; a shared backend removes that slack.
+
+    Args:
+        max_keys (int): Maximum number of tracked keys; the least recently
+            used are evicted first.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            start, previous, current = self._windows.get(key, (now, 0, 0))
+            elapsed = now - start
+            if elapsed >= window:
+                # Roll forward; a gap of two or more windows forgets the old count.
+                windows_passed = int(elapsed // window)
+                previous = current if windows_passed == 1 else 0
+                current = 0
+                start += windows_passed * window
+                elapsed = now - start
+
+            weight = 1.0 - elapsed / window
+            if previous * weight + current >= limit:
+                self._windows[key] = (start, previous, current)
+                self._windows.move_to_end(key)
+                return False, _retry_after(previous, current, limit, window, elapsed)
+
+            self._windows[key] = (start, previous, current + 1)
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+            return True, 0.0
+
+def _retry_after(previous: int, current: int, limit: int, window: float, elapsed: float) -> float:
+    """Seconds until the weighted count drops below limit, assuming no further hits."""
+    if current < limit and previous:
+        # Still inside the current window: wait for the previous window's weight to decay.
+        return max(0.0, window * (1.0 - (limit - current) / previous) - elapsed)
+    if current == 0:
+        # A limit of 0 blocks everything; report the end of the window.
+        return window - elapsed
+    # Wait for the next window, where the current count becomes the decaying previous one.
+    return (window - elapsed) + max(0.0, window * (1.0 - limit / current))
+
+class RateLimiter:
+    """
+    Applies rate limit rules against a backend.
+
+    Args:
+        backend (RateLimitBackend, optional): Storage backend; defaults to a LocalRateLimitBackend.
+    """
+
+    def __init__(self, backend: RateLimitBackend = None):
+        self.backend = backend or LocalRateLimitBackend()
+
+    async def hit(self, rule: RateLimitRule, identity: str) -> Tuple[bool, int]:
+        """
+        Count one request from identity under rule.
+
+        Returns:
+            Tuple[bool, int]: Whether it is allowed and, if not, the Retry-After
+            value in whole seconds (at least 1).
+        """
+        allowed, retry_after = await self.backend.hit(f"{rule.name}:{identity}", rule.limit, rule.window)
+        if allowed:
+            return True, 0
+        RATE_LIMITED.inc(rule=rule.name)
+        return False, max(1, math.ceil(retry_after))
@@ -0,0 +1,193 @@
+# app/utils/replicas.py
+"""
+Read replica routing module.
+
+``ReplicaRouter`` decides, per request, whether reads may go to a replica
+and to which one:
+
+- health and lag: every REPLICA_CHECK_SECONDS each replica runs a probe query
+  (its replication lag on PostgreSQL, ``SELECT 1`` elsewhere). A replica that
+  fails the probe, lags more than REPLICA_MAX_LAG_SECONDS, or whose connection
+  fails during a request is skipped until a later probe succeeds. With no
+  usable replica, reads go to the primary; a request that cannot connect to
+  its replica reads from the primary instead.
+- read-your-writes: a user's write marks them "sticky" for
+  REPLICA_STICKY_SECONDS, during which their reads stay on the primary, so
+  they see their own writes before the replicas do. Stickiness is tracked per
+  worker; a client whose next request lands on another worker may read from a
+  replica, bounded by REPLICA_MAX_LAG_SECONDS.
+
+The routing itself happens in app.database (``RoutingSession`` and
+``get_async_db``), which also creates the replica engines.
+
+Usage:
+    from app.utils.replicas import replica_router
+
+    replica = None if replica_router.is_sticky(user_id) else replica_router.choose()
+"""
+
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import REPLICA_MAX_LAG_SECONDS, REPLICA_STICKY_SECONDS, REPLICA_STICKY_MAX_KEYS
+
+logger = logging.getLogger("replicas")
+
+# Seconds the replica has not yet replayed; 0 when it has replayed all it received.
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+class Replica:
+    """
+    A replica engine and its last known state.
+
+    Args:
+        name (str): Label used in logs and pool stats (e.g. "replica0").
+        engine (AsyncEngine): The replica's engine.
+    """
+
+    __slots__ = ("name", "engine", "healthy", "lag")
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.healthy = False  # Until the first probe succeeds.
+        self.lag = 0.0
+
+    def __repr__(self):
+        return f"<Replica(name={self.name}, healthy={self.healthy}, lag={self.lag})>"
+
+class ReplicaRouter:
+    """
+    Replica selection, health tracking and read-your-writes stickiness.
+
+    Args:
+        max_lag (float): Lag in seconds above which a replica is not used.
+        sticky_seconds (float): How long a writer's reads stay on the primary.
+        max_keys (int): Sticky users remembered; the oldest are dropped first.
+    """
+
+    def __init__(self, max_lag: float, sticky_seconds: float, max_keys: int):
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.max_keys = max_keys
+        self.replicas: List[Replica] = []
+        self._sticky = OrderedDict()
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, engines: Dict[str, AsyncEngine]):
+        """Replace the replica set with the given engines, all unchecked."""
+        self.replicas = [Replica(name, engine) for name, engine in engines.items()]
+        self._next = 0
+
+    def usable(self, replica: Replica) -> bool:
+        """Return True if the replica is up and within the allowed lag."""
+        return replica.healthy and replica.lag <= self.max_lag
+
+    def choose(self) -> Optional[Replica]:
+        """
+        Pick the next usable replica, round robin.
+
+        Returns:
+            Optional[Replica]: A replica, or None to read from the primary.
+        """
+        count = len(self.replicas)
+        for offset in range(count):
+            replica = self.replicas[(self._next + offset) % count]
+            if self.usable(replica):
+                self._next = (self._next + offset + 1) % count
+                return replica
+        return None
+
+    def record(self, name: str, healthy: bool, lag: float = 0.0):
+        """Store the outcome of a probe (or of a failed connection) for a replica."""
+        for replica in self.replicas:
+            if replica.name == name:
+                if replica.healthy != healthy:
+                    logger.warning("Replica %s is now %s", name, "up" if healthy else "down")
+                elif healthy and (lag > self.max_lag) != (replica.lag > self.max_lag):
+                    logger.warning("Replica %s lag is %.1fs (limit %.1fs)", name, lag, self.max_lag)
+                replica.healthy = healthy
+                replica.lag = lag
+
+    def mark_down(self, name: str):
+        """Stop using a replica until its next successful probe."""
+        self.record(name, healthy=False)
+
+    def stick(self, key: Optional[Hashable]):
+        """Keep the reads of key (a user id) on the primary for sticky_seconds."""
+        if key is None or not self.replicas:
+            return
+        self._sticky[key] = time.monotonic() + self.sticky_seconds
+        self._sticky.move_to_end(key)
+        while len(self._sticky) > self.max_keys:
+            self._sticky.popitem(last=False)
+
+    def is_sticky(self, key: Optional[Hashable]) -> bool:
+        """Return True if key wrote within the last sticky_seconds."""
+        until = self._sticky.get(key)
+        if until is None:
+            return False
+        if until > time.monotonic():
+            return True
+        del self._sticky[key]
+        return False
+
+    async def probe(self, replica: Replica, timeout: float):
+        """Check one replica's connectivity and lag and record the result."""
+        try:
+            async with asyncio.timeout(timeout):
+                async with replica.engine.connect() as connection:
+                    if connection.dialect.name == "postgresql":
+                        lag = float(await connection.scalar(POSTGRES_LAG_QUERY) or 0.0)
+                    else:
+                        await connection.execute(text("SELECT 1"))
+                        lag = 0.0
+        except (SQLAlchemyError, OSError, TimeoutError) as e:
+            logger.error("Replica %s probe failed: %s", replica.name, e)
+            self.record(replica.name, healthy=False)
+        else:
+            self.record(replica.name, healthy=True, lag=lag)
+
+    async def check(self, timeout: float = 2.0):
+        """Probe every replica concurrently."""
+        await asyncio.gather(*(self.probe(replica, timeout) for replica in self.replicas))
+
+    async def start(self, engines: Dict[str, AsyncEngine], interval: float):
+        """
+        Use the given replicas and keep their state current from a background task.
+
+        The first check completes before this returns, so a worker only routes
+        reads to replicas that answered.
+        """
+        self.configure(engines)
+        if self.replicas and self._task is None:
+            await self.check(timeout=interval)
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        """Cancel the background checks and forget the replicas."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.configure({})
+        self._sticky.clear()
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.check(timeout=interval)
+
+replica_router = ReplicaRouter(REPLICA_MAX_LAG_SECONDS, REPLICA_STICKY_SECONDS, REPLICA_STICKY_MAX_KEYS)
@@ -0,0 +1,126 @@
+# app/utils/revocation.py
+"""
+Token revocation list module.
+
+Keeps the ids of revoked tokens and sessions ("jti" / "sid" claims) in a
+dictionary mapping each id to the moment its revocation stops mattering, so
+JWTMiddleware rejects revoked tokens with two dictionary lookups and no I/O.
+
+The ``revoked_tokens`` table is the source of truth. A worker adds its own
+revocations to memory as soon as they are committed, and every worker reloads
+the unexpired rows every REVOCATION_SYNC_SECONDS to pick up the others'.
+Revocations are never undone, so a reload only merges; entries (and rows) are
+dropped once their expiry passes, since any token they match has expired too.
+
+Usage:
+    from app.utils.revocation import revocation_list
+
+    if revocation_list.is_revoked(payload):
+        ...
+"""
+
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import select, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models.revoked_token import RevokedToken
+from app.models.auth_session import AuthSession
+
+logger = logging.getLogger("revocation")
+
+def _timestamp(value: datetime) -> float:
+    # SQLite hands timezone-aware columns back naive; they were written in UTC.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+class RevocationList:
+    """In-memory set of revoked token and session ids, each with an expiry."""
+
+    def __init__(self):
+        self._entries = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_revoked(self, payload: dict) -> bool:
+        """Return True if the token's "jti" or its session's "sid" has been revoked."""
+        entries = self._entries
+        return payload.get("jti") in entries or payload.get("sid") in entries
+
+    def add(self, token_id: str, expires_at: datetime):
+        """Mark an id as revoked until expires_at."""
+        expiry = _timestamp(expires_at)
+        if expiry > self._entries.get(token_id, 0.0):
+            self._entries[token_id] = expiry
+
+    def prune(self):
+        """Forget entries whose expiry has passed."""
+        now = time.time()
+        self._entries = {token_id: expiry for token_id, expiry in self._entries.items() if expiry > now}
+
+    async def sync(self, db: AsyncSession):
+        """Merge the unexpired rows of revoked_tokens into memory and prune expired entries."""
+        result = await db.execute(
+            select(RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.expires_at > datetime.now(timezone.utc))
+        )
+        for token_id, expires_at in result:
+            self.add(token_id, expires_at)
+        self.prune()
+
+    async def purge(self, db: AsyncSession) -> int:
+        """Delete expired revocations and sessions from the database."""
+        now = datetime.now(timezone.utc)
+        revoked = await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        sessions = await db.execute(delete(AuthSession).where(AuthSession.expires_at <= now))
+        await db.commit()
+        return revoked.rowcount + sessions.rowcount
+
+    async def start(self, session_factory: async_sessionmaker, interval: float, purge_interval: float):
+        """
+        Load the list, then keep it in sync with the database from a background task.
+
+        The first load completes before this returns, so a freshly started
+        worker never accepts tokens the others already reject.
+        """
+        if self._task is None:
+            await self._sync_once(session_factory, purge=False)
+            self._task = asyncio.create_task(self._run(session_factory, interval, purge_interval))
+
+    async def stop(self):
+        """Cancel the background sync task."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _sync_once(self, session_factory: async_sessionmaker, purge: bool):
+        try:
+            async with session_factory() as db:
+                await self.sync(db)
+                if purge:
+                    logger.info("Purged %d expired revocations and sessions", await self.purge(db))
+        except SQLAlchemyError as e:
+            # Keep serving from memory; the next round retries.
+            logger.error("Revocation list sync failed: %s", e)
+
+    async def _run(self, session_factory: async_sessionmaker, interval: float, purge_interval: float):
+        next_purge = time.monotonic() + purge_interval
+        while True:
+            await asyncio.sleep(interval)
+            purge = time.monotonic() >= next_purge
+            if purge:
+                next_purge = time.monotonic() + purge_interval
+            await self._sync_once(session_factory, purge)
+
+# Revocations seen by this process, shared by every request.
+revocation_list = RevocationList()
@@ -0,0 +1,306 @@
+# app/utils/search_index.py
+"""
+Autocomplete index module.
+
+``PrefixTrie`` indexes the words of service names. Every node keeps the best
+ranked names of its subtree, so completing a word walks one node per typed
+character and never scans the catalog: such lookups take microseconds at
+any catalog size. Text of several words intersects the sets of names having
+each whole word, which costs more the more common those words are. Names
+rank shortest first, then alphabetically.
+
+``AutocompleteIndex`` holds the worker's trie. Catalog writes update it
+incrementally through ``add``/``remove`` (see the service controller), and a
+background task rebuilds it from the database every
+AUTOCOMPLETE_REFRESH_SECONDS to pick up writes made through other workers.
+Rebuilds run in a thread and writes made meanwhile are replayed onto the new
+trie, so none are lost.
+
+Usage:
+    from app.utils.search_index import autocomplete_index
+
+    await autocomplete_index.ensure_loaded(db)
+    suggestions = autocomplete_index.suggest("dry cl", limit=10)
+"""
+
+import re
+import heapq
+import bisect
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models.service import Service
+from app.config import AUTOCOMPLETE_MAX_LIMIT
+
+logger = logging.getLogger("search_index")
+
+WORD = re.compile(r"[^\W_]+")
+
+# Checking a name's words costs about this many set insertions.
+CHECK_COST = 20
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lower-case words of letters and digits."""
+    return WORD.findall(text.lower()) if text else []
+
+class _Node:
+    __slots__ = ("children", "ids", "top", "count")
+
+    def __init__(self):
+        self.children = None  # {char: _Node}, created with the first child.
+        self.ids = None  # Ids of the names with a word ending here.
+        self.top = []  # Best ranks of the subtree; None when it must be recomputed.
+        self.count = 0  # Names with a word in the subtree.
+
+class PrefixTrie:
+    """
+    Prefix trie over the words of service names.
+
+    A name's rank is (length, lower-cased name, id): sorting ranks orders
+    names shortest first, and the id ends each rank.
+
+    Args:
+        size (int): The most suggestions a lookup returns.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.keep = 2 * size  # The spares absorb removals without a recompute.
+        self.root = _Node()
+        self.names: Dict[int, Tuple[tuple, str, frozenset]] = {}  # id -> (rank, name, words)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _path(self, word: str, create: bool) -> Optional[List[_Node]]:
+        # The nodes below the root spelling word; None if absent and not created.
+        node, path = self.root, []
+        for char in word:
+            if node.children is None:
+                if not create:
+                    return None
+                node.children = {}
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = _Node()
+            node = child
+            path.append(node)
+        return path
+
+    def add(self, service_id: int, name: str):
+        """Index a service name, replacing the service's previous name if any."""
+        self.remove(service_id)
+        words = frozenset(tokenize(name))
+        rank = (len(name), name.lower(), service_id)
+        self.names[service_id] = (rank, name, words)
+        nodes = {}
+        for word in words:
+            path = self._path(word, create=True)
+            if path[-1].ids is None:
+                path[-1].ids = set()
+            path[-1].ids.add(service_id)
+            nodes.update((id(node), node) for node in path)
+        for node in nodes.values():  # Once per node, even where words share a prefix.
+            top = node.top
+            # Ranks past the last kept one are only known when all are kept.
+            if top is not None and (len(top) == node.count or rank < top[-1]):
+                bisect.insort(top, rank)
+                del top[self.keep:]
+            node.count += 1
+
+    def remove(self, service_id: int):
+        """Drop a service from the index; does nothing if it is not indexed."""
+        indexed = self.names.pop(service_id, None)
+        if indexed is None:
+            return
+        rank, _, words = indexed
+        nodes = {}
+        for word in words:
+            path = self._path(word, create=False)
+            path[-1].ids.discard(service_id)
+            nodes.update((id(node), node) for node in path)
+        for node in nodes.values():
+            node.count -= 1
+            top = node.top
+            if top is not None:
+                index = bisect.bisect_left(top, rank)
+                if index < len(top) and top[index] == rank:
+                    del top[index]
+                    if len(top) < self.size and node.count > len(top):
+                        node.top = None  # Out of spares: recomputed on the next lookup.
+        for word in words:
+            # Unlink the first emptied node on each word's path; a word sharing
+            # its prefix with an earlier one may find that node already gone.
+            node = self.root
+            for char in word:
+                child = node.children.get(char) if node.children else None
+                if child is None:
+                    break
+                if child.count == 0:
+                    del node.children[char]
+                    break
+                node = child
+
+    def _subtree_ids(self, node: _Node) -> set:
+        # The ids of the names with a word in the subtree.
+        ids, stack = set(), [node]
+        while stack:
+            current = stack.pop()
+            if current.ids:
+                ids.update(current.ids)
+            if current.children:
+                stack.extend(current.children.values())
+        return ids
+
+    def _top(self, node: _Node) -> list:
+        if node.top is None:
+            node.top = heapq.nsmallest(self.keep, (self.names[i][0] for i in self._subtree_ids(node)))
+        return node.top
+
+    def suggest(self, text: str, limit: int) -> List[dict]:
+        """
+        Complete typed text to service names.
+
+        A name matches when it has a word starting with the last word of text
+        and, as whole words, any earlier ones.
+
+        Args:
+            text (str): The text typed so far; its last word may be incomplete.
+            limit (int): Maximum suggestions (at most ``size``).
+        Returns:
+            List[dict]: {"id", "name"} of the best-ranked matching services.
+        """
+        words = tokenize(text)
+        if not words:
+            return []
+        *whole, prefix = words
+        path = self._path(prefix, create=False)
+        if not path:
+            return []
+        if not whole:
+            ranks = self._top(path[-1])[:limit]
+        else:
+            # Intersect the names having the whole words, then keep those
+            # with a word starting with the prefix: by checking each one, or
+            # through the set of the prefix's names when there are too many.
+            postings = [self._path(word, create=False) for word in whole]
+            if not all(postings):
+                return []
+            sets = sorted((nodes[-1].ids or set() for nodes in postings), key=len)
+            candidates = sets[0].intersection(*sets[1:])
+            if len(candidates) * CHECK_COST <= path[-1].count:
+                names = self.names
+                candidates = [i for i in candidates if any(word.startswith(prefix) for word in names[i][2])]
+            else:
+                candidates &= self._subtree_ids(path[-1])
+            ranks = heapq.nsmallest(limit, (self.names[i][0] for i in candidates))
+        return [{"id": rank[2], "name": self.names[rank[2]][1]} for rank in ranks]
+
+def build_trie(rows, size: int) -> PrefixTrie:
+    """Build a trie from (id, name) rows."""
+    trie = PrefixTrie(size)
+    # Adding in rank order appends to every sorted list instead of inserting.
+    for service_id, name in sorted(rows, key=lambda row: (len(row[1]), row[1].lower(), row[0])):
+        trie.add(service_id, name)
+    return trie
+
+class AutocompleteIndex:
+    """
+    The worker's autocomplete index over service names.
+
+    Args:
+        size (int): Most suggestions returned by a lookup.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._trie: Optional[PrefixTrie] = None
+        self._pending: Optional[list] = None  # Writes made while a rebuild is loading.
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._trie is not None
+
+    def add(self, service_id: int, name: str):
+        """Apply a created or renamed service."""
+        if self._trie is not None:
+            self._trie.add(service_id, name)
+        if self._pending is not None:
+            self._pending.append((service_id, name))
+
+    def remove(self, service_id: int):
+        """Apply a deleted service."""
+        if self._trie is not None:
+            self._trie.remove(service_id)
+        if self._pending is not None:
+            self._pending.append((service_id, None))
+
+    def suggest(self, text: str, limit: int) -> List[dict]:
+        """Return up to limit {"id", "name"} suggestions for text; empty until loaded."""
+        if self._trie is None:
+            return []
+        return self._trie.suggest(text, min(limit, self.size))
+
+    async def load(self, db: AsyncSession, force: bool = True):
+        """
+        Build the index from the services table and swap it in.
+
+        Args:
+            db (AsyncSession): Database session.
+            force (bool): Rebuild even if an index is already loaded.
+        """
+        async with self._lock:
+            if self.loaded and not force:
+                return
+            self._pending = []
+            try:
+                rows = (await db.execute(select(Service.id, Service.name))).all()
+                trie = await asyncio.to_thread(build_trie, rows, self.size)
+                for service_id, name in self._pending:
+                    if name is None:
+                        trie.remove(service_id)
+                    else:
+                        trie.add(service_id, name)
+                self._trie = trie
+            finally:
+                self._pending = None
+        logger.info("Autocomplete index loaded with %d services", len(trie))
+
+    async def ensure_loaded(self, db: AsyncSession):
+        """Load the index on first use (e.g. before the background refresh has run)."""
+        if not self.loaded:
+            await self.load(db, force=False)
+
+    async def start(self, session_factory: async_sessionmaker, interval: float):
+        """Load the index, then rebuild it every interval seconds, from a background task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self):
+        """Cancel the background rebuilds."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self, session_factory: async_sessionmaker, interval: float):
+        while True:
+            try:
+                async with session_factory() as db:
+                    await self.load(db)
+            except SQLAlchemyError as e:
+                # Keep serving the current index; the next round retries.
+                logger.error("Autocomplete index rebuild failed: %s", e)
+            await asyncio.sleep(interval)
+
+autocomplete_index = AutocompleteIndex(AUTOCOMPLETE_MAX_LIMIT)
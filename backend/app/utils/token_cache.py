@@ -0,0 +1,89 @@
+# app/utils/token_cache.py
+"""
+Token cache utility module.
+
+Provides a bounded LRU cache of verified JWT payloads. Entries are keyed by a
+SHA-256 digest of the raw token (so tokens are never held as dictionary keys)
+and expire at the earlier of the token's ``exp`` claim and the cache TTL.
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+class TokenCache:
+    """
+    LRU/TTL cache of decoded token payloads.
+
+    Args:
+        max_size (int): Maximum number of cached tokens; 0 disables the cache.
+        ttl (float): Maximum seconds an entry is trusted, even if ``exp`` is later.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """Return the cache key for a raw token."""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """
+        Return the cached payload for a token, or None on a miss or expiry.
+
+        The returned payload is shared between requests and must not be mutated.
+        """
+        if not self.max_size:
+            self.misses += 1
+            return None
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: dict):
+        """Cache a verified payload until its ``exp`` claim or the TTL, whichever is first."""
+        if not self.max_size:
+            return
+        expires_at = time.time() + self.ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, token: str):
+        """Remove a token from the cache (e.g. after it is revoked)."""
+        with self._lock:
+            self._entries.pop(self.digest(token), None)
+
+    def clear(self):
+        """Drop all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,85 @@
+# app/utils/warmup.py
+"""
+Worker warm-up module.
+
+Runs once per worker from the lifespan hook, before the worker accepts
+requests, so the first requests it serves don't pay for work that is the same
+for every request:
+
+- opening database connections: WARMUP_DB_CONNECTIONS connections are checked
+  out concurrently, each runs ``SELECT 1``, and they go back to the pool;
+- loading the service catalog into ``catalog_cache``;
+- building the OpenAPI schema (cached on the app after the first build).
+
+Each step is best effort. A failure is logged and the worker starts anyway;
+the step then happens lazily on first use, as it would without warm-up.
+
+Usage:
+    from app.utils.warmup import warm_up
+
+    await warm_up(app, connections=WARMUP_DB_CONNECTIONS)
+"""
+
+import time
+import asyncio
+import logging
+from fastapi import FastAPI
+from sqlalchemy import text
+from app.database import get_async_engine, get_async_sessionmaker
+
+logger = logging.getLogger("warmup")
+
+async def open_connections(count: int) -> int:
+    """
+    Open up to count pooled connections at once and return them to the pool.
+
+    Args:
+        count (int): Connections to open; capped by the pool size.
+    Returns:
+        int: The number of connections opened.
+    """
+    engine = get_async_engine()
+    pool_size = getattr(engine.pool, "size", lambda: count)()
+    count = min(count, pool_size)
+    if count <= 0:
+        return 0
+
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    # Hold all checkouts concurrently so the pool creates distinct connections.
+    await asyncio.gather(*(ping() for _ in range(count)))
+    return count
+
+async def prime_catalog():
+    """Load the full service catalog into the catalog cache."""
+    from app.controllers.service_controller import get_all_services_payload
+
+    async with get_async_sessionmaker()() as db:
+        await get_all_services_payload(db)
+
+async def build_openapi(app: FastAPI):
+    """Build and cache the application's OpenAPI schema."""
+    app.openapi()
+
+async def warm_up(app: FastAPI, connections: int):
+    """
+    Prepare a worker to serve requests.
+
+    Args:
+        app (FastAPI): The application being started.
+        connections (int): Database connections to pre-open (0 to skip).
+    """
+    started = time.perf_counter()
+    steps = (
+        ("database connections", lambda: open_connections(connections)),
+        ("service catalog", prime_catalog),
+        ("OpenAPI schema", lambda: build_openapi(app)),
+    )
+    for name, step in steps:
+        try:
+            await step()
+        except Exception:
+            logger.exception("Warm-up of %s failed; continuing without it", name)
+    logger.info("Worker warmed up in %.0f ms", (time.perf_counter() - started) * 1000)
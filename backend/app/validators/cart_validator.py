@@ -2,12 +2,14 @@
 """
 Cart Validators.
 
-Defines Pydantic schemas for creating, updating, and serializing cart items.
+Defines Pydantic schemas for creating (singly or in batches), updating, and serializing cart items
+and cart summaries.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Optional
 from datetime import datetime
+from decimal import Decimal
 from app.validators.service_validator import ServiceResponseSchema
 
 class CartCreateSchema(BaseModel):
@@ -18,8 +20,16 @@ class CartCreateSchema(BaseModel):
     quantity: int = Field(1, gt=0, description="Quantity of the service to add")
     custom_instructions: Optional[str] = Field(None, description="Custom instructions (optional)")
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(strict=True)
+
+class CartBatchSchema(BaseModel):
+    """
+    Schema for adding several items to the cart in one request.
+    """
+    items: List[CartCreateSchema] = Field(..., min_length=1, max_length=100, description="Items to add")
+
+    model_config = ConfigDict(strict=True)
+
 
 class CartUpdateSchema(BaseModel):
     """
@@ -28,8 +38,7 @@ class CartUpdateSchema(BaseModel):
     quantity: Optional[int] = Field(None, gt=0, description="Updated quantity")
     custom_instructions: Optional[str] = Field(None, description="Updated custom instructions")
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(strict=True)
 
 class CartResponseSchema(BaseModel):
     """
@@ -42,5 +51,20 @@ class CartResponseSchema(BaseModel):
     created_at: datetime
     service: Optional[ServiceResponseSchema] = None  # Nested service details
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class CartSummarySchema(BaseModel):
+    """
+    Schema for a cart together with its totals.
+
+    ``total`` is an exact decimal (serialized as a string, e.g. "59.00").
+    """
+    items: List[CartResponseSchema]
+    item_count: int
+    total_quantity: int
+    total: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Validates and serializes whole cart listings in one call (see adapter_response).
+CartItemListAdapter = TypeAdapter(List[CartResponseSchema])
@@ -0,0 +1,107 @@
+# app/validators/order_validator.py
+"""
+Order Validators.
+
+Defines Pydantic schemas for checking out a cart, paging through the order
+history and serializing orders with their items, payment and delivery.
+"""
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Optional
+from datetime import datetime
+from app.config import ORDERS_DEFAULT_PAGE_SIZE, ORDERS_MAX_PAGE_SIZE
+from app.validators.service_validator import ServiceResponseSchema
+
+class CheckoutSchema(BaseModel):
+    """
+    Schema for checking out the current cart.
+    """
+    payment_method: str = Field("COD", min_length=1, description='Payment method, e.g. "card", "UPI", "COD"')
+    pickup_time: Optional[datetime] = Field(None, description="Requested pickup time (optional)")
+    delivery_time: Optional[datetime] = Field(None, description="Requested delivery time (optional)")
+
+class OrderListQuery(BaseModel):
+    """
+    Query parameters for the order history (newest first).
+
+    Pass the X-Next-Cursor response header back as ``cursor`` for the next page.
+    """
+    limit: int = Field(ORDERS_DEFAULT_PAGE_SIZE, ge=1, le=ORDERS_MAX_PAGE_SIZE, description="Page size")
+    cursor: Optional[str] = Field(None, description="Cursor from the previous page's X-Next-Cursor header")
+
+class OrderItemResponseSchema(BaseModel):
+    """
+    Schema for serializing an order item (price is the unit price at checkout).
+    """
+    id: int
+    service_id: int
+    quantity: int
+    price: float
+    custom_instructions: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class PaymentResponseSchema(BaseModel):
+    """
+    Schema for serializing an order's payment.
+    """
+    id: int
+    amount: float
+    method: str
+    status: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class DeliveryResponseSchema(BaseModel):
+    """
+    Schema for serializing an order's delivery.
+    """
+    id: int
+    status: str
+    pickup_time: Optional[datetime] = None
+    delivery_time: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class OrderResponseSchema(BaseModel):
+    """
+    Schema for serializing an order with its items, payment and delivery.
+    """
+    id: int
+    status: str
+    total_price: float
+    pickup_time: Optional[datetime] = None
+    delivery_time: Optional[datetime] = None
+    created_at: datetime
+    order_items: List[OrderItemResponseSchema] = []
+    payment: Optional[PaymentResponseSchema] = None
+    delivery: Optional[DeliveryResponseSchema] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class OrderItemDetailSchema(OrderItemResponseSchema):
+    """
+    Schema for serializing an order item together with its service.
+    """
+    service: Optional[ServiceResponseSchema] = None
+
+class ReviewResponseSchema(BaseModel):
+    """
+    Schema for serializing a review of an order.
+    """
+    id: int
+    rating: int
+    comment: Optional[str] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class OrderDetailSchema(OrderResponseSchema):
+    """
+    Schema for a single order: items include their service, plus the order's reviews.
+    """
+    order_items: List[OrderItemDetailSchema] = []
+    reviews: List[ReviewResponseSchema] = []
+
+# Validates and serializes whole order history pages in one call (see adapter_response).
+OrderListAdapter = TypeAdapter(List[OrderResponseSchema])
@@ -2,10 +2,12 @@
 """
 Service Validators.
 
-Defines Pydantic schemas for creating, updating, and serializing laundry services.
+Defines Pydantic schemas for creating, updating, listing, searching, and serializing laundry services.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import List, Literal, Optional
+from app.config import SERVICES_MAX_PAGE_SIZE, SEARCH_MAX_LIMIT, AUTOCOMPLETE_MAX_LIMIT
 
 class ServiceCreateSchema(BaseModel):
     """
@@ -19,13 +21,12 @@ class ServiceCreateSchema(BaseModel):
         image_url: URL or path to the service image (optional).
     """
     name: str = Field(..., min_length=1, description="Name of the service")
-    description: str = Field(None, description="Description of the service")
+    description: Optional[str] = Field(None, description="Description of the service")
     base_price: float = Field(..., gt=0, description="Base price for the service")
-    category: str = Field(None, description="Category for the service")
-    image_url: str = Field(None, description="URL of the service image (optional)")
+    category: Optional[str] = Field(None, description="Category for the service")
+    image_url: Optional[str] = Field(None, description="URL of the service image (optional)")
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(strict=True)
 
 class ServiceUpdateSchema(BaseModel):
     """
@@ -33,14 +34,21 @@ class ServiceUpdateSchema(BaseModel):
     
     All fields are optional to support partial updates.
     """
-    name: str = Field(None, min_length=1, description="Name of the service")
-    description: str = Field(None, description="Description of the service")
-    base_price: float = Field(None, gt=0, description="Base price for the service")
-    category: str = Field(None, description="Category for the service")
-    image_url: str = Field(None, description="URL of the service image (optional)")
+    name: Optional[str] = Field(None, min_length=1, description="Name of the service")
+    description: Optional[str] = Field(None, description="Description of the service")
+    base_price: Optional[float] = Field(None, gt=0, description="Base price for the service")
+    category: Optional[str] = Field(None, description="Category for the service")
+    image_url: Optional[str] = Field(None, description="URL of the service image (optional)")
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(strict=True)
+
+    @field_validator("name", "base_price")
+    @classmethod
+    def not_null(cls, value):
+        # description, category and image_url may be cleared with null; name and base_price are required.
+        if value is None:
+            raise ValueError("cannot be null")
+        return value
 
 class ServiceResponseSchema(BaseModel):
     """
@@ -50,10 +58,61 @@ class ServiceResponseSchema(BaseModel):
     """
     id: int
     name: str
-    description: str = None
+    description: Optional[str] = None
     base_price: float
-    category: str = None
-    image_url: str = None
+    category: Optional[str] = None
+    image_url: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ServiceListQuery(BaseModel):
+    """
+    Query parameters for listing services.
+
+    When none are given the full catalog is returned. Otherwise results are
+    paginated with an opaque keyset cursor: pass the X-Next-Cursor response
+    header back as ``cursor`` (with the same filters and sort) for the next page.
+    """
+    limit: Optional[int] = Field(None, ge=1, le=SERVICES_MAX_PAGE_SIZE, description="Page size")
+    cursor: Optional[str] = Field(None, description="Cursor from the previous page's X-Next-Cursor header")
+    category: Optional[str] = Field(None, description="Only services in this category")
+    min_price: Optional[float] = Field(None, ge=0, description="Minimum base price (inclusive)")
+    max_price: Optional[float] = Field(None, ge=0, description="Maximum base price (inclusive)")
+    sort: Optional[Literal["id", "name", "base_price"]] = Field(None, description="Sort field (default: id)")
+    order: Optional[Literal["asc", "desc"]] = Field(None, description="Sort order (default: asc)")
+
+    def is_paginated(self) -> bool:
+        """Return True if any listing parameter was supplied."""
+        return bool(self.model_dump(exclude_none=True))
+
+class ServiceSearchQuery(BaseModel):
+    """
+    Query parameters for searching services.
+
+    ``q`` is split into words; a service matches when each word occurs in its
+    name, category or description, the last word also as a prefix (so
+    results follow the user's typing). Name matches rank first.
+    """
+    q: str = Field(..., min_length=1, max_length=100, description="Search text")
+    limit: Optional[int] = Field(None, ge=1, le=SEARCH_MAX_LIMIT, description="Maximum results (default 20)")
+
+class ServiceAutocompleteQuery(BaseModel):
+    """
+    Query parameters for autocompleting service names.
+
+    The last word of ``q`` may be incomplete: it must start a word of the
+    service name, and any earlier words must be whole words of it. Shorter
+    names are suggested first.
+    """
+    q: str = Field(..., min_length=1, max_length=100, description="Text typed so far")
+    limit: int = Field(AUTOCOMPLETE_MAX_LIMIT, ge=1, le=AUTOCOMPLETE_MAX_LIMIT, description="Maximum suggestions")
+
+class ServiceSuggestionSchema(BaseModel):
+    """
+    An autocomplete suggestion.
+    """
+    id: int
+    name: str
 
-    class Config:
-        orm_mode = True
+# Validates and serializes whole service listings in one call (see adapter_response).
+ServiceListAdapter = TypeAdapter(List[ServiceResponseSchema])
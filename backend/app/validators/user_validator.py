@@ -1,15 +1,14 @@
 # app/validators/user_validator.py
-import logging
-from pydantic import BaseModel, EmailStr, Field
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 """
 User validators module.
 
-Defines Pydantic models for validating user registration and login requests.
+Defines Pydantic models for validating user registration, login, profile update
+and token refresh requests.
 """
 
-logging.debug("Loading user validator schemas")
-
 class UserCreateSchema(BaseModel):
     """
     Schema for user registration (sign-up).
@@ -24,11 +23,10 @@ class UserCreateSchema(BaseModel):
     name: str = Field(..., min_length=1, description="User's full name")
     email: EmailStr = Field(..., description="User's email address")
     password: str = Field(..., min_length=6, description="User's password (min 6 characters)")
-    phone: str = None
-    address: str = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(strict=True)
 
 class UserLoginSchema(BaseModel):
     """
@@ -40,3 +38,39 @@ class UserLoginSchema(BaseModel):
     """
     email: EmailStr = Field(..., description="User's email address")
     password: str = Field(..., min_length=6, description="User's password")
+
+    model_config = ConfigDict(strict=True)
+
+class UserUpdateSchema(BaseModel):
+    """
+    Schema for updating the current user's profile. Omitted fields are unchanged.
+
+    Attributes:
+        name: New full name.
+        phone: New phone number.
+        address: New address.
+    """
+    name: Optional[str] = Field(None, min_length=1, description="User's full name")
+    phone: Optional[str] = None
+    address: Optional[str] = None
+
+    model_config = ConfigDict(strict=True)
+
+    @field_validator("name")
+    @classmethod
+    def name_not_null(cls, value: Optional[str]) -> str:
+        # phone and address may be cleared with null; name is required on the user.
+        if value is None:
+            raise ValueError("name cannot be null")
+        return value
+
+class RefreshTokenSchema(BaseModel):
+    """
+    Schema for refreshing a session's tokens.
+
+    Attributes:
+        refresh_token: The refresh token from login or the previous refresh.
+    """
+    refresh_token: str = Field(..., min_length=1, description="Refresh token")
+
+    model_config = ConfigDict(strict=True)
@@ -0,0 +1,87 @@
+# benchmarks/bench_cart_total.py
+"""
+Cart total benchmark.
+
+Seeds one user with carts of increasing size and compares the previous way of
+computing GET /cart/total (load every cart row with its service and sum in
+Python) against the single SUM(...) over cart JOIN services now used by
+get_cart_total. Both results are checked to agree to the cent.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cart_total --sizes 10 100 1000 10000
+"""
+
+import time
+import argparse
+import asyncio
+import statistics
+from decimal import Decimal
+from benchmarks.common import setup_environment
+
+setup_environment("bench_cart_total.sqlite3")
+
+from sqlalchemy import insert, delete, select
+from sqlalchemy.orm import joinedload
+from app.database import engine, async_engine, AsyncSessionLocal
+from app.models import Base, User, Service, Cart
+from app.controllers.cart_controller import get_cart_total, to_money
+
+SERVICES = 200
+
+def seed_catalog():
+    """Create the schema, one user and a small catalog of services."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"name": "Bench", "email": "bench@example.com", "password_hash": "x"}])
+        conn.execute(insert(Service), [
+            {"name": f"Service {i}", "base_price": round(0.99 + i * 1.37, 2), "category": "bench"}
+            for i in range(SERVICES)
+        ])
+
+def seed_cart(size: int):
+    """Replace the user's cart with size items."""
+    with engine.begin() as conn:
+        conn.execute(delete(Cart))
+        if size:
+            conn.execute(insert(Cart), [
+                {"user_id": 1, "service_id": i % SERVICES + 1, "quantity": i % 5 + 1}
+                for i in range(size)
+            ])
+
+async def python_total(db) -> Decimal:
+    """The previous implementation: hydrate every item and sum in Python."""
+    result = await db.execute(select(Cart).options(joinedload(Cart.service)).filter(Cart.user_id == 1))
+    total = 0.0
+    for item in result.scalars().all():
+        if item.service:
+            total += item.quantity * item.service.base_price
+    return to_money(total)
+
+async def measure(func, repeats: int):
+    samples = []
+    value = None
+    for _ in range(repeats):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            value = await func(db)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), value
+
+async def main(args):
+    seed_catalog()
+    print(f"median of {args.repeats} runs (ms)")
+    print(f"{'items':>7} {'python':>9} {'sql sum':>9} {'total':>14}")
+    for size in args.sizes:
+        seed_cart(size)
+        python_ms, expected = await measure(python_total, args.repeats)
+        sql_ms, total = await measure(lambda db: get_cart_total(db, 1), args.repeats)
+        assert total == expected, f"totals differ: {total} != {expected}"
+        print(f"{size:>7} {python_ms:>9.2f} {sql_ms:>9.2f} {total:>14}")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000], help="Cart sizes to test")
+    parser.add_argument("--repeats", type=int, default=20, help="Runs per measurement")
+    asyncio.run(main(parser.parse_args()))
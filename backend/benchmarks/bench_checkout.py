@@ -0,0 +1,104 @@
+# benchmarks/bench_checkout.py
+"""
+Checkout throughput benchmark.
+
+Seeds a set of users, each with a cart of --items items, then checks every
+cart out concurrently through the order controller (one session per
+checkout, as the API does) and reports checkouts per second and latency
+percentiles. It then replays every checkout with the same idempotency key and
+asserts that no additional orders were created.
+
+SQLite serializes writers, so against the default throwaway database this
+measures little more than the write lock; point DATABASE_URL at a local
+PostgreSQL for representative numbers.
+
+Usage (from backend/):
+    python -m benchmarks.bench_checkout --users 200 --items 10 --concurrency 20
+"""
+
+import time
+import argparse
+import asyncio
+from benchmarks.common import setup_environment, percentile
+
+setup_environment("bench_checkout.sqlite3")
+
+from sqlalchemy import insert, select, func
+from app.database import engine, async_engine, AsyncSessionLocal
+from app.models import Base, User, Service, Cart, Order, OrderItem
+from app.controllers.order_controller import checkout
+from app.validators.order_validator import CheckoutSchema
+
+SERVICES = 50
+
+def seed(users: int, items: int):
+    """Create the schema, the users, a catalog and a full cart per user."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Service), [
+            {"name": f"Service {i}", "base_price": round(1.5 + i * 0.75, 2), "category": "bench"}
+            for i in range(SERVICES)
+        ])
+        conn.execute(insert(User), [
+            {"name": f"User {i}", "email": f"user{i}@example.com", "password_hash": "x"}
+            for i in range(users)
+        ])
+        conn.execute(insert(Cart), [
+            {"user_id": user_id, "service_id": (user_id + i) % SERVICES + 1, "quantity": i % 3 + 1}
+            for user_id in range(1, users + 1)
+            for i in range(min(items, SERVICES))
+        ])
+
+async def run_checkouts(users: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    created = 0
+
+    async def one(user_id: int):
+        nonlocal created
+        async with semaphore:
+            start = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                _, is_new = await checkout(db, user_id, CheckoutSchema(), idempotency_key=f"bench-{user_id}")
+            latencies.append((time.perf_counter() - start) * 1000)
+            created += is_new
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(user_id) for user_id in range(1, users + 1)))
+    elapsed = time.perf_counter() - start
+    return {"elapsed": elapsed, "latencies": latencies, "created": created}
+
+def report(label: str, result: dict):
+    latencies = result["latencies"]
+    print(
+        f"{label:<8} {len(latencies) / result['elapsed']:>9.1f}/s "
+        f"p50 {percentile(latencies, 50):>7.2f} ms  p95 {percentile(latencies, 95):>7.2f} ms  "
+        f"p99 {percentile(latencies, 99):>7.2f} ms  new orders {result['created']}"
+    )
+
+async def count(model) -> int:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+async def main(args):
+    seed(args.users, args.items)
+    print(f"{args.users} checkouts of {min(args.items, SERVICES)} items, concurrency {args.concurrency}")
+    first = await run_checkouts(args.users, args.concurrency)
+    report("checkout", first)
+    replay = await run_checkouts(args.users, args.concurrency)
+    report("replay", replay)
+
+    orders, order_items, cart_rows = await count(Order), await count(OrderItem), await count(Cart)
+    assert first["created"] == args.users, "every cart should produce one order"
+    assert replay["created"] == 0 and orders == args.users, "replays must not create orders"
+    assert order_items == args.users * min(args.items, SERVICES) and cart_rows == 0
+    print(f"orders {orders}, order items {order_items}, cart rows left {cart_rows}")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200, help="Users (one checkout each)")
+    parser.add_argument("--items", type=int, default=10, help="Cart items per user")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent checkouts")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,124 @@
+# benchmarks/bench_json_responses.py
+"""
+JSON response path benchmark.
+
+Seeds a large catalog and one user with a large cart, then measures:
+
+- GET /cart/ through the regular path (ORM objects validated by
+  CartResponseSchema, stdlib JSON) and through the FAST_JSON_RESPONSES path
+  (column tuples encoded by orjson, no response_model validation);
+- GET /services/ with a cold catalog cache (invalidated before every request)
+  with the stdlib encoder and with orjson;
+- the catalog loader itself: ORM objects + service_to_dict (the previous
+  implementation) against plain column tuples.
+
+Both /cart/ paths are checked to return the same JSON document.
+
+Usage (from backend/):
+    python -m benchmarks.bench_json_responses --services 5000 --cart 2000
+"""
+
+import json
+import time
+import argparse
+import asyncio
+import statistics
+from benchmarks.common import setup_environment
+
+setup_environment("bench_json_responses.sqlite3")
+
+import httpx
+from sqlalchemy import insert, select
+from app.database import engine, async_engine, AsyncSessionLocal
+from app.models import Base, User, Service, Cart
+from app.main import app
+from app.routes import cart_routes
+from app.utils import fast_json
+from app.utils.jwt_utils import create_access_token
+from app.controllers.service_controller import catalog_cache, get_all_services, service_to_dict
+
+def seed(services: int, cart: int):
+    """Create the schema, a catalog and one user whose cart holds `cart` services."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"name": "Bench", "email": "bench@example.com", "password_hash": "x"}])
+        conn.execute(insert(Service), [
+            {
+                "name": f"Service {i:06d}",
+                "description": "Synthetic benchmark service with a realistic description length",
+                "base_price": round(1 + i * 0.37, 2),
+                "category": "bench",
+                "image_url": f"/images/{i}.png",
+            }
+            for i in range(services)
+        ])
+        conn.execute(insert(Cart), [
+            {"user_id": 1, "service_id": i + 1, "quantity": i % 4 + 1, "custom_instructions": "Gentle wash"}
+            for i in range(min(cart, services))
+        ])
+
+def set_fast_json(enabled: bool):
+    """Switch the fast path on or off at runtime (normally fixed by FAST_JSON_RESPONSES)."""
+    fast_json.FAST_JSON = enabled
+    cart_routes.FAST_JSON = enabled
+
+async def measure(client, path: str, headers: dict, repeats: int, cold: bool = False):
+    samples = []
+    body = None
+    for _ in range(repeats):
+        if cold:
+            await catalog_cache.invalidate()
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+        body = response.content
+    return statistics.median(samples), body
+
+async def measure_loader(load, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        await catalog_cache.invalidate()
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await load(db)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+async def legacy_catalog_loader(db):
+    """The previous catalog loader: hydrate ORM objects, then copy them into dicts."""
+    result = await db.execute(select(Service))
+    return [service_to_dict(service) for service in result.scalars().all()]
+
+async def main(args):
+    seed(args.services, args.cart)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    print(f"{args.services} services, cart of {min(args.cart, args.services)} items, median of {args.repeats} runs (ms)")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {}
+        for enabled in (False, True):
+            set_fast_json(enabled)
+            results[enabled] = (
+                await measure(client, "/cart/", headers, args.repeats),
+                await measure(client, "/services/", headers, args.repeats, cold=True),
+            )
+        (cart_std, cart_std_body), (services_std, _) = results[False]
+        (cart_fast, cart_fast_body), (services_fast, _) = results[True]
+        assert json.loads(cart_std_body) == json.loads(cart_fast_body), "fast /cart/ body differs"
+        print(f"{'endpoint':<28} {'standard':>9} {'fast':>9} {'speedup':>8}")
+        print(f"{'GET /cart/':<28} {cart_std:>9.2f} {cart_fast:>9.2f} {cart_std / cart_fast:>7.1f}x")
+        print(f"{'GET /services/ (cold cache)':<28} {services_std:>9.2f} {services_fast:>9.2f} {services_std / services_fast:>7.1f}x")
+
+    legacy = await measure_loader(legacy_catalog_loader, args.repeats)
+    tuples = await measure_loader(get_all_services, args.repeats)
+    print(f"{'catalog loader (ORM/tuples)':<28} {legacy:>9.2f} {tuples:>9.2f} {legacy / tuples:>7.1f}x")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", type=int, default=5000, help="Services to seed")
+    parser.add_argument("--cart", type=int, default=2000, help="Cart items for the benchmark user")
+    parser.add_argument("--repeats", type=int, default=20, help="Runs per measurement")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+# benchmarks/bench_jwt_asgi.py
+"""
+BaseHTTPMiddleware vs pure ASGI JWT middleware benchmark.
+
+Reports latency percentiles of GET /services/ and GET /cart/ (real routers,
+seeded SQLite stand-in) behind the previous BaseHTTPMiddleware implementation
+and behind the current pure ASGI JWTMiddleware.
+
+Usage (from backend/):
+    python -m benchmarks.bench_jwt_asgi --clients 20 --requests 2000
+"""
+
+import argparse
+import asyncio
+from benchmarks.common import setup_environment, run_load, print_result
+
+setup_environment("bench_jwt_asgi.sqlite3")
+
+from fastapi import FastAPI, Request, HTTPException
+from jose import JWTError
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.database import engine, async_engine, SessionLocal
+from app.middleware.jwt_middleware import JWTMiddleware, excluded_paths
+from app.models import Base, User, Service, Cart
+from app.routes.service_routes import router as service_router
+from app.routes.cart_routes import router as cart_router
+from app.utils.jwt_utils import create_access_token, decode_access_token
+
+class LegacyJWTMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware-based implementation, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method == "OPTIONS" or excluded_paths.matches(request.url.path):
+            return await call_next(request)
+        token = request.headers.get("Authorization")
+        if token is None or not token.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Token missing or invalid format")
+        try:
+            payload = decode_access_token(token[len("Bearer "):])
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        request.state.user = payload["sub"]
+        return await call_next(request)
+
+def build_app(middleware_class) -> FastAPI:
+    bench_app = FastAPI()
+    bench_app.include_router(service_router)
+    bench_app.include_router(cart_router)
+    bench_app.add_middleware(middleware_class)
+    return bench_app
+
+def seed(services: int, cart_items: int) -> int:
+    """Create the schema, a user, services and cart items; return the user id."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(name="Bench", email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.add_all(
+        Service(name=f"Service {i}", description="Benchmark service", base_price=5.0 + i,
+                category="wash", image_url=f"/images/{i}.png")
+        for i in range(services)
+    )
+    db.flush()
+    db.add_all(Cart(user_id=user.id, service_id=1 + i % services, quantity=1) for i in range(cart_items))
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+async def main(args):
+    user_id = seed(args.services, args.cart_items)
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id)})}"}
+    apps = (("BaseHTTPMiddleware", build_app(LegacyJWTMiddleware)), ("pure ASGI", build_app(JWTMiddleware)))
+    for path in ("/services/", "/cart/"):
+        print(f"GET {path} ({args.clients} concurrent clients)")
+        for label, app in apps:
+            await run_load(app, "GET", path, args.clients, args.warmup, headers=headers)
+            print_result(f"  {label}", await run_load(app, "GET", path, args.clients, args.requests, headers=headers))
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=100, help="Warm-up requests per scenario")
+    parser.add_argument("--services", type=int, default=20, help="Services to seed")
+    parser.add_argument("--cart-items", type=int, default=10, help="Cart items to seed")
+    asyncio.run(main(parser.parse_args()))
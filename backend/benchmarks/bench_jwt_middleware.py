@@ -0,0 +1,71 @@
+# benchmarks/bench_jwt_middleware.py
+"""
+JWT middleware micro-benchmark.
+
+Measures the per-request overhead JWTMiddleware adds on top of a trivial
+endpoint, for an excluded path, a cached token (hit) and a token that must be
+verified again (miss). ASGI apps are invoked directly so that no HTTP client
+cost is included.
+
+Usage (from backend/):
+    python -m benchmarks.bench_jwt_middleware --iterations 20000
+"""
+
+import argparse
+import asyncio
+import statistics
+from benchmarks.common import setup_environment, percentile, time_asgi
+
+setup_environment("bench_jwt_middleware.sqlite3")
+
+from fastapi import FastAPI
+from app.middleware.jwt_middleware import JWTMiddleware
+from app.utils.jwt_utils import create_access_token, token_cache
+
+def build_app(with_middleware: bool) -> FastAPI:
+    """Build a minimal app with a protected endpoint and an excluded one."""
+    bench_app = FastAPI()
+
+    @bench_app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @bench_app.get("/auth/login")
+    async def login():
+        return {"ok": True}
+
+    if with_middleware:
+        bench_app.add_middleware(JWTMiddleware)
+    return bench_app
+
+def report(label: str, samples: list, baseline: float = None):
+    median = statistics.median(samples)
+    overhead = f"  overhead {median - baseline:>7.1f} us" if baseline is not None else ""
+    print(f"{label:<28} p50 {median:>7.1f} us  p99 {percentile(samples, 99):>7.1f} us{overhead}")
+    return median
+
+async def main(args):
+    token = create_access_token(data={"sub": "1"})
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    plain_app = build_app(with_middleware=False)
+    jwt_app = build_app(with_middleware=True)
+
+    for app in (plain_app, jwt_app):
+        await time_asgi(app, "GET", "/ping", args.warmup, headers)
+
+    baseline = report("no middleware", await time_asgi(plain_app, "GET", "/ping", args.iterations, headers))
+    report("excluded path", await time_asgi(jwt_app, "GET", "/auth/login", args.iterations), baseline)
+    token_cache.clear()
+    report("token cache hit", await time_asgi(jwt_app, "GET", "/ping", args.iterations, headers), baseline)
+    report(
+        "token cache miss",
+        await time_asgi(jwt_app, "GET", "/ping", args.iterations, headers, before_each=token_cache.clear),
+        baseline,
+    )
+    print(f"cache hits={token_cache.hits} misses={token_cache.misses}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=500, help="Warm-up requests per app")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,111 @@
+# benchmarks/bench_order_history.py
+"""
+Order history benchmark and query-count check.
+
+Seeds one user with many orders (each with several items, a payment and a
+delivery), then walks the whole history through list_orders at several page
+sizes and loads single orders with get_order. For every call it counts the
+SQL statements issued (with the same engine hooks that feed /metrics) and
+asserts that the count is the same for every page and every order, no matter
+how many orders or items are loaded. It also checks that the pages cover every
+order exactly once.
+
+Usage (from backend/):
+    python -m benchmarks.bench_order_history --orders 2000 --items 5
+"""
+
+import time
+import argparse
+import asyncio
+import statistics
+from benchmarks.common import setup_environment
+
+setup_environment("bench_order_history.sqlite3")
+
+from sqlalchemy import insert
+from app.database import engine, async_engine, AsyncSessionLocal
+from app.models import Base, User, Service, Order, OrderItem, Payment, Delivery
+from app.controllers.order_controller import list_orders, get_order
+from app.utils.metrics import RequestStats, current_request_stats
+from app.validators.order_validator import OrderListQuery
+
+LIST_QUERIES = 2    # orders + payment + delivery joined, then items (IN)
+DETAIL_QUERIES = 3  # order + payment + delivery joined, items + services (IN), reviews (IN)
+
+def seed(orders: int, items: int):
+    """Create the schema and one user with orders sharing creation timestamps."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"name": "Bench", "email": "bench@example.com", "password_hash": "x"}])
+        conn.execute(insert(Service), [{"name": f"Service {i}", "base_price": 2.5 + i, "category": "bench"} for i in range(items)])
+        # created_at comes from the server default, so many orders share a timestamp
+        # and the id tie-breaker is exercised.
+        conn.execute(insert(Order), [{"user_id": 1, "status": "Placed", "total_price": 10.0} for _ in range(orders)])
+        conn.execute(insert(OrderItem), [
+            {"order_id": order_id, "service_id": i + 1, "quantity": 1, "price": 2.5 + i}
+            for order_id in range(1, orders + 1)
+            for i in range(items)
+        ])
+        conn.execute(insert(Payment), [
+            {"order_id": order_id, "user_id": 1, "amount": 10.0, "method": "COD"} for order_id in range(1, orders + 1)
+        ])
+        conn.execute(insert(Delivery), [{"order_id": order_id} for order_id in range(1, orders + 1)])
+
+async def counted(coro):
+    """Run a coroutine and return (result, statements issued, elapsed ms)."""
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        result = await coro
+    finally:
+        current_request_stats.reset(token)
+    return result, stats.queries, (time.perf_counter() - start) * 1000
+
+async def walk_history(limit: int, expected_orders: int):
+    seen = []
+    query_counts = set()
+    timings = []
+    cursor = None
+    async with AsyncSessionLocal() as db:
+        while True:
+            page, queries, elapsed = await counted(list_orders(db, 1, OrderListQuery(limit=limit, cursor=cursor)))
+            seen.extend(order.id for order in page["items"])
+            query_counts.add(queries)
+            timings.append(elapsed)
+            db.expunge_all()
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+    assert sorted(seen) == list(range(1, expected_orders + 1)), "pages must cover every order exactly once"
+    assert query_counts == {LIST_QUERIES}, f"list queries per page varied: {sorted(query_counts)}"
+    return len(timings), statistics.median(timings)
+
+async def main(args):
+    seed(args.orders, args.items)
+    print(f"{args.orders} orders x {args.items} items")
+    print(f"{'limit':>6} {'pages':>6} {'queries/page':>13} {'median ms':>10}")
+    for limit in args.limits:
+        pages, median = await walk_history(limit, args.orders)
+        print(f"{limit:>6} {pages:>6} {LIST_QUERIES:>13} {median:>10.2f}")
+
+    query_counts = set()
+    timings = []
+    async with AsyncSessionLocal() as db:
+        for order_id in range(1, args.orders + 1, max(1, args.orders // 50)):
+            order, queries, elapsed = await counted(get_order(db, 1, order_id))
+            assert len(order.order_items) == args.items and all(item.service for item in order.order_items)
+            query_counts.add(queries)
+            timings.append(elapsed)
+            db.expunge_all()
+    assert query_counts == {DETAIL_QUERIES}, f"detail queries varied: {sorted(query_counts)}"
+    print(f"detail: {DETAIL_QUERIES} queries per order, median {statistics.median(timings):.2f} ms")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2000, help="Orders to seed")
+    parser.add_argument("--items", type=int, default=5, help="Items per order")
+    parser.add_argument("--limits", type=int, nargs="+", default=[10, 20, 100], help="Page sizes to walk")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,183 @@
+# benchmarks/bench_read_replicas.py
+"""
+Read replica routing benchmark.
+
+Runs the app against two SQLite files, a primary and a "replica" that only
+changes when the script copies the primary into it (SQLite's backup API), so
+replication lag is whatever the script makes it. Set DATABASE_URL and
+DATABASE_REPLICA_URLS to run against a real PostgreSQL primary and streaming
+replica instead; the staleness checks are then skipped, since replication is
+not under the script's control.
+
+It checks, counting the statements each engine executes:
+
+- GET requests read from the replica, writes and non-GET requests use the primary;
+- read-your-writes: right after adding a cart item, the user's GET /cart/
+  reads from the primary and sees it, while the replica has not caught up;
+  once REPLICA_STICKY_SECONDS pass, their reads go back to the replica;
+- lag: a replica reporting more than REPLICA_MAX_LAG_SECONDS is skipped;
+- failure: with the replica unreachable, the very next GET still succeeds
+  from the primary, and the replica serves again after a successful check;
+
+and reports GET /cart/ throughput with reads on the replica and on the primary.
+
+Usage (from backend/):
+    python -m benchmarks.bench_read_replicas --requests 2000
+"""
+
+import os
+import shutil
+import sqlite3
+import argparse
+import asyncio
+import tempfile
+from benchmarks.common import setup_environment, run_load, print_result
+
+PRIMARY_URL = setup_environment("bench_read_replicas.sqlite3")
+REPLICA_DIR = os.path.join(tempfile.gettempdir(), "bench_read_replicas")
+REPLICA_PATH = os.path.join(REPLICA_DIR, "replica.sqlite3")
+LOCAL_REPLICA = "DATABASE_REPLICA_URLS" not in os.environ
+if LOCAL_REPLICA:
+    shutil.rmtree(REPLICA_DIR, ignore_errors=True)
+    os.makedirs(REPLICA_DIR)
+    os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{REPLICA_PATH}"
+os.environ.setdefault("REPLICA_STICKY_SECONDS", "0.5")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("QUERY_BUDGET_MODE", "off")
+
+import httpx
+from sqlalchemy import event, update
+from sqlalchemy.engine import make_url
+from app.database import engine, get_async_engine, get_replica_engines, AsyncSessionLocal
+from app.models import Base
+from app.models.user import User
+from app.main import app
+from app.utils.replicas import replica_router
+from app.config import REPLICA_STICKY_SECONDS, REPLICA_MAX_LAG_SECONDS
+
+PASSWORD = "secret123"
+
+class StatementCounter:
+    """Counts statements per engine: primary or replica."""
+
+    def __init__(self):
+        self.counts = {"primary": 0, "replica": 0}
+        for name, target in (("primary", get_async_engine()), ("replica", get_replica_engines()["replica0"])):
+            event.listen(target.sync_engine, "after_cursor_execute", self._listener(name))
+
+    def _listener(self, name):
+        def count(*args):
+            self.counts[name] += 1
+        return count
+
+    def snapshot(self) -> dict:
+        return dict(self.counts)
+
+    def since(self, before: dict) -> dict:
+        return {name: self.counts[name] - before[name] for name in self.counts}
+
+def replicate():
+    """Bring the local replica up to date with the primary."""
+    with sqlite3.connect(make_url(PRIMARY_URL).database) as source, sqlite3.connect(REPLICA_PATH) as target:
+        source.backup(target)
+
+async def login(client, email: str, admin: bool = False) -> dict:
+    if admin:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(User).where(User.email == email).values(role="admin"))
+            await db.commit()
+    response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def routed(client, counter, method: str, path: str, headers: dict, json=None):
+    """Send a request; return (response, engine that served its statements)."""
+    before = counter.snapshot()
+    response = await client.request(method, path, headers=headers, json=json)
+    assert response.status_code == 200, f"{method} {path}: {response.status_code} {response.text}"
+    used = [name for name, count in counter.since(before).items() if count]
+    assert len(used) == 1, f"{method} {path} used {used}"
+    return response, used[0]
+
+async def check_routing(client, counter, alice: dict, bob: dict, service_id: int):
+    _, target = await routed(client, counter, "GET", "/cart/", bob)
+    assert target == "replica", "GET should read from the replica"
+    _, target = await routed(client, counter, "POST", "/cart/", alice, json={"service_id": service_id, "quantity": 1})
+    assert target == "primary", "writes must use the primary"
+
+    # Read-your-writes: the replica has not seen the item yet.
+    response, target = await routed(client, counter, "GET", "/cart/", alice)
+    assert target == "primary" and len(response.json()) == 1, "a writer's next read must see the write"
+    _, target = await routed(client, counter, "GET", "/cart/", bob)
+    assert target == "replica", "other users keep reading from the replica"
+    print(f"read-your-writes: the writer reads from the primary for {REPLICA_STICKY_SECONDS}s")
+
+    await asyncio.sleep(REPLICA_STICKY_SECONDS)
+    response, target = await routed(client, counter, "GET", "/cart/", alice)
+    assert target == "replica"
+    if LOCAL_REPLICA:
+        assert response.json() == [], "the local replica is stale until replicated"
+        replicate()
+        response, _ = await routed(client, counter, "GET", "/cart/", alice)
+        assert len(response.json()) == 1
+    print("after the sticky window the writer reads from the replica again")
+
+    replica_router.record("replica0", healthy=True, lag=REPLICA_MAX_LAG_SECONDS + 1)
+    _, target = await routed(client, counter, "GET", "/cart/", bob)
+    assert target == "primary", "a lagging replica must be skipped"
+    replica_router.record("replica0", healthy=True, lag=0.0)
+    _, target = await routed(client, counter, "GET", "/cart/", bob)
+    assert target == "replica"
+    print(f"a replica lagging more than {REPLICA_MAX_LAG_SECONDS}s is skipped")
+
+async def check_failover(client, counter, bob: dict):
+    # Make the replica unreachable: close its pooled connections and hide its file.
+    await get_replica_engines()["replica0"].dispose()
+    os.rename(REPLICA_DIR, REPLICA_DIR + ".down")
+    try:
+        _, target = await routed(client, counter, "GET", "/cart/", bob)
+        assert target == "primary", "a request must fall back when its replica is down"
+        assert not replica_router.usable(replica_router.replicas[0])
+        await replica_router.check()
+        _, target = await routed(client, counter, "GET", "/cart/", bob)
+        assert target == "primary"
+    finally:
+        os.rename(REPLICA_DIR + ".down", REPLICA_DIR)
+    await replica_router.check()
+    _, target = await routed(client, counter, "GET", "/cart/", bob)
+    assert target == "replica", "the replica must serve again once it passes a check"
+    print("an unreachable replica fails over to the primary and is used again once it recovers")
+
+async def main(args):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in ("admin", "alice", "bob"):
+            await client.post("/auth/signup", json={"name": name.title(), "email": f"{name}@example.com", "password": PASSWORD})
+        admin = await login(client, "admin@example.com", admin=True)
+        alice = await login(client, "alice@example.com")
+        bob = await login(client, "bob@example.com")
+        service_id = (await client.post("/services/", headers=admin, json={"name": "Wash", "base_price": 10.0})).json()["id"]
+        await client.post("/cart/", headers=bob, json={"service_id": service_id, "quantity": 2})
+        if LOCAL_REPLICA:
+            replicate()
+        await asyncio.sleep(REPLICA_STICKY_SECONDS)  # Let the setup writes' stickiness expire.
+
+        async with app.router.lifespan_context(app):
+            counter = StatementCounter()
+            await check_routing(client, counter, alice, bob, service_id)
+            if LOCAL_REPLICA:
+                await check_failover(client, counter, bob)
+
+            before = counter.snapshot()
+            print_result("GET /cart/ (replica)", await run_load(app, "GET", "/cart/", args.clients, args.requests, headers=bob))
+            assert counter.since(before)["primary"] == 0
+            await replica_router.stop()  # No replicas: every read goes to the primary.
+            print_result("GET /cart/ (primary)", await run_load(app, "GET", "/cart/", args.clients, args.requests, headers=bob))
+    shutil.rmtree(REPLICA_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per load run")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent clients per load run")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+# benchmarks/bench_service_pagination.py
+"""
+Service catalog pagination benchmark.
+
+Seeds a synthetic catalog (100k services by default) and reports the latency
+of fetching one page at increasing depths with the keyset cursor used by
+GET /services/, next to the equivalent LIMIT/OFFSET query for contrast.
+Keyset pages should stay flat as depth grows; OFFSET pages grow linearly.
+
+Usage (from backend/):
+    python -m benchmarks.bench_service_pagination --services 100000 --limit 50
+"""
+
+import time
+import argparse
+import asyncio
+import statistics
+from benchmarks.common import setup_environment
+
+setup_environment("bench_service_pagination.sqlite3")
+
+from sqlalchemy import insert, select
+from app.database import engine, async_engine, AsyncSessionLocal
+from app.models import Base, Service
+from app.controllers.service_controller import query_services_page, SORT_COLUMNS
+from app.utils.helpers import encode_cursor
+from app.validators.service_validator import ServiceListQuery
+
+CATEGORIES = ("wash and fold", "dry clean", "ironing", "shoes", "curtains")
+
+def seed(count: int):
+    """Create the schema and bulk-insert count synthetic services."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rows = [
+        {
+            "name": f"Service {i:06d}",
+            "description": "Synthetic benchmark service",
+            "base_price": round(1 + (i * 7919) % 50000 / 100, 2),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "image_url": f"/images/{i}.png",
+        }
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        for start in range(0, count, 10000):
+            conn.execute(insert(Service), rows[start:start + 10000])
+
+async def cursor_at(db, sort: str, depth: int) -> str:
+    """Build the cursor a client would hold after reading `depth` rows."""
+    column = SORT_COLUMNS[sort]
+    ordering = [column] if sort == "id" else [column, Service.id]
+    result = await db.execute(select(Service).order_by(*ordering).offset(depth - 1).limit(1))
+    row = result.scalars().first()
+    return encode_cursor({"sort": sort, "order": "asc", "value": getattr(row, sort), "id": row.id})
+
+async def measure(func, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+async def main(args):
+    seed(args.services)
+    depths = [d for d in (1, 1000, 10000, 50000, args.services - args.limit) if 0 < d <= args.services - args.limit]
+    print(f"{args.services} services, page size {args.limit}, median of {args.repeats} runs (ms)")
+    print(f"{'sort':<11} {'depth':>7} {'keyset':>9} {'offset':>9}")
+    async with AsyncSessionLocal() as db:
+        for sort in ("id", "name", "base_price"):
+            column = SORT_COLUMNS[sort]
+            ordering = [column] if sort == "id" else [column, Service.id]
+            for depth in depths:
+                query = ServiceListQuery(limit=args.limit, sort=sort)
+                if depth > 1:
+                    query = ServiceListQuery(limit=args.limit, sort=sort, cursor=await cursor_at(db, sort, depth))
+
+                async def keyset():
+                    await query_services_page(db, query)
+
+                async def offset():
+                    result = await db.execute(select(Service).order_by(*ordering).offset(depth).limit(args.limit))
+                    result.scalars().all()
+
+                print(f"{sort:<11} {depth:>7} {await measure(keyset, args.repeats):>9.2f} {await measure(offset, args.repeats):>9.2f}")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", type=int, default=100000, help="Services to seed")
+    parser.add_argument("--limit", type=int, default=50, help="Page size")
+    parser.add_argument("--repeats", type=int, default=20, help="Runs per measurement")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,220 @@
+# benchmarks/bench_service_search.py
+"""
+Service search and autocomplete benchmark.
+
+Fills the catalog with a synthetic set of services (100k by default) and
+checks:
+
+- autocomplete: the trie's suggestions equal a brute-force scan of every
+  name for a sample of typed texts, and completing a single word takes
+  under a millisecond at p99 (texts of several words are timed too; they
+  intersect the sets of names having each word, so cost more, and the
+  synthetic names reuse a small vocabulary);
+- incremental updates: a service created, renamed or deleted through the API
+  is suggested (or no longer suggested) by the very next autocomplete, and a
+  write made while the index is being rebuilt survives the rebuild;
+- search: name matches rank above category and description matches, each
+  word must match, and the endpoint issues at most one query
+  (autocomplete none, once its index is loaded);
+
+and reports the index build time plus autocomplete and search latency
+through the API. SQLite has no full-text index, so search latency there is
+a table scan; set DATABASE_URL to a PostgreSQL database to measure the
+indexed path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_service_search --services 100000
+"""
+
+import os
+import time
+import random
+import argparse
+import asyncio
+from benchmarks.common import setup_environment, run_load, print_result, percentile
+
+setup_environment("bench_service_search.sqlite3")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ["QUERY_BUDGET_MODE"] = "off"  # Counted here with track_queries instead.
+
+import httpx
+from sqlalchemy import insert, update
+from app.database import engine, async_engine, AsyncSessionLocal
+from app.models import Base
+from app.models.user import User
+from app.models.service import Service
+from app.main import app
+from app.utils.query_budget import track_queries
+from app.utils.search_index import autocomplete_index, build_trie, tokenize
+from app.config import AUTOCOMPLETE_MAX_LIMIT
+
+PASSWORD = "secret123"
+FABRICS = ["cotton", "silk", "wool", "linen", "denim", "leather", "velvet", "cashmere", "satin", "suede"]
+ITEMS = ["shirt", "trousers", "dress", "suit", "jacket", "curtain", "duvet", "blanket", "saree", "coat", "sweater", "rug"]
+TREATMENTS = ["wash", "dry clean", "steam press", "stain removal", "express ironing", "repair", "starch", "deep clean"]
+CATEGORIES = ["wash and fold", "dry clean", "ironing", "repairs", "specialty"]
+
+def synthetic_services(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        fabric, item, treatment = rng.choice(FABRICS), rng.choice(ITEMS), rng.choice(TREATMENTS)
+        rows.append({
+            "name": f"{fabric.title()} {item} {treatment} {i}",
+            "description": f"{treatment.capitalize()} for {fabric} {item}s, returned within {rng.randint(1, 5)} days.",
+            "base_price": round(rng.uniform(2, 80), 2),
+            "category": rng.choice(CATEGORIES),
+        })
+    return rows
+
+def seed_catalog(count: int):
+    rows = synthetic_services(count)
+    with engine.begin() as connection:
+        for start in range(0, len(rows), 10000):
+            connection.execute(insert(Service), rows[start:start + 10000])
+
+def brute_force_suggest(names: dict, text: str, limit: int) -> list:
+    """The suggestions the trie should give, by scanning every name."""
+    *whole, prefix = tokenize(text)
+    matches = []
+    for service_id, name in names.items():
+        words = set(tokenize(name))
+        if all(word in words for word in whole) and any(word.startswith(prefix) for word in words):
+            matches.append(((len(name), name.lower(), service_id), service_id))
+    return [service_id for _, service_id in sorted(matches)[:limit]]
+
+def typed_prefixes(names: dict, count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    texts = []
+    for name in rng.sample(list(names.values()), count):
+        words = tokenize(name)
+        cut = rng.randint(0, len(words) - 1)
+        last = words[cut][:rng.randint(1, len(words[cut]))]
+        texts.append(" ".join(words[:cut] + [last]))
+    return texts
+
+def check_trie(names: dict, samples: int):
+    start = time.perf_counter()
+    trie = build_trie(names.items(), AUTOCOMPLETE_MAX_LIMIT)
+    print(f"trie build: {len(names)} names in {time.perf_counter() - start:.2f}s")
+
+    texts = typed_prefixes(names, samples) + ["s", "co", "zz", "dry cl", "silk shirt st"]
+    for text in texts:
+        got = [suggestion["id"] for suggestion in trie.suggest(text, AUTOCOMPLETE_MAX_LIMIT)]
+        assert got == brute_force_suggest(names, text, AUTOCOMPLETE_MAX_LIMIT), f"suggestions for {text!r} differ"
+    print(f"trie suggestions match a full scan for {len(texts)} typed texts")
+
+    # Removing names invalidates the kept entries of every prefix they had.
+    rng = random.Random(3)
+    for service_id in rng.sample(list(names), 500):
+        trie.remove(service_id)
+        del names[service_id]
+    for text in texts:
+        got = [suggestion["id"] for suggestion in trie.suggest(text, AUTOCOMPLETE_MAX_LIMIT)]
+        assert got == brute_force_suggest(names, text, AUTOCOMPLETE_MAX_LIMIT), f"suggestions for {text!r} differ after removals"
+    print("trie suggestions still match after 500 removals")
+
+    # Single words are answered from the kept entries of one node; several
+    # words intersect the sets of names having them, so they cost more the
+    # more common the words are.
+    for label, group in (("one word", [t for t in texts if " " not in t]), ("several words", [t for t in texts if " " in t])):
+        timings = []
+        for text in group * 20:
+            start = time.perf_counter()
+            trie.suggest(text, AUTOCOMPLETE_MAX_LIMIT)
+            timings.append((time.perf_counter() - start) * 1e6)
+        p50, p99 = percentile(timings, 50), percentile(timings, 99)
+        print(f"suggest lookups, {label}: p50 {p50:.1f}us, p99 {p99:.1f}us")
+        if label == "one word":
+            assert p99 < 1000, f"p99 lookup of {p99:.0f}us is not sub-millisecond"
+
+async def login(client, email: str, admin: bool = False) -> dict:
+    if admin:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(User).where(User.email == email).values(role="admin"))
+            await db.commit()
+    response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def get(client, path: str, headers: dict, max_queries: int) -> list:
+    with track_queries() as log:
+        response = await client.get(path, headers=headers)
+    assert response.status_code == 200, f"{path}: {response.status_code} {response.text}"
+    assert log.queries <= max_queries, f"{path}: {log.queries} queries, expected at most {max_queries}"
+    return response.json()
+
+async def suggested(client, text: str, headers: dict) -> list:
+    return [item["name"] for item in await get(client, f"/services/autocomplete?q={text}", headers, 0)]
+
+async def check_api(client, admin: dict, user: dict):
+    created = []
+    for service in (
+        {"name": "Quokka Wash", "base_price": 5.0, "category": "wash and fold"},
+        {"name": "Leather Care", "base_price": 9.0, "category": "quokka specialty"},
+        {"name": "Gentle Care", "base_price": 7.0, "description": "Hand wash for quokka plush toys."},
+    ):
+        created.append((await client.post("/services/", headers=admin, json=service)).json())
+
+    results = await get(client, "/services/search?q=quokka", user, 1)
+    assert [item["name"] for item in results] == ["Quokka Wash", "Leather Care", "Gentle Care"], results
+    results = await get(client, "/services/search?q=quokka%20pl", user, 1)
+    assert [item["name"] for item in results] == ["Gentle Care"], "every word must match, the last as a prefix"
+    print("search ranks name matches above category and description matches")
+
+    await get(client, "/services/autocomplete?q=q", user, 1)  # Builds the index if not yet loaded.
+    assert await suggested(client, "quok", user) == ["Quokka Wash"]
+    await client.put(f"/services/{created[0]['id']}", headers=admin, json={"name": "Wombat Wash"})
+    assert await suggested(client, "quok", user) == []
+    assert await suggested(client, "wombat w", user) == ["Wombat Wash"]
+    await client.delete(f"/services/{created[0]['id']}", headers=admin)
+    assert await suggested(client, "wombat", user) == []
+    print("create, rename and delete show in the next autocomplete")
+
+    # A write landing while a rebuild is loading is replayed onto the new index.
+    async with AsyncSessionLocal() as db:
+        rebuild = asyncio.create_task(autocomplete_index.load(db))
+        while autocomplete_index._pending is None:
+            await asyncio.sleep(0)
+        await client.post("/services/", headers=admin, json={"name": "Platypus Press", "base_price": 4.0})
+        await rebuild
+    assert await suggested(client, "platypus", user) == ["Platypus Press"]
+    print("a write made during a rebuild survives it")
+
+async def main(args):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    seed_catalog(args.services)
+    print(f"seeded {args.services} services in {time.perf_counter() - start:.1f}s")
+
+    with engine.connect() as connection:
+        names = dict(connection.execute(Service.__table__.select().with_only_columns(Service.id, Service.name)).all())
+    check_trie(names, args.samples)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in ("admin", "alice"):
+            await client.post("/auth/signup", json={"name": name.title(), "email": f"{name}@example.com", "password": PASSWORD})
+        admin = await login(client, "admin@example.com", admin=True)
+        alice = await login(client, "alice@example.com")
+
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await autocomplete_index.load(db)
+        print(f"index load through the app: {time.perf_counter() - start:.2f}s")
+        await check_api(client, admin, alice)
+
+        print_result("GET /services/autocomplete", await run_load(app, "GET", "/services/autocomplete?q=silk%20sh", args.clients, args.requests, headers=alice))
+        print_result("GET /services/search (cached)", await run_load(app, "GET", "/services/search?q=silk%20shirt", args.clients, args.requests, headers=alice))
+        start = time.perf_counter()
+        await get(client, "/services/search?q=velvet%20duvet%20ste", alice, 1)
+        print(f"GET /services/search (uncached): {(time.perf_counter() - start) * 1000:.1f}ms")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", type=int, default=100000, help="Synthetic catalog size")
+    parser.add_argument("--samples", type=int, default=200, help="Typed texts compared against a full scan")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per load run")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent clients per load run")
+    asyncio.run(main(parser.parse_args()))
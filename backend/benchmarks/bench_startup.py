@@ -0,0 +1,124 @@
+# benchmarks/bench_startup.py
+"""
+Startup time benchmark.
+
+Reports, in fresh interpreters:
+
+- ``python -X importtime`` totals for ``import app.main`` (which should only
+  import FastAPI and the configuration) and for building the app with
+  ``create_app()``, with the slowest top-level imports of the latter;
+- time to first request: a uvicorn worker is started with
+  ``app.main:create_app --factory`` and GET /metrics is polled until it
+  answers; this covers interpreter start, imports, app construction and the
+  lifespan startup (logging, engine creation, revocation list load).
+
+It also checks that importing app.main loads no database driver or passlib
+and creates no log directory.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --workers 5
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+from benchmarks.common import setup_environment
+
+setup_environment("bench_startup.sqlite3")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def child_env(log_dir: str) -> dict:
+    env = dict(os.environ, LOG_DIR=log_dir, LOG_PRESET="production", PYTHONDONTWRITEBYTECODE="1")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+def importtime(code: str, env: dict) -> dict:
+    """Run code under -X importtime; return {top-level module: cumulative ms}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    top_level = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):  # Depth 0: imported by the interpreter or the -c code itself.
+            top_level[name.strip()] = int(cumulative) / 1000
+    return top_level
+
+def import_cost(code: str, env: dict, baseline: set):
+    """Return (total ms, {module: ms}) of the top-level imports code adds to a bare interpreter."""
+    modules = {name: ms for name, ms in importtime(code, env).items() if name not in baseline}
+    return sum(modules.values()), modules
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def time_to_first_request(env: dict, timeout: float = 60.0) -> float:
+    """Start one uvicorn worker and return the ms until GET /metrics answers 200."""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:create_app", "--factory", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError("worker did not answer in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+def main(args):
+    # Create the schema so the revocation list loads as in production.
+    from app.database import get_engine
+    from app.models import Base
+    Base.metadata.create_all(bind=get_engine())
+    get_engine().dispose()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = os.path.join(tmp, "logs")
+        env = child_env(log_dir)
+
+        check = subprocess.run(
+            [sys.executable, "-c", "import sys, app.main; print(sorted({'passlib', 'aiosqlite', 'asyncpg', 'psycopg2'} & set(sys.modules)))"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        assert check.stdout.strip() == "[]", f"import app.main loaded {check.stdout.strip()}"
+        assert not os.path.exists(log_dir), "import app.main created the log directory"
+
+        baseline = set(importtime("pass", env))
+        import_ms, _ = import_cost("import app.main", env, baseline)
+        create_ms, modules = import_cost("from app.main import create_app; create_app()", env, baseline)
+        print("python -X importtime (cumulative ms)")
+        print(f"{'import app.main':<40} {import_ms:>9.1f}")
+        print(f"{'import app.main + create_app()':<40} {create_ms:>9.1f}")
+        for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {name:<38} {ms:>9.1f}")
+
+        samples = [time_to_first_request(env) for _ in range(args.workers)]
+        print(f"time to first request, {args.workers} workers (ms)")
+        print(f"{'per worker':<40} {' '.join(f'{ms:.0f}' for ms in samples)}")
+        print(f"{'median':<40} {statistics.median(samples):>9.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=5, help="Workers started one after another")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    main(parser.parse_args())
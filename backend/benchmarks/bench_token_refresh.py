@@ -0,0 +1,122 @@
+# benchmarks/bench_token_refresh.py
+"""
+Token refresh benchmark.
+
+Compares renewing an expired session by logging in again (one bcrypt
+verification per request) with POST /auth/refresh (one conditional UPDATE, no
+bcrypt), and times the revocation check JWTMiddleware runs on every request
+against a revocation list of the given size.
+
+Before measuring, the session lifecycle is checked end to end: rotation
+invalidates the previous refresh token, replaying it revokes the session
+(including its current access token), and logout rejects the session's access
+and refresh tokens, also from a second process that only syncs from the table.
+
+Usage (from backend/):
+    python -m benchmarks.bench_token_refresh --repeats 50 --revoked 100000
+"""
+
+import os
+import time
+import timeit
+import argparse
+import asyncio
+import statistics
+from datetime import datetime, timedelta, timezone
+from benchmarks.common import setup_environment
+
+setup_environment("bench_token_refresh.sqlite3")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # The login side would hit the per-email limit.
+
+import httpx
+from jose import jwt
+from app.database import engine, async_engine, AsyncSessionLocal
+from app.models import Base
+from app.main import app
+from app.utils.revocation import RevocationList, revocation_list
+
+USER = {"name": "Bench", "email": "bench@example.com", "password": "secret123"}
+LOGIN = {"email": USER["email"], "password": USER["password"]}
+
+async def median_ms(call, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+async def check_lifecycle(client):
+    """Assert rotation, reuse detection and logout behave as documented."""
+    tokens = (await client.post("/auth/login", json=LOGIN)).json()
+    bearer = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await client.get("/auth/profile", headers=bearer)).status_code == 200
+    assert (await client.get("/auth/profile", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})).status_code == 401
+
+    rotated = (await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})).json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    bearer = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert (await client.get("/auth/profile", headers=bearer)).status_code == 200
+
+    # Replaying the first refresh token ends the session for every holder.
+    assert (await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})).status_code == 401
+    assert (await client.get("/auth/profile", headers=bearer)).status_code == 401
+    assert (await client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]})).status_code == 401
+
+    # Logout: this process rejects at once, another one after its next sync.
+    tokens = (await client.post("/auth/login", json=LOGIN)).json()
+    bearer = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await client.post("/auth/logout", headers=bearer)).status_code == 200
+    assert (await client.get("/auth/profile", headers=bearer)).status_code == 401
+    assert (await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})).status_code == 401
+    other_worker = RevocationList()
+    async with AsyncSessionLocal() as db:
+        await other_worker.sync(db)
+    claims = jwt.get_unverified_claims(tokens["access_token"])
+    assert revocation_list.is_revoked(claims) and other_worker.is_revoked(claims)
+
+def bench_revocation_check(size: int, number: int):
+    revoked = RevocationList()
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=15)
+    for i in range(size):
+        revoked.add(f"{i:032x}", expires_at)
+    hit = {"sub": "1", "jti": f"{size // 2:032x}", "sid": "none"}
+    miss = {"sub": "1", "jti": "f" * 32, "sid": "e" * 32}
+    assert revoked.is_revoked(hit) and not revoked.is_revoked(miss)
+    for label, payload in (("revoked token", hit), ("valid token", miss)):
+        seconds = timeit.timeit(lambda: revoked.is_revoked(payload), number=number)
+        print(f"{'is_revoked, ' + label:<36} {seconds / number * 1e9:>10.0f} ns  ({size} entries)")
+
+async def main(args):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        assert (await client.post("/auth/signup", json=USER)).status_code == 200
+        await check_lifecycle(client)
+
+        state = {"refresh_token": (await client.post("/auth/login", json=LOGIN)).json()["refresh_token"]}
+
+        async def login():
+            response = await client.post("/auth/login", json=LOGIN)
+            assert response.status_code == 200, response.text
+
+        async def refresh():
+            response = await client.post("/auth/refresh", json=state)
+            assert response.status_code == 200, response.text
+            state["refresh_token"] = response.json()["refresh_token"]
+
+        login_ms = await median_ms(login, args.repeats)
+        refresh_ms = await median_ms(refresh, args.repeats)
+        print(f"median of {args.repeats} requests (ms)")
+        print(f"{'POST /auth/login (bcrypt)':<36} {login_ms:>10.2f}")
+        print(f"{'POST /auth/refresh':<36} {refresh_ms:>10.2f}  ({login_ms / refresh_ms:.0f}x faster)")
+    bench_revocation_check(args.revoked, args.number)
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=50, help="Requests per endpoint")
+    parser.add_argument("--revoked", type=int, default=100000, help="Entries in the benchmarked revocation list")
+    parser.add_argument("--number", type=int, default=1000000, help="Revocation checks timed per case")
+    asyncio.run(main(parser.parse_args()))
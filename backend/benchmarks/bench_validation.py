@@ -0,0 +1,83 @@
+# benchmarks/bench_validation.py
+"""
+Validation and serialization micro-benchmarks for the Pydantic v2 schemas.
+
+Covers:
+- UserCreateSchema: validating a parsed dict vs validating raw JSON bytes;
+- CartCreateSchema: validating a batch item by item vs in one TypeAdapter call;
+- ServiceResponseSchema: serializing ORM objects one model at a time (the
+  validate -> model_dump -> json.dumps chain FastAPI runs for response_model)
+  vs a single TypeAdapter validate_python/dump_json call (adapter_response).
+
+No database is needed; Service objects are built in memory.
+
+Usage (from backend/):
+    python -m benchmarks.bench_validation --number 2000 --batch 100 --services 1000
+"""
+
+import json
+import timeit
+import argparse
+from typing import List
+from benchmarks.common import setup_environment
+
+setup_environment("bench_validation.sqlite3")
+
+from pydantic import TypeAdapter
+from app.models import Service
+from app.validators.user_validator import UserCreateSchema
+from app.validators.cart_validator import CartCreateSchema
+from app.validators.service_validator import ServiceResponseSchema, ServiceListAdapter
+
+USER = {"name": "Jane Doe", "email": "jane@example.com", "password": "secret123", "phone": "555-0100", "address": "1 Main St"}
+CART_ITEMS = TypeAdapter(List[CartCreateSchema])
+
+def report(label: str, seconds: float, number: int, unit: str = "us"):
+    per_call = seconds / number * (1e6 if unit == "us" else 1e3)
+    print(f"{label:<52} {per_call:>10.2f} {unit}")
+
+def main(args):
+    user_json = json.dumps(USER).encode()
+    batch = [{"service_id": i + 1, "quantity": i % 5 + 1, "custom_instructions": None} for i in range(args.batch)]
+    batch_json = json.dumps(batch).encode()
+    services = [
+        Service(id=i, name=f"Service {i}", description="Synthetic", base_price=1.5 + i, category="bench", image_url=f"/img/{i}.png")
+        for i in range(args.services)
+    ]
+
+    # Sanity checks: every variant yields the same data.
+    assert UserCreateSchema.model_validate(USER) == UserCreateSchema.model_validate_json(user_json)
+    assert [CartCreateSchema.model_validate(item) for item in batch] == CART_ITEMS.validate_python(batch)
+    per_model = json.dumps([ServiceResponseSchema.model_validate(s).model_dump(mode="json") for s in services])
+    assert json.loads(per_model) == json.loads(ServiceListAdapter.dump_json(ServiceListAdapter.validate_python(services, from_attributes=True)))
+
+    n = args.number
+    print("UserCreateSchema (per call)")
+    report("  model_validate(dict)", timeit.timeit(lambda: UserCreateSchema.model_validate(USER), number=n), n)
+    report("  model_validate_json(bytes)", timeit.timeit(lambda: UserCreateSchema.model_validate_json(user_json), number=n), n)
+
+    m = max(1, n // 10)
+    print(f"CartCreateSchema x{args.batch} (per batch)")
+    report("  model_validate per item", timeit.timeit(lambda: [CartCreateSchema.model_validate(i) for i in batch], number=m), m)
+    report("  TypeAdapter.validate_python", timeit.timeit(lambda: CART_ITEMS.validate_python(batch), number=m), m)
+    report("  TypeAdapter.validate_json", timeit.timeit(lambda: CART_ITEMS.validate_json(batch_json), number=m), m)
+
+    k = max(1, n // 100)
+    print(f"ServiceResponseSchema x{args.services} from ORM objects (per list)")
+    report(
+        "  per model: validate, model_dump, json.dumps",
+        timeit.timeit(lambda: json.dumps([ServiceResponseSchema.model_validate(s).model_dump(mode="json") for s in services]), number=k),
+        k, "ms",
+    )
+    report(
+        "  TypeAdapter: validate_python + dump_json",
+        timeit.timeit(lambda: ServiceListAdapter.dump_json(ServiceListAdapter.validate_python(services, from_attributes=True)), number=k),
+        k, "ms",
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="Iterations for single-object cases")
+    parser.add_argument("--batch", type=int, default=100, help="Cart items per batch")
+    parser.add_argument("--services", type=int, default=1000, help="Services per serialized list")
+    main(parser.parse_args())
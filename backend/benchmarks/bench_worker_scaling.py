@@ -0,0 +1,168 @@
+# benchmarks/bench_worker_scaling.py
+"""
+Worker scaling benchmark.
+
+Starts the production server (``gunicorn -c gunicorn.conf.py``) with 1, 2, ...
+N workers and, for each count, drives GET /services/ (an authenticated,
+cached catalog read) from several load generator processes for a fixed time.
+Reports requests/sec and the scaling efficiency relative to one worker
+(rps / (workers * rps of 1 worker)). Throughput can only scale while there
+are idle CPUs left for the workers and the load generators, so run it on a
+machine with more cores than --max-workers.
+
+It also checks graceful draining: a login request (one bcrypt verification)
+is in flight when the server receives SIGTERM, and must still complete.
+
+Usage (from backend/):
+    python -m benchmarks.bench_worker_scaling --max-workers 4 --duration 5
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import argparse
+import asyncio
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.request
+import multiprocessing
+from benchmarks.common import setup_environment
+
+setup_environment("bench_worker_scaling.sqlite3")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USER = {"name": "Bench", "email": "bench@example.com", "password": "secret123"}
+LOGIN = {"email": USER["email"], "password": USER["password"]}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def request(url: str, body: dict = None, headers: dict = None, timeout: float = 30):
+    """Send a GET (or a JSON POST if body is given); return (status, parsed JSON)."""
+    import orjson
+
+    data = orjson.dumps(body) if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json", **(headers or {})})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status, orjson.loads(response.read() or b"null")
+    except urllib.error.HTTPError as error:
+        return error.code, None
+
+class Server:
+    """A gunicorn process serving the app with the given number of workers."""
+
+    def __init__(self, workers: int, log_dir: str):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        env = dict(
+            os.environ,
+            WEB_CONCURRENCY=str(workers),
+            SERVER_BIND=f"127.0.0.1:{self.port}",
+            LOG_DIR=log_dir,
+            LOG_PRESET="production",
+            RATE_LIMIT_ENABLED="false",
+            QUERY_BUDGET_MODE="off",
+        )
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def wait_ready(self, workers: int, timeout: float = 60.0):
+        # The first answer means one worker is up; the others boot alongside it.
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            try:
+                with urllib.request.urlopen(f"{self.url}/metrics", timeout=1):
+                    break
+            except OSError:
+                time.sleep(0.05)
+        else:
+            raise RuntimeError("server did not answer in time")
+        time.sleep(0.5 * workers)  # Let the remaining workers finish their warm-up.
+
+    def stop(self) -> int:
+        self.process.send_signal(signal.SIGTERM)
+        return self.process.wait(timeout=60)
+
+def generate_load(url: str, token: str, clients: int, duration: float) -> tuple:
+    """Load generator process: return (successful requests, failed requests)."""
+    import httpx
+
+    async def run():
+        counts = [0, 0]
+        deadline = time.perf_counter() + duration
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+        async with httpx.AsyncClient(base_url=url, limits=limits, headers={"Authorization": f"Bearer {token}"}) as client:
+            async def client_loop():
+                while time.perf_counter() < deadline:
+                    response = await client.get("/services/")
+                    counts[response.status_code != 200] += 1
+            await asyncio.gather(*(client_loop() for _ in range(clients)))
+        return tuple(counts)
+
+    return asyncio.run(run())
+
+def measure(server: Server, token: str, args) -> float:
+    with multiprocessing.Pool(args.loaders) as pool:
+        results = pool.starmap(generate_load, [(server.url, token, args.clients, args.duration)] * args.loaders)
+    ok = sum(result[0] for result in results)
+    failed = sum(result[1] for result in results)
+    assert failed == 0, f"{failed} requests failed"
+    return ok / args.duration
+
+def check_graceful_drain(server: Server):
+    """Assert a request in flight at SIGTERM completes and the server exits cleanly."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(status=request(f"{server.url}/auth/login", LOGIN)[0]))
+    thread.start()
+    time.sleep(0.05)  # The login is now waiting on bcrypt in a worker.
+    exit_code = server.stop()
+    thread.join()
+    assert result.get("status") == 200, f"in-flight login got {result.get('status')}"
+    assert exit_code == 0, f"server exited with {exit_code}"
+
+def main(args):
+    from app.database import get_engine
+    from app.models import Base
+    Base.metadata.drop_all(bind=get_engine())
+    Base.metadata.create_all(bind=get_engine())
+    get_engine().dispose()
+
+    print(f"{os.cpu_count()} CPUs, {args.loaders} load generators x {args.clients} clients, {args.duration:.0f}s per run")
+    print(f"{'workers':>7} {'req/s':>10} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as log_dir:
+        for workers in range(1, args.max_workers + 1):
+            server = Server(workers, log_dir)
+            try:
+                server.wait_ready(workers)
+                if workers == 1:
+                    request(f"{server.url}/auth/signup", USER)
+                token = request(f"{server.url}/auth/login", LOGIN)[1]["access_token"]
+                rps = measure(server, token, args)
+                baseline = baseline or rps
+                print(f"{workers:>7} {rps:>10.1f} {rps / baseline:>7.2f}x {rps / baseline / workers:>9.0%}")
+                if workers == args.max_workers:
+                    check_graceful_drain(server)
+                    print("graceful drain: in-flight request completed after SIGTERM")
+            finally:
+                if server.process.poll() is None:
+                    server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest worker count measured")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load per worker count")
+    parser.add_argument("--loaders", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent connections per load generator")
+    main(parser.parse_args())
@@ -0,0 +1,159 @@
+# benchmarks/bench_write_round_trips.py
+"""
+Write endpoint round-trip benchmark.
+
+Drives the sign-up, catalog and cart write endpoints in-process and asserts
+the exact number of SQL statements each one issues (recorded with
+``track_queries``), that it stays within the route's declared query budget,
+and its median latency:
+
+- POST /auth/signup, POST /services/: one INSERT ... ON CONFLICT DO NOTHING
+  RETURNING, also when the email / name is taken;
+- PUT /services/{id}: one UPDATE ... RETURNING, also when the id is unknown;
+- DELETE /services/{id}: DELETE of its order items plus DELETE ... RETURNING;
+- PUT and DELETE /cart/{id}: one statement scoped by id and user_id, so
+  another user's item answers 404 (the nested service of an updated item
+  comes from the warm catalog cache).
+
+It also fires concurrent sign-ups with one email and concurrent creations
+of one service name, and checks that exactly one of each succeeds and the
+others get 400 rather than an integrity error.
+
+Usage (from backend/):
+    python -m benchmarks.bench_write_round_trips --repeats 50
+"""
+
+import os
+import time
+import argparse
+import asyncio
+import statistics
+from benchmarks.common import setup_environment
+
+setup_environment("bench_write_round_trips.sqlite3")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # Many sign-ups and logins from one client.
+os.environ["QUERY_BUDGET_MODE"] = "off"  # Counted here with track_queries instead.
+
+import httpx
+from sqlalchemy import update
+from app.database import engine, async_engine, AsyncSessionLocal
+from app.models import Base
+from app.models.user import User
+from app.main import app
+from app.utils.query_budget import track_queries, get_query_budget
+
+PASSWORD = "secret123"
+
+def route_budget(method: str, path: str):
+    """Return the query budget declared on the route matching method and path."""
+    from starlette.routing import Match
+
+    scope = {"type": "http", "method": method, "path": path}
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return get_query_budget(route.endpoint)
+    raise LookupError(f"no route for {method} {path}")
+
+async def login(client, email: str, admin: bool = False) -> dict:
+    if admin:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(User).where(User.email == email).values(role="admin"))
+            await db.commit()
+    response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def check(client, label: str, method: str, path: str, status: int, queries: int, headers=None, json=None):
+    """Send one request and assert its status and exact statement count."""
+    with track_queries() as log:
+        response = await client.request(method, path, headers=headers, json=json)
+    assert response.status_code == status, f"{label}: {response.status_code} {response.text}"
+    assert log.queries == queries, f"{label}: {log.queries} queries, expected {queries}: {list(log.statements)}"
+    budget = route_budget(method, path)
+    assert budget is None or queries <= budget, f"{label}: {queries} queries exceed the budget of {budget}"
+    return response
+
+async def check_concurrent_inserts(client, admin: dict, attempts: int):
+    """Assert racing inserts on a unique key yield one success and clean 400s."""
+    user = {"name": "Race", "email": "race@example.com", "password": PASSWORD}
+    responses = await asyncio.gather(*(client.post("/auth/signup", json=user) for _ in range(attempts)))
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200] + [400] * (attempts - 1), f"concurrent sign-ups: {statuses}"
+
+    service = {"name": "Race", "base_price": 1.0}
+    responses = await asyncio.gather(*(client.post("/services/", headers=admin, json=service) for _ in range(attempts)))
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200] + [400] * (attempts - 1), f"concurrent service creation: {statuses}"
+
+async def median_ms(call, repeats: int) -> float:
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        await call(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+async def main(args):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'endpoint':<44} {'queries':>7} {'budget':>6}")
+
+        async def expect(label, method, path, status, queries, **kwargs):
+            response = await check(client, label, method, path, status, queries, **kwargs)
+            print(f"{label:<44} {queries:>7} {route_budget(method, path) or '-':>6}")
+            return response
+
+        for name in ("admin", "alice", "bob"):
+            user = {"name": name.title(), "email": f"{name}@example.com", "password": PASSWORD}
+            await expect(f"POST /auth/signup ({name})", "POST", "/auth/signup", 200, 1, json=user)
+        await expect("POST /auth/signup (email taken)", "POST", "/auth/signup", 400, 1, json=user)
+        admin = await login(client, "admin@example.com", admin=True)
+        alice = await login(client, "alice@example.com")
+        bob = await login(client, "bob@example.com")
+
+        service = {"name": "Wash", "base_price": 10.0, "category": "wash"}
+        service_id = (await expect("POST /services/", "POST", "/services/", 200, 1, headers=admin, json=service)).json()["id"]
+        await expect("POST /services/ (name taken)", "POST", "/services/", 400, 1, headers=admin, json=service)
+        await expect("PUT /services/{id}", "PUT", f"/services/{service_id}", 200, 1, headers=admin, json={"base_price": 12.5})
+        await expect("PUT /services/{id} (unknown id)", "PUT", "/services/999999", 404, 1, headers=admin, json={"base_price": 1.0})
+
+        item = (await client.post("/cart/", headers=alice, json={"service_id": service_id, "quantity": 1})).json()
+        await client.get(f"/services/{service_id}", headers=alice)  # Warm the catalog cache the cart response reads from.
+        path = f"/cart/{item['id']}"
+        updated = (await expect("PUT /cart/{id}", "PUT", path, 200, 1, headers=alice, json={"quantity": 3})).json()
+        assert updated["quantity"] == 3 and updated["service"]["base_price"] == 12.5
+        await expect("PUT /cart/{id} (another user's item)", "PUT", path, 404, 1, headers=bob, json={"quantity": 9})
+        await expect("DELETE /cart/{id} (another user's item)", "DELETE", path, 404, 1, headers=bob)
+        await expect("DELETE /cart/{id}", "DELETE", path, 200, 1, headers=alice)
+        await expect("DELETE /cart/{id} (already deleted)", "DELETE", path, 404, 1, headers=alice)
+
+        await expect("DELETE /services/{id}", "DELETE", f"/services/{service_id}", 200, 2, headers=admin)
+        await expect("DELETE /services/{id} (unknown id)", "DELETE", f"/services/{service_id}", 404, 2, headers=admin)
+
+        await check_concurrent_inserts(client, admin, args.concurrency)
+        print(f"concurrent inserts: 1 of {args.concurrency} sign-ups and service creations succeeded, the rest got 400")
+
+        service_id = (await client.post("/services/", headers=admin, json=service)).json()["id"]
+        item_id = (await client.post("/cart/", headers=alice, json={"service_id": service_id, "quantity": 1})).json()["id"]
+        await client.get(f"/services/{service_id}", headers=alice)
+
+        async def update_service(i):
+            response = await client.put(f"/services/{service_id}", headers=admin, json={"base_price": 10.0 + i})
+            assert response.status_code == 200, response.text
+
+        async def update_cart_item(i):
+            response = await client.put(f"/cart/{item_id}", headers=alice, json={"quantity": i + 1})
+            assert response.status_code == 200, response.text
+
+        print(f"median of {args.repeats} requests (ms)")
+        print(f"{'PUT /services/{id}':<44} {await median_ms(update_service, args.repeats):>7.2f}")
+        print(f"{'PUT /cart/{id}':<44} {await median_ms(update_cart_item, args.repeats):>7.2f}")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=50, help="Requests per timed endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Racing inserts per unique key")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,174 @@
+# benchmarks/common.py
+"""
+Shared helpers for the benchmark scripts.
+
+Each benchmark imports this module before anything from ``app`` so that
+DATABASE_URL points at a throwaway SQLite database unless one is provided,
+and so that SQL echo and debug logging don't dominate the measurements.
+
+Usage:
+    from benchmarks.common import setup_environment
+    setup_environment()
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+import statistics
+
+def setup_environment(db_name: str = "bench.sqlite3") -> str:
+    """
+    Point the application at a benchmark database and silence debug output.
+
+    Args:
+        db_name (str): File name of the SQLite stand-in (ignored if DATABASE_URL is set).
+    Returns:
+        str: The DATABASE_URL in use.
+    """
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.gettempdir(), db_name)
+        if os.path.exists(path):
+            os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    logging.disable(logging.INFO)
+    return os.environ["DATABASE_URL"]
+
+def quiet_engines():
+    """Disable SQL statement echo on the application engines."""
+    from app import database
+    database.engine.echo = False
+    database.async_engine.echo = False
+
+def percentile(samples, pct: float) -> float:
+    """Return the pct-th percentile (0-100) of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def run_load(app, method: str, path: str, clients: int, total: int, headers=None, json=None) -> dict:
+    """
+    Drive an ASGI app in-process with concurrent clients.
+
+    Args:
+        app: The ASGI application under test.
+        method (str): HTTP method.
+        path (str): Request path.
+        clients (int): Number of concurrent clients.
+        total (int): Total number of requests to issue.
+        headers (dict, optional): Request headers.
+        json (Any, optional): JSON body for each request.
+    Returns:
+        dict: requests/sec and latency percentiles in milliseconds.
+    """
+    import httpx
+
+    latencies = []
+    statuses = {}
+    remaining = [total]
+
+    async def client_loop(client):
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            response = await client.request(method, path, headers=headers, json=json)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "statuses": statuses,
+    }
+
+def print_result(label: str, result: dict):
+    """Print one benchmark result line."""
+    print(
+        f"{label:<32} {result['requests']:>7} req  {result['rps']:>9.1f} req/s  "
+        f"p50 {result['p50_ms']:>7.2f} ms  p95 {result['p95_ms']:>7.2f} ms  "
+        f"p99 {result['p99_ms']:>7.2f} ms  {result['statuses']}"
+    )
+
+async def call_asgi(app, method: str, path: str, headers=()) -> int:
+    """
+    Invoke an ASGI app directly (no HTTP client) and return the response status.
+
+    Args:
+        app: The ASGI application.
+        method (str): HTTP method.
+        path (str): Request path.
+        headers (Iterable[tuple[bytes, bytes]]): Raw request headers.
+    Returns:
+        int: The response status code.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": list(headers),
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    request_sent = False
+    status = [0]
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status[0] = message["status"]
+
+    await app(scope, receive, send)
+    return status[0]
+
+async def time_asgi(app, method: str, path: str, iterations: int, headers=(), before_each=None) -> list:
+    """
+    Call an ASGI app sequentially and return per-request latencies in microseconds.
+
+    Args:
+        app: The ASGI application.
+        method (str): HTTP method.
+        path (str): Request path.
+        iterations (int): Number of requests.
+        headers (Iterable[tuple[bytes, bytes]]): Raw request headers.
+        before_each (callable, optional): Called (untimed) before every request.
+    Returns:
+        list[float]: Latencies in microseconds.
+    """
+    headers = list(headers)
+    samples = []
+    for _ in range(iterations):
+        if before_each is not None:
+            before_each()
+        start = time.perf_counter()
+        await call_asgi(app, method, path, headers)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
@@ -0,0 +1,54 @@
+# tests/conftest.py
+"""
+Shared pytest fixtures.
+
+The environment is set before anything from ``app`` is imported, because
+app.config reads it at import time: the suite runs against a throwaway
+SQLite database, with QUERY_BUDGET_MODE=raise so that a route exceeding its
+declared query budget (or repeating a statement) fails the test.
+
+Run from backend/:
+    python -m pytest -q
+"""
+
+import os
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix="laundry_tests_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(TEST_DIR, 'test.sqlite3')}")
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
+os.environ.setdefault("WARMUP_ENABLED", "false")
+os.environ.setdefault("LOG_DIR", os.path.join(TEST_DIR, "logs"))
+
+import pytest
+from sqlalchemy import update
+from fastapi.testclient import TestClient
+from app.database import get_engine
+from app.models import Base
+from app.models.user import User
+from app.main import create_app
+
+PASSWORD = "secret123"
+ORIGIN = "http://localhost:5173"
+
+@pytest.fixture
+def app():
+    """A new application on empty tables (and with fresh rate limiters)."""
+    Base.metadata.drop_all(bind=get_engine())
+    Base.metadata.create_all(bind=get_engine())
+    return create_app()
+
+@pytest.fixture
+def client(app):
+    """A TestClient running the app's lifespan."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+def signup_and_login(client, email: str, admin: bool = False) -> dict:
+    """Create a user and return Authorization headers for them."""
+    client.post("/auth/signup", json={"name": email.split("@")[0].title(), "email": email, "password": PASSWORD})
+    if admin:
+        with get_engine().begin() as connection:
+            connection.execute(update(User).where(User.email == email).values(role="admin"))
+    response = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
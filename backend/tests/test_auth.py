@@ -0,0 +1,64 @@
+# tests/test_auth.py
+"""
+Session lifecycle tests: refresh rotation, reuse detection, and logout
+revocation (also as seen by another worker syncing from the table).
+"""
+
+from jose import jwt
+from app.database import AsyncSessionLocal
+from app.utils.revocation import RevocationList, revocation_list
+from tests.conftest import PASSWORD, signup_and_login
+
+LOGIN = {"email": "alice@example.com", "password": PASSWORD}
+
+def login(client) -> dict:
+    response = client.post("/auth/login", json=LOGIN)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+def refresh(client, token: str):
+    return client.post("/auth/refresh", json={"refresh_token": token})
+
+def test_refresh_token_is_not_an_access_token(client):
+    signup_and_login(client, LOGIN["email"])
+    tokens = login(client)
+    assert client.get("/auth/profile", headers=bearer(tokens["access_token"])).status_code == 200
+    assert client.get("/auth/profile", headers=bearer(tokens["refresh_token"])).status_code == 401
+
+def test_refresh_rotates_the_refresh_token(client):
+    signup_and_login(client, LOGIN["email"])
+    tokens = login(client)
+    response = refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/auth/profile", headers=bearer(rotated["access_token"])).status_code == 200
+
+def test_reused_refresh_token_revokes_the_session(client):
+    signup_and_login(client, LOGIN["email"])
+    tokens = login(client)
+    rotated = refresh(client, tokens["refresh_token"]).json()
+    # Replaying the first refresh token ends the session for every holder.
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    assert client.get("/auth/profile", headers=bearer(rotated["access_token"])).status_code == 401
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+
+def test_logout_revokes_access_and_refresh_tokens(client):
+    signup_and_login(client, LOGIN["email"])
+    tokens = login(client)
+    assert client.post("/auth/logout", headers=bearer(tokens["access_token"])).status_code == 200
+    assert client.get("/auth/profile", headers=bearer(tokens["access_token"])).status_code == 401
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+    other_worker = RevocationList()
+
+    async def sync():
+        async with AsyncSessionLocal() as db:
+            await other_worker.sync(db)
+
+    client.portal.call(sync)
+    claims = jwt.get_unverified_claims(tokens["access_token"])
+    assert revocation_list.is_revoked(claims) and other_worker.is_revoked(claims)
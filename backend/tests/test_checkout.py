@@ -0,0 +1,51 @@
+# tests/test_checkout.py
+"""
+Checkout tests: an Idempotency-Key makes POST /orders/checkout safe to
+retry, whether the retry comes after the first attempt or alongside it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select
+from app.database import get_engine
+from app.models import Cart, Order
+from tests.conftest import signup_and_login
+
+def fill_cart(client, admin: dict, user: dict, items: int = 3):
+    for i in range(items):
+        service = client.post("/services/", headers=admin, json={"name": f"Service {i}", "base_price": 2.0 + i}).json()
+        assert client.post("/cart/", headers=user, json={"service_id": service["id"], "quantity": i + 1}).status_code == 200
+
+def count_rows(model) -> int:
+    with get_engine().connect() as connection:
+        return connection.execute(select(func.count()).select_from(model)).scalar_one()
+
+def test_replayed_idempotency_key_returns_the_same_order(client):
+    admin = signup_and_login(client, "admin@example.com", admin=True)
+    user = signup_and_login(client, "alice@example.com")
+    fill_cart(client, admin, user)
+    headers = {**user, "Idempotency-Key": "checkout-1"}
+
+    first = client.post("/orders/checkout", headers=headers)
+    assert first.status_code == 200, first.text
+    assert "Idempotent-Replayed" not in first.headers
+    assert client.get("/cart/", headers=user).json() == []
+
+    replay = client.post("/orders/checkout", headers=headers)
+    assert replay.status_code == 200, replay.text
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json()["id"] == first.json()["id"]
+    assert count_rows(Order) == 1 and count_rows(Cart) == 0
+
+def test_concurrent_duplicate_idempotency_key_creates_one_order(client):
+    admin = signup_and_login(client, "admin@example.com", admin=True)
+    user = signup_and_login(client, "alice@example.com")
+    fill_cart(client, admin, user)
+    headers = {**user, "Idempotency-Key": "checkout-2"}
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda _: client.post("/orders/checkout", headers=headers), range(4)))
+
+    assert [response.status_code for response in responses] == [200] * 4, [response.text for response in responses]
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sum("Idempotent-Replayed" not in response.headers for response in responses) == 1
+    assert count_rows(Order) == 1 and count_rows(Cart) == 0
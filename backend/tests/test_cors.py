@@ -0,0 +1,23 @@
+# tests/test_cors.py
+"""
+CORS tests: responses the middlewares send themselves (401 from the JWT
+middleware, 429 from the rate limiter) must carry CORS headers, or the
+browser hides them from the web_app.
+"""
+
+from app.config import LOGIN_RATE_LIMIT_PER_EMAIL
+from tests.conftest import ORIGIN
+
+def test_rejected_token_response_has_cors_headers(client):
+    response = client.get("/cart/", headers={"Origin": ORIGIN, "Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+    assert response.headers["access-control-allow-origin"] in ("*", ORIGIN)
+
+def test_rate_limited_response_exposes_retry_after(client):
+    login = {"email": "nobody@example.com", "password": "wrong-password"}
+    for _ in range(LOGIN_RATE_LIMIT_PER_EMAIL + 1):
+        response = client.post("/auth/login", json=login, headers={"Origin": ORIGIN})
+    assert response.status_code == 429
+    assert response.headers["access-control-allow-origin"] in ("*", ORIGIN)
+    assert "retry-after" in response.headers["access-control-expose-headers"].lower()
+    assert int(response.headers["retry-after"]) > 0
@@ -0,0 +1,51 @@
+# tests/test_orders.py
+"""
+Order history tests: paging through GET /orders/ issues the same number of
+statements for every page, however many orders and items the page holds.
+"""
+
+from sqlalchemy import insert, select
+from app.database import get_engine
+from app.models import Delivery, Order, OrderItem, Payment, Service, User
+from app.utils.query_budget import track_queries
+from tests.conftest import signup_and_login
+
+def seed_orders(email: str, orders: int):
+    """Give the user orders with 1 to 5 items each, a payment and a delivery."""
+    with get_engine().begin() as connection:
+        user_id = connection.execute(select(User.id).where(User.email == email)).scalar_one()
+        connection.execute(insert(Service), [{"name": f"Service {i}", "base_price": 2.0 + i} for i in range(5)])
+        order_ids = connection.execute(
+            insert(Order).returning(Order.id),
+            [{"user_id": user_id, "status": "Placed", "total_price": 10.0} for _ in range(orders)],
+        ).scalars().all()
+        connection.execute(insert(OrderItem), [
+            {"order_id": order_id, "service_id": i + 1, "quantity": 1, "price": 2.0 + i}
+            for n, order_id in enumerate(order_ids)
+            for i in range(n % 5 + 1)
+        ])
+        connection.execute(insert(Payment), [
+            {"order_id": order_id, "user_id": user_id, "amount": 10.0, "method": "COD"} for order_id in order_ids
+        ])
+        connection.execute(insert(Delivery), [{"order_id": order_id} for order_id in order_ids])
+    return order_ids
+
+def test_order_history_pages_use_constant_queries(client):
+    headers = signup_and_login(client, "alice@example.com")
+    order_ids = seed_orders("alice@example.com", orders=47)
+
+    seen, query_counts, cursor = [], [], None
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        with track_queries() as log:
+            response = client.get("/orders/", headers=headers, params=params)
+        assert response.status_code == 200, response.text
+        seen.extend(order["id"] for order in response.json())
+        query_counts.append(log.queries)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(query_counts) == 5
+    assert len(set(query_counts)) == 1, f"statements per page varied: {query_counts}"
+    assert sorted(seen) == sorted(order_ids), "pages must cover every order exactly once"
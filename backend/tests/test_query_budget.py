@@ -0,0 +1,74 @@
+# tests/test_query_budget.py
+"""
+Query budget tests. The suite runs with QUERY_BUDGET_MODE=raise (see
+conftest), so a request that exceeds its route's @query_budget or repeats a
+statement QUERY_REPEAT_THRESHOLD times raises QueryBudgetExceeded.
+"""
+
+import pytest
+from fastapi import APIRouter, Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import QUERY_REPEAT_THRESHOLD
+from app.database import get_async_db
+from app.models.user import User
+from app.utils.query_budget import QueryBudgetExceeded, query_budget, track_queries
+from tests.conftest import signup_and_login
+
+probe_router = APIRouter(prefix="/budget-probe")
+
+@probe_router.get("/over")
+@query_budget(1)
+async def over_budget(db: AsyncSession = Depends(get_async_db)):
+    await db.execute(select(User.id).where(User.id == 1))
+    await db.execute(select(User.email).where(User.id == 1))
+    return {}
+
+@probe_router.get("/repeated")
+@query_budget(QUERY_REPEAT_THRESHOLD + 1)
+async def repeated_statement(db: AsyncSession = Depends(get_async_db)):
+    for user_id in range(QUERY_REPEAT_THRESHOLD):
+        await db.execute(select(User.id).where(User.id == user_id))
+    return {}
+
+@pytest.fixture
+def probe_client(app):
+    app.include_router(probe_router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+def test_declared_budgets_hold_across_the_api(client):
+    admin = signup_and_login(client, "admin@example.com", admin=True)
+    user = signup_and_login(client, "alice@example.com")
+    service = client.post("/services/", headers=admin, json={"name": "Wash", "base_price": 10.0, "category": "wash"}).json()
+    requests = [
+        ("GET", "/services/", None),
+        ("GET", f"/services/{service['id']}", None),
+        ("POST", "/cart/", {"service_id": service["id"], "quantity": 2}),
+        ("GET", "/cart/", None),
+        ("GET", "/cart/summary", None),
+        ("POST", "/orders/checkout", {"payment_method": "COD"}),
+        ("GET", "/orders/", None),
+    ]
+    for method, path, body in requests:
+        response = client.request(method, path, headers=user, json=body)
+        assert response.status_code == 200, f"{method} {path}: {response.text}"
+    order_id = client.get("/orders/", headers=user).json()[0]["id"]
+    assert client.get(f"/orders/{order_id}", headers=user).status_code == 200
+
+def test_route_over_budget_raises(probe_client):
+    headers = signup_and_login(probe_client, "alice@example.com")
+    with pytest.raises(QueryBudgetExceeded, match="executed 2 queries, budget is 1"):
+        probe_client.get("/budget-probe/over", headers=headers)
+
+def test_repeated_statement_is_flagged(probe_client):
+    headers = signup_and_login(probe_client, "alice@example.com")
+    with pytest.raises(QueryBudgetExceeded, match=f"probable N\\+1: {QUERY_REPEAT_THRESHOLD}x SELECT"):
+        probe_client.get("/budget-probe/repeated", headers=headers)
+
+def test_track_queries_sees_request_statements(client):
+    headers = signup_and_login(client, "alice@example.com")
+    with track_queries() as log:
+        assert client.get("/cart/", headers=headers).status_code == 200
+    assert log.queries == 1
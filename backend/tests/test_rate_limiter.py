@@ -0,0 +1,14 @@
+# tests/test_rate_limiter.py
+"""
+Rate limiter tests.
+"""
+
+import anyio
+from app.utils.rate_limiter import RateLimiter, RateLimitRule
+
+def test_zero_limit_rejects_with_retry_after():
+    limiter = RateLimiter()
+    rule = RateLimitRule("test:ip", limit=0, window=60, key="ip")
+    allowed, retry_after = anyio.run(limiter.hit, rule, "203.0.113.7")
+    assert not allowed
+    assert 1 <= retry_after <= 60
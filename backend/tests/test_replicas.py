@@ -0,0 +1,128 @@
+# tests/test_replicas.py
+"""
+Read replica routing tests, against two SQLite files: the primary and a
+"replica" that only changes when a test copies the primary into it, so
+replication lag is whatever the test makes it.
+"""
+
+import os
+import time
+import sqlite3
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from fastapi.testclient import TestClient
+import app.database
+from app.config import DATABASE_URL
+from app.database import get_async_engine, get_replica_engines
+from app.utils.query_budget import current_query_log
+from app.utils.replicas import replica_router
+from tests.conftest import signup_and_login
+
+STICKY_SECONDS = 0.3
+
+class StatementCounter:
+    """Counts the statements of requests (not background tasks) per engine: primary or replica."""
+
+    def __init__(self):
+        self.counts = {"primary": 0, "replica": 0}
+        for name, target in (("primary", get_async_engine()), ("replica", get_replica_engines()["replica0"])):
+            event.listen(target.sync_engine, "after_cursor_execute", self._listener(name))
+
+    def _listener(self, name):
+        def count(*args):
+            if current_query_log.get() is not None:
+                self.counts[name] += 1
+        return count
+
+    def used(self) -> list:
+        """Return the engines used since the last call."""
+        used = [name for name, count in self.counts.items() if count]
+        self.counts = dict.fromkeys(self.counts, 0)
+        return used
+
+@pytest.fixture
+def replica_path(tmp_path, monkeypatch):
+    path = tmp_path / "replica" / "replica.sqlite3"
+    path.parent.mkdir()
+    monkeypatch.setattr(app.database, "DATABASE_REPLICA_URLS", [f"sqlite:///{path}"])
+    monkeypatch.setattr(app.database, "_replica_engines", None)
+    monkeypatch.setattr(replica_router, "sticky_seconds", STICKY_SECONDS)
+    return path
+
+@pytest.fixture
+def setup(app, replica_path):
+    """A client whose app has a replica, users admin, alice and bob, and a service in bob's cart."""
+    with TestClient(app) as client:
+        admin = signup_and_login(client, "admin@example.com", admin=True)
+        alice = signup_and_login(client, "alice@example.com")
+        bob = signup_and_login(client, "bob@example.com")
+        service_id = client.post("/services/", headers=admin, json={"name": "Wash", "base_price": 10.0}).json()["id"]
+        client.post("/cart/", headers=bob, json={"service_id": service_id, "quantity": 2})
+        replicate(replica_path)
+        time.sleep(STICKY_SECONDS)  # Let the setup writes' stickiness expire.
+        yield client, StatementCounter(), alice, bob, service_id
+
+def replicate(replica_path):
+    """Bring the replica up to date with the primary."""
+    with sqlite3.connect(make_url(DATABASE_URL).database) as source, sqlite3.connect(replica_path) as target:
+        source.backup(target)
+
+def routed(client, counter, method: str, path: str, headers: dict, json=None):
+    """Send a request; return (response, engine that served its statements)."""
+    response = client.request(method, path, headers=headers, json=json)
+    assert response.status_code == 200, f"{method} {path}: {response.status_code} {response.text}"
+    used = counter.used()
+    assert len(used) == 1, f"{method} {path} used {used}"
+    return response, used[0]
+
+def test_reads_use_the_replica_and_writes_the_primary(setup):
+    client, counter, alice, bob, service_id = setup
+    response, target = routed(client, counter, "GET", "/cart/", bob)
+    assert target == "replica" and len(response.json()) == 1
+    _, target = routed(client, counter, "POST", "/cart/", alice, json={"service_id": service_id, "quantity": 1})
+    assert target == "primary"
+
+def test_writer_reads_its_writes_from_the_primary(setup, replica_path):
+    client, counter, alice, bob, service_id = setup
+    routed(client, counter, "POST", "/cart/", alice, json={"service_id": service_id, "quantity": 1})
+    # The replica has not seen the item yet.
+    response, target = routed(client, counter, "GET", "/cart/", alice)
+    assert target == "primary" and len(response.json()) == 1
+    _, target = routed(client, counter, "GET", "/cart/", bob)
+    assert target == "replica"
+
+    time.sleep(STICKY_SECONDS)
+    response, target = routed(client, counter, "GET", "/cart/", alice)
+    assert target == "replica" and response.json() == []
+    replicate(replica_path)
+    response, _ = routed(client, counter, "GET", "/cart/", alice)
+    assert len(response.json()) == 1
+
+def test_lagging_replica_is_skipped(setup):
+    client, counter, alice, bob, service_id = setup
+    replica_router.record("replica0", healthy=True, lag=replica_router.max_lag + 1)
+    _, target = routed(client, counter, "GET", "/cart/", bob)
+    assert target == "primary"
+    replica_router.record("replica0", healthy=True, lag=0.0)
+    _, target = routed(client, counter, "GET", "/cart/", bob)
+    assert target == "replica"
+
+def test_unreachable_replica_falls_back_to_the_primary(setup, replica_path):
+    client, counter, alice, bob, service_id = setup
+    # Make the replica unreachable: close its pooled connections and hide its file.
+    client.portal.call(get_replica_engines()["replica0"].dispose)
+    hidden = replica_path.parent.with_name("replica.down")
+    os.rename(replica_path.parent, hidden)
+    try:
+        _, target = routed(client, counter, "GET", "/cart/", bob)
+        assert target == "primary"
+        assert not replica_router.usable(replica_router.replicas[0])
+        client.portal.call(replica_router.check)
+        _, target = routed(client, counter, "GET", "/cart/", bob)
+        assert target == "primary"
+    finally:
+        os.rename(hidden, replica_path.parent)
+    client.portal.call(replica_router.check)
+    _, target = routed(client, counter, "GET", "/cart/", bob)
+    assert target == "replica"
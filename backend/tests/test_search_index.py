@@ -0,0 +1,36 @@
+# tests/test_search_index.py
+"""
+Autocomplete index tests: incremental updates keep the trie's suggestions
+current, including for names whose words share a prefix.
+"""
+
+from app.utils.search_index import PrefixTrie
+from tests.conftest import signup_and_login
+
+def names(trie: PrefixTrie, text: str) -> list:
+    return [suggestion["name"] for suggestion in trie.suggest(text, 10)]
+
+def test_words_sharing_a_prefix_are_renamed_and_removed():
+    trie = PrefixTrie(10)
+    trie.add(1, "Dry dryclean")
+    trie.add(2, "Iron ironing")
+    assert names(trie, "dry") == ["Dry dryclean"]
+    trie.add(1, "Iron dryclean")  # Renames replace the previous name.
+    assert names(trie, "dry") == ["Iron dryclean"]
+    assert names(trie, "iron") == ["Iron ironing", "Iron dryclean"]
+    trie.remove(2)
+    trie.remove(1)
+    assert len(trie) == 0 and trie.root.children == {}
+    assert names(trie, "iron") == [] and names(trie, "d") == []
+
+def test_renamed_service_shows_in_the_next_autocomplete(client):
+    admin = signup_and_login(client, "admin@example.com", admin=True)
+    service = client.post("/services/", headers=admin, json={"name": "Dry dryclean", "base_price": 5.0}).json()
+    client.get("/services/autocomplete?q=d", headers=admin)  # Builds the index if not yet loaded.
+    response = client.put(f"/services/{service['id']}", headers=admin, json={"name": "Iron ironing"})
+    assert response.status_code == 200, response.text
+    suggested = client.get("/services/autocomplete?q=iron", headers=admin).json()
+    assert [item["name"] for item in suggested] == ["Iron ironing"]
+    assert client.get("/services/autocomplete?q=dry", headers=admin).json() == []
+    assert client.delete(f"/services/{service['id']}", headers=admin).status_code == 200
+    assert client.get("/services/autocomplete?q=iron", headers=admin).json() == []
@@ -0,0 +1,80 @@
+# tests/test_write_round_trips.py
+"""
+Write endpoint round-trip tests: each write issues an exact number of SQL
+statements (recorded with ``track_queries``), also on its 400/404 paths, and
+racing inserts on a unique key give one success and clean 400s.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from starlette.routing import Match
+from app.utils.query_budget import get_query_budget, track_queries
+from tests.conftest import PASSWORD, signup_and_login
+
+def route_budget(app, method: str, path: str):
+    """Return the query budget declared on the route matching method and path."""
+    scope = {"type": "http", "method": method, "path": path}
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return get_query_budget(route.endpoint)
+    raise LookupError(f"no route for {method} {path}")
+
+def check(client, method: str, path: str, status: int, queries: int, headers=None, json=None):
+    """Send one request and assert its status and exact statement count."""
+    with track_queries() as log:
+        response = client.request(method, path, headers=headers, json=json)
+    assert response.status_code == status, f"{method} {path}: {response.status_code} {response.text}"
+    assert log.queries == queries, f"{method} {path}: {log.queries} queries, expected {queries}: {list(log.statements)}"
+    budget = route_budget(client.app, method, path)
+    assert budget is None or queries <= budget
+    return response
+
+def test_signup_is_one_statement(client):
+    user = {"name": "Alice", "email": "alice@example.com", "password": PASSWORD}
+    check(client, "POST", "/auth/signup", 200, 1, json=user)
+    check(client, "POST", "/auth/signup", 400, 1, json=user)
+
+def test_service_writes_are_one_statement_each(client):
+    admin = signup_and_login(client, "admin@example.com", admin=True)
+    service = {"name": "Wash", "base_price": 10.0, "category": "wash"}
+    service_id = check(client, "POST", "/services/", 200, 1, headers=admin, json=service).json()["id"]
+    check(client, "POST", "/services/", 400, 1, headers=admin, json=service)
+    check(client, "PUT", f"/services/{service_id}", 200, 1, headers=admin, json={"base_price": 12.5})
+    check(client, "PUT", "/services/999999", 404, 1, headers=admin, json={"base_price": 1.0})
+    # Its order items go first, in one set-based statement.
+    check(client, "DELETE", f"/services/{service_id}", 200, 2, headers=admin)
+    check(client, "DELETE", f"/services/{service_id}", 404, 2, headers=admin)
+
+def test_renaming_a_service_to_a_taken_name_is_rejected(client):
+    admin = signup_and_login(client, "admin@example.com", admin=True)
+    service_id = client.post("/services/", headers=admin, json={"name": "Wash", "base_price": 10.0}).json()["id"]
+    client.post("/services/", headers=admin, json={"name": "Iron", "base_price": 5.0})
+    assert client.put(f"/services/{service_id}", headers=admin, json={"name": "Iron"}).status_code == 400
+    assert client.put(f"/services/{service_id}", headers=admin, json={"name": None}).status_code == 422
+
+def test_cart_item_writes_are_one_statement_scoped_to_the_user(client):
+    admin = signup_and_login(client, "admin@example.com", admin=True)
+    alice = signup_and_login(client, "alice@example.com")
+    bob = signup_and_login(client, "bob@example.com")
+    service_id = client.post("/services/", headers=admin, json={"name": "Wash", "base_price": 10.0}).json()["id"]
+    item = client.post("/cart/", headers=alice, json={"service_id": service_id, "quantity": 1}).json()
+    client.get(f"/services/{service_id}", headers=alice)  # Warm the catalog cache the cart response reads from.
+    path = f"/cart/{item['id']}"
+
+    updated = check(client, "PUT", path, 200, 1, headers=alice, json={"quantity": 3}).json()
+    assert updated["quantity"] == 3 and updated["service"]["id"] == service_id
+    check(client, "PUT", path, 404, 1, headers=bob, json={"quantity": 9})
+    check(client, "DELETE", path, 404, 1, headers=bob)
+    check(client, "DELETE", path, 200, 1, headers=alice)
+    check(client, "DELETE", path, 404, 1, headers=alice)
+
+def test_concurrent_duplicate_inserts_get_400(client):
+    admin = signup_and_login(client, "admin@example.com", admin=True)
+    user = {"name": "Race", "email": "race@example.com", "password": PASSWORD}
+    service = {"name": "Race", "base_price": 1.0}
+    attempts = 6
+    with ThreadPoolExecutor(attempts) as pool:
+        signups = list(pool.map(lambda _: client.post("/auth/signup", json=user), range(attempts)))
+        creations = list(pool.map(lambda _: client.post("/services/", headers=admin, json=service), range(attempts)))
+    assert sorted(response.status_code for response in signups) == [200] + [400] * (attempts - 1)
+    assert sorted(response.status_code for response in creations) == [200] + [400] * (attempts - 1)
@@ -9,5 +9,9 @@ source lib/.venv/bin/activate
 # kill the already existing port
 sudo lsof -i :8000
 
-# Run the FastAPI application with Uvicorn
-uvicorn app.main:app --reload
+# Run the FastAPI application: "./run.sh prod" serves with gunicorn and one
+# worker per CPU, otherwise Uvicorn reloads on code changes.
+if [ "$1" = "prod" ]; then
+    exec gunicorn -c gunicorn.conf.py
+fi
+uvicorn app.main:create_app --factory --reload
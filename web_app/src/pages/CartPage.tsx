@@ -6,7 +6,7 @@
  * shows a summary including total price, and provides buttons to proceed to checkout or clear the cart.
  */
 import React, { useEffect, useState } from 'react';
-import { fetchCartItems, clearCart, getCartTotal } from '../services/api';
+import { fetchCartSummary, clearCart } from '../services/api';
 import CartItem from '../components/CartItem';
 import './CartPage.css';
 
@@ -20,10 +20,9 @@ const CartPage: React.FC = () => {
   const loadCart = async () => {
     setLoading(true);
     try {
-      const data = await fetchCartItems();
-      setItems(data);
-      const totalPrice = await getCartTotal();
-      setTotal(totalPrice);
+      const summary = await fetchCartSummary();
+      setItems(summary.items);
+      setTotal(Number(summary.total));
     } catch (err: any) {
       console.error('Error fetching cart items:', err);
       setError(err.detail || 'Failed to fetch cart items.');
@@ -1,105 +1,171 @@
-// src/services/api.ts
-/**
- * API Service Module.
- *
- * Uses Axios to centralize API requests and automatically attaches the authentication token.
- * Contains functions for authentication, service fetching, and cart operations.
- */
-import axios from 'axios';
-import { ServiceResponseSchema } from '../validators/service_validator';
-
-const API_BASE_URL = import.meta.env.VITE_API_URL;
-// const API_BASE_URL = 'http://127.0.0.1:8000'; // Replace with your actual backend URL
-
-const apiClient = axios.create({
-  baseURL: API_BASE_URL,
-  timeout: 10000,
-  headers: { 'Content-Type': 'application/json' },
-});
-
-// Attach token to every request if available.
-apiClient.interceptors.request.use(
-  (config) => {
-    const token = localStorage.getItem('userToken');
-    if (token) {
-      config.headers['Authorization'] = `Bearer ${token}`;
-    }
-    return config;
-  },
-  (error) => Promise.reject(error)
-);
-
-// Fetch services
-export const fetchServices = async (): Promise<ServiceResponseSchema[]> => {
-  try {
-    const response = await apiClient.get('/services/');
-    return response.data;
-  } catch (error: any) {
-    throw error.response ? error.response.data : error;
-  }
-};
-
-// Authentication APIs
-export const loginApi = async (email: string, password: string) => {
-  try {
-    const response = await apiClient.post('/auth/login', { email, password });
-    return response.data;
-  } catch (error: any) {
-    throw error.response ? error.response.data : error;
-  }
-};
-
-export const signupApi = async (userData: Record<string, string>) => {
-  try {
-    const response = await apiClient.post('/auth/signup', userData);
-    return response.data;
-  } catch (error: any) {
-    throw error.response ? error.response.data : error;
-  }
-};
-
-// Cart operations
-export const fetchCartItems = async (): Promise<any[]> => {
-  try {
-    const response = await apiClient.get('/cart/');
-    return response.data;
-  } catch (error: any) {
-    throw error.response ? error.response.data : error;
-  }
-};
-
-export const updateCartItem = async (itemId: number, data: any): Promise<any> => {
-  try {
-    const response = await apiClient.put(`/cart/${itemId}`, data);
-    return response.data;
-  } catch (error: any) {
-    throw error.response ? error.response.data : error;
-  }
-};
-
-export const deleteCartItem = async (itemId: number): Promise<any> => {
-  try {
-    const response = await apiClient.delete(`/cart/${itemId}`);
-    return response.data;
-  } catch (error: any) {
-    throw error.response ? error.response.data : error;
-  }
-};
-
-export const clearCart = async (): Promise<any> => {
-  try {
-    const response = await apiClient.delete(`/cart/clear`);
-    return response.data;
-  } catch (error: any) {
-    throw error.response ? error.response.data : error;
-  }
-};
-
-export const getCartTotal = async (): Promise<number> => {
-  try {
-    const response = await apiClient.get(`/cart/total`);
-    return response.data;
-  } catch (error: any) {
-    throw error.response ? error.response.data : error;
-  }
-};
+// src/services/api.ts
+/**
+ * API Service Module.
+ *
+ * Uses Axios to centralize API requests and automatically attaches the authentication token,
+ * refreshing it with the stored refresh token when the API answers 401.
+ * Contains functions for authentication, service fetching, and cart operations.
+ */
+import axios from 'axios';
+import { ServiceResponseSchema } from '../validators/service_validator';
+
+const API_BASE_URL = import.meta.env.VITE_API_URL;
+// const API_BASE_URL = 'http://127.0.0.1:8000'; // Replace with your actual backend URL
+
+const apiClient = axios.create({
+  baseURL: API_BASE_URL,
+  timeout: 10000,
+  headers: { 'Content-Type': 'application/json' },
+});
+
+// Attach token to every request if available.
+apiClient.interceptors.request.use(
+  (config) => {
+    const token = localStorage.getItem('userToken');
+    if (token) {
+      config.headers['Authorization'] = `Bearer ${token}`;
+    }
+    return config;
+  },
+  (error) => Promise.reject(error)
+);
+
+// Exchange the stored refresh token for a new token pair. Concurrent 401s share one
+// refresh, since each refresh token can only be used once.
+let refreshPromise: Promise<string | null> | null = null;
+
+const refreshAccessToken = (): Promise<string | null> => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refreshToken');
+    refreshPromise = (refreshToken
+      ? axios
+          .post(`${API_BASE_URL}/auth/refresh`, { refresh_token: refreshToken })
+          .then((response) => {
+            localStorage.setItem('userToken', response.data.access_token);
+            localStorage.setItem('refreshToken', response.data.refresh_token);
+            return response.data.access_token as string;
+          })
+          .catch(() => {
+            localStorage.removeItem('userToken');
+            localStorage.removeItem('refreshToken');
+            return null;
+          })
+      : Promise.resolve(null)
+    ).finally(() => {
+      refreshPromise = null;
+    });
+  }
+  return refreshPromise;
+};
+
+// On 401, refresh the access token once and retry the request (auth endpoints excepted).
+apiClient.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const config = error.config;
+    if (error.response?.status === 401 && config && !config._retried && !config.url?.startsWith('/auth/')) {
+      config._retried = true;
+      const token = await refreshAccessToken();
+      if (token) {
+        config.headers['Authorization'] = `Bearer ${token}`;
+        return apiClient(config);
+      }
+    }
+    return Promise.reject(error);
+  }
+);
+
+// Fetch services
+export const fetchServices = async (): Promise<ServiceResponseSchema[]> => {
+  try {
+    const response = await apiClient.get('/services/');
+    return response.data;
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+// Authentication APIs
+export const loginApi = async (email: string, password: string) => {
+  try {
+    const response = await apiClient.post('/auth/login', { email, password });
+    return response.data;
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+// Revoke the current session server-side (its access and refresh tokens).
+export const logoutApi = async (token: string) => {
+  try {
+    await apiClient.post('/auth/logout', null, { headers: { Authorization: `Bearer ${token}` } });
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+export const signupApi = async (userData: Record<string, string>) => {
+  try {
+    const response = await apiClient.post('/auth/signup', userData);
+    return response.data;
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+// Cart operations
+export const fetchCartItems = async (): Promise<any[]> => {
+  try {
+    const response = await apiClient.get('/cart/');
+    return response.data;
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+export const updateCartItem = async (itemId: number, data: any): Promise<any> => {
+  try {
+    const response = await apiClient.put(`/cart/${itemId}`, data);
+    return response.data;
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+export const deleteCartItem = async (itemId: number): Promise<any> => {
+  try {
+    const response = await apiClient.delete(`/cart/${itemId}`);
+    return response.data;
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+export const clearCart = async (): Promise<any> => {
+  try {
+    const response = await apiClient.delete(`/cart/clear`);
+    return response.data;
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+export const getCartTotal = async (): Promise<number> => {
+  try {
+    const response = await apiClient.get(`/cart/total`);
+    // The total is an exact decimal serialized as a string (e.g. "59.00").
+    return Number(response.data);
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};
+
+// Cart items and totals in a single request.
+export const fetchCartSummary = async (): Promise<any> => {
+  try {
+    const response = await apiClient.get('/cart/summary');
+    return response.data;
+  } catch (error: any) {
+    throw error.response ? error.response.data : error;
+  }
+};